@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+'''Compare JSON backends for loading and saving JAMS files.
+
+Usage:
+
+    python benchmarks/bench_codec.py [-n REPEAT] [FILE ...]
+
+If no files are given, the test fixtures are used.
+'''
+
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+import jamsx
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        os.pardir, 'tests', 'fixtures')
+
+
+def bench_file(filename, backend, repeat):
+    '''Time parsing and encoding of a single file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to a jams or jamz file
+
+    backend : str
+        The JSON backend
+
+    repeat : int
+        Number of timing repetitions
+
+    Returns
+    -------
+    t_load, t_dump : float
+        Best observed times (in seconds) for `jamsx.load` and `JAMS.dumps`
+    '''
+    jam = jamsx.load(filename, validate=False, backend=backend)
+
+    def _load():
+        jamsx.load(filename, validate=False, backend=backend)
+
+    def _dump():
+        jam.dumps(backend=backend, indent=2)
+
+    t_load = min(timeit.repeat(_load, number=1, repeat=repeat))
+    t_dump = min(timeit.repeat(_dump, number=1, repeat=repeat))
+    return t_load, t_dump
+
+
+def parse_arguments(args):
+    '''Parse arguments from the command line'''
+    parser = argparse.ArgumentParser(description='Benchmark JSON backends')
+
+    parser.add_argument('-n', '--repeat', dest='repeat', type=int, default=5,
+                        help='Number of repetitions per measurement')
+
+    parser.add_argument('files', nargs='*',
+                        help='JAMS files to benchmark. '
+                             'Default is the test fixtures.')
+
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+    params = parse_arguments(sys.argv[1:])
+
+    files = params.files
+    if not files:
+        files = sorted(glob.glob(os.path.join(FIXTURES, '*.jams')) +
+                       glob.glob(os.path.join(FIXTURES, '*.jamz')))
+        # The invalid fixture does not parse into a JAMS object
+        files = [_ for _ in files if 'invalid' not in _]
+
+    print('{:30s}\t{:10s}\t{:>10s}\t{:>10s}'.format('FILE', 'BACKEND',
+                                                    'LOAD (ms)', 'DUMP (ms)'))
+    print('-' * 78)
+
+    for filename in files:
+        for backend in jamsx.codec.list_backends():
+            t_load, t_dump = bench_file(filename, backend, params.repeat)
+            print('{:30s}\t{:10s}\t{:10.3f}\t{:10.3f}'.format(
+                os.path.basename(filename), backend,
+                1e3 * t_load, 1e3 * t_dump))
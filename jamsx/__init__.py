@@ -8,6 +8,10 @@ from pkg_resources import resource_filename
 from .exceptions import *
 from . import util
 from . import schema
+from . import codec
+from . import binary
+from . import corpus
+from . import catalog
 from . import eval
 from . import sonify
 from .version import version as __version__
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+r'''
+Binary container format
+-----------------------
+
+JAMB files (`.jamb`) store a JSON document alongside a collection of
+raw, little-endian numeric arrays.  The layout is::
+
+    magic       8 bytes     b'JAMB\x00\x00\x00\x01'
+    length      8 bytes     little-endian uint64, the size of the header
+    header      `length` bytes of UTF-8 encoded JSON, padded with spaces
+    arrays      raw array data, each aligned to `ALIGNMENT` bytes
+
+The header is a JSON object with the fields:
+
+    - `document`: the JSON document
+    - `arrays`: a list of `{"dtype", "offset", "shape"}` descriptors, where
+      `offset` is relative to the start of the array section.
+
+Because arrays are aligned and stored uncompressed, they can be
+memory-mapped directly from the file.
+
+This module only implements the container.  The mapping between JAMS
+objects and JAMB documents is handled by `jams.load` and `JAMS.save`.
+
+.. autosummary::
+    :toctree: generated/
+
+    dump
+    load
+'''
+
+import json
+import struct
+
+import numpy as np
+
+from .exceptions import JamsError, ParameterError
+
+__all__ = ['dump', 'load', 'MAGIC', 'ALIGNMENT']
+
+MAGIC = b'JAMB\x00\x00\x00\x01'
+
+ALIGNMENT = 64
+
+_LENGTH = struct.Struct('<Q')
+
+
+def _padding(size):
+    '''The number of bytes needed to align `size`'''
+    return -size % ALIGNMENT
+
+
+def dump(document, arrays, fdesc):
+    '''Write a document and its arrays to a binary file.
+
+    Parameters
+    ----------
+    document : JSON-serializable object
+        The document to store
+
+    arrays : list of np.ndarray
+        Arrays to store.
+        They are referenced from `document` by position.
+
+    fdesc : file-like
+        A file descriptor open for binary writing
+    '''
+    descriptors = []
+    offset = 0
+    for arr in arrays:
+        arr = np.asarray(arr)
+        descriptors.append(dict(dtype=arr.dtype.newbyteorder('<').str,
+                                offset=offset,
+                                shape=list(arr.shape)))
+        offset += arr.nbytes + _padding(arr.nbytes)
+
+    header = json.dumps(dict(document=document,
+                             arrays=descriptors)).encode('utf-8')
+
+    # Pad the header so that the array section is aligned
+    header += b' ' * _padding(len(MAGIC) + _LENGTH.size + len(header))
+
+    fdesc.write(MAGIC)
+    fdesc.write(_LENGTH.pack(len(header)))
+    fdesc.write(header)
+
+    for arr, desc in zip(arrays, descriptors):
+        data = np.ascontiguousarray(arr, dtype=desc['dtype'])
+        fdesc.write(data.tobytes())
+        fdesc.write(b'\x00' * _padding(data.nbytes))
+
+
+def load(fdesc, mmap=False):
+    '''Read a document and its arrays from a binary file.
+
+    Parameters
+    ----------
+    fdesc : file-like
+        A file descriptor open for binary reading
+
+    mmap : bool
+        If `True`, arrays are memory-mapped read-only from the file,
+        rather than read into memory.
+        This requires `fdesc` to be a file on disk.
+
+    Returns
+    -------
+    document : object
+        The stored document
+
+    arrays : list of np.ndarray
+        The stored arrays.
+        If `mmap=False`, these are in native byte order.
+        If `mmap=True`, these are read-only `np.memmap` objects
+        in little-endian byte order.
+
+    Raises
+    ------
+    JamsError
+        If the input is not a valid JAMB file
+
+    ParameterError
+        If `mmap=True` and `fdesc` cannot be memory-mapped
+    '''
+    base, document, descriptors = _read_header(fdesc)
+
+    if mmap:
+        return document, _map_arrays(fdesc, base, descriptors)
+
+    arrays = []
+    for desc in descriptors:
+        dtype = np.dtype(desc['dtype'])
+        count = int(np.prod(desc['shape']))
+
+        fdesc.seek(base + desc['offset'])
+        buf = fdesc.read(count * dtype.itemsize)
+
+        if len(buf) < count * dtype.itemsize:
+            raise JamsError('Truncated JAMB array data')
+
+        arr = np.frombuffer(buf, dtype=dtype, count=count)
+        arrays.append(arr.astype(dtype.newbyteorder('='))
+                      .reshape(desc['shape']))
+
+    return document, arrays
+
+
+def _map_arrays(fdesc, base, descriptors):
+    '''Memory-map the arrays of a binary file'''
+    try:
+        fdesc.fileno()
+    except (AttributeError, IOError, ValueError):
+        raise ParameterError('Memory-mapping requires a file on disk, '
+                             'not {}'.format(fdesc))
+
+    arrays = []
+    for desc in descriptors:
+        shape = tuple(desc['shape'])
+
+        if not np.prod(shape):
+            # Empty arrays cannot be mapped
+            arr = np.empty(shape, dtype=desc['dtype'])
+            arr.flags.writeable = False
+        else:
+            arr = np.memmap(fdesc, dtype=desc['dtype'], mode='r',
+                            offset=base + desc['offset'], shape=shape)
+        arrays.append(arr)
+
+    return arrays
+
+
+def _read_header(fdesc):
+    '''Read the header of a binary file.
+
+    Returns
+    -------
+    base : int
+        The file position of the array section
+
+    document : object
+        The stored document
+
+    descriptors : list of dict
+        The array descriptors
+    '''
+    start = fdesc.tell()
+
+    magic = fdesc.read(len(MAGIC))
+    if magic != MAGIC:
+        raise JamsError('Not a JAMB file')
+
+    length, = _LENGTH.unpack(fdesc.read(_LENGTH.size))
+
+    try:
+        header = json.loads(fdesc.read(length).decode('utf-8'))
+    except ValueError as exc:
+        raise JamsError('Invalid JAMB header: {}'.format(exc))
+
+    base = start + len(MAGIC) + _LENGTH.size + length
+
+    return base, header['document'], header['arrays']
@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+r'''
+Corpus catalogs
+---------------
+
+Index the metadata of a collection of JAMS files in a SQLite database,
+so that files and annotations can be found without loading them.
+
+.. autosummary::
+    :toctree: generated/
+
+    Catalog
+'''
+
+import itertools
+import json
+import os
+import re
+import sqlite3
+
+import six
+
+from . import core
+from .corpus import find_corpus, load_corpus
+from .exceptions import JamsError, ParameterError
+
+__all__ = ['Catalog']
+
+__SCHEMA__ = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT,
+    artist TEXT,
+    release TEXT,
+    duration REAL,
+    jams_version TEXT,
+    file_metadata TEXT
+);
+
+CREATE TABLE IF NOT EXISTS annotations (
+    file_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    namespace TEXT,
+    time REAL,
+    duration REAL,
+    n_observations INTEGER,
+    annotator TEXT,
+    curator TEXT,
+    corpus TEXT,
+    version TEXT,
+    data_source TEXT,
+    annotation_metadata TEXT,
+    PRIMARY KEY (file_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS annotations_namespace
+    ON annotations (namespace);
+'''
+
+# Query arguments, and the columns they filter
+__TEXT_FIELDS__ = [('namespace', 'a.namespace'),
+                   ('annotator', 'a.annotator'),
+                   ('curator', 'a.curator'),
+                   ('corpus', 'a.corpus'),
+                   ('version', 'a.version'),
+                   ('data_source', 'a.data_source'),
+                   ('title', 'f.title'),
+                   ('artist', 'f.artist'),
+                   ('release', 'f.release')]
+
+
+class Catalog(object):
+    '''A catalog of the files and annotations of a corpus.
+
+    The catalog records the file metadata of each file, and the namespace,
+    metadata, time, duration, and number of observations of each
+    annotation.  Observations themselves are not stored.
+
+    Files are re-indexed only if their modification time or size has
+    changed since they were last cataloged.
+
+    Parameters
+    ----------
+    path : str
+        Path to the SQLite database.
+        If the database exists, it is opened and extended.
+        By default, the catalog is held in memory.
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        The database connection, for direct queries.
+        See the module source for the table definitions.
+
+    Examples
+    --------
+    >>> with jams.catalog.Catalog('catalog.db') as catalog:
+    ...     catalog.update('annotations/')
+    ...     # Chord annotations by a given annotator, in files over 3 minutes
+    ...     selection = catalog.query(namespace='chord_harte',
+    ...                               annotator='Annotator X',
+    ...                               min_duration=180)
+    ...     for path, jam in catalog.load(selection):
+    ...         print(path, len(jam.annotations))
+    '''
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.create_function('REGEXP', 2, _regexp)
+        self.connection.executescript(__SCHEMA__)
+
+    def close(self):
+        '''Close the database connection'''
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM files'
+                                       ).fetchone()[0]
+
+    def update(self, source, depth=3, prune=False, errors='raise',
+               n_jobs=1, pool='process'):
+        '''Index new or modified files.
+
+        Parameters
+        ----------
+        source : str or iterable of str
+            A directory to search, a glob pattern, or a collection of paths.
+
+            See `jams.corpus.find_corpus` for details.
+
+        depth : int
+            If `source` is a directory, the depth of sub-directories to search
+
+        prune : bool
+            If `True`, remove files from the catalog which are not
+            found in `source`.
+
+        errors : str ['raise', 'skip']
+            What to do if a file fails to load.
+            Skipped files are not cataloged.
+
+        n_jobs : int > 0 or None
+            The number of parallel workers used to read files.
+
+            See `jams.corpus.load_corpus` for details.
+
+        pool : str ['process', 'thread']
+            The type of worker pool
+
+        Returns
+        -------
+        paths : list of str
+            The absolute paths of the files which were (re-)indexed
+
+        Raises
+        ------
+        ParameterError
+            If `errors` is not supported
+        '''
+        if errors not in ('raise', 'skip'):
+            raise ParameterError('Unsupported error policy: {}'.format(errors))
+
+        paths = [os.path.abspath(path)
+                 for path in find_corpus(source, depth=depth)]
+
+        # Find files which are new, or have changed since they were indexed
+        stale = dict()
+        for path in paths:
+            stat = os.stat(path)
+            if self.__stat(path) != (stat.st_mtime, stat.st_size):
+                stale[path] = stat
+
+        indexed = []
+        with self.connection:
+            for path, jam in load_corpus(sorted(stale), n_jobs=n_jobs,
+                                         pool=pool, errors=errors,
+                                         validate=False, lazy=True):
+                self.__add(path, stale[path], jam)
+                indexed.append(path)
+
+            if prune:
+                found = set(paths)
+                for path, in self.connection.execute(
+                        'SELECT path FROM files').fetchall():
+                    if path not in found:
+                        self.__remove(path)
+
+        return indexed
+
+    def query(self, namespace=None, annotator=None, curator=None,
+              corpus=None, version=None, data_source=None, title=None,
+              artist=None, release=None, min_duration=None,
+              max_duration=None, min_observations=None,
+              min_annotation_duration=None, max_annotation_duration=None):
+        '''Find annotations matching a query.
+
+        String arguments are regular expressions, matched against the
+        start of the field, as in `jams.JObject.search`.
+        Arguments which are `None` are ignored.
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace of the annotation
+
+        annotator, curator : str
+            The name of the annotator or curator
+
+        corpus, version, data_source : str
+            Annotation metadata fields
+
+        title, artist, release : str
+            File metadata fields
+
+        min_duration, max_duration : float
+            Bounds (inclusive) on the duration of the file
+            (`jam.file_metadata.duration`), in seconds
+
+        min_observations : int
+            The minimum number of observations of the annotation
+
+        min_annotation_duration, max_annotation_duration : float
+            Bounds (inclusive) on the duration of the annotation
+            (`annotation.duration`), in seconds.
+            Annotations with no duration do not match either bound.
+
+        Returns
+        -------
+        selection : list of (path, positions)
+            Each file containing matching annotations, sorted by path,
+            and the positions of its matching annotations within
+            `jam.annotations`.
+
+            This can be passed to `Catalog.load`.
+        '''
+        patterns = dict(namespace=namespace, annotator=annotator,
+                        curator=curator, corpus=corpus, version=version,
+                        data_source=data_source, title=title, artist=artist,
+                        release=release)
+
+        clauses = []
+        params = []
+        for name, column in __TEXT_FIELDS__:
+            if patterns[name] is not None:
+                clauses.append('{} REGEXP ?'.format(column))
+                params.append(patterns[name])
+
+        for value, clause in [(min_duration, 'f.duration >= ?'),
+                              (max_duration, 'f.duration <= ?'),
+                              (min_observations, 'a.n_observations >= ?'),
+                              (min_annotation_duration, 'a.duration >= ?'),
+                              (max_annotation_duration, 'a.duration <= ?')]:
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        sql = ('SELECT f.path, a.position FROM annotations AS a '
+               'JOIN files AS f ON a.file_id = f.id')
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY f.path, a.position'
+
+        rows = self.connection.execute(sql, params)
+
+        return [(path, [position for _, position in group])
+                for path, group in itertools.groupby(rows,
+                                                     key=lambda row: row[0])]
+
+    def load(self, selection, validate=True, strict=True, lazy=False,
+             **kwargs):
+        '''Load selected annotations from cataloged files.
+
+        Only the selected annotations of each file have their observations
+        constructed (and validated).
+
+        Parameters
+        ----------
+        selection : iterable of (path, positions)
+            Files, and the positions of the annotations to load,
+            as generated by `Catalog.query`.
+
+        validate : bool
+            Validate the selected annotations
+
+        strict : bool
+            if `validate == True`, enforce strict schema validation
+
+        lazy : bool
+            If `True`, observations are built when they are first accessed.
+
+        kwargs
+            Additional keyword arguments to `jams.load`
+
+        Yields
+        ------
+        path : str
+            The path of the file
+
+        jam : JAMS
+            The loaded `JAMS` object, containing only the selected
+            annotations, in the order given.
+
+        Raises
+        ------
+        JamsError
+            If a file has been modified or removed since it was cataloged
+        '''
+        for path, positions in selection:
+            stat = os.stat(path) if os.path.exists(path) else None
+            if (stat is None or
+                    self.__stat(path) != (stat.st_mtime, stat.st_size)):
+                raise JamsError('File has changed since it was '
+                                'cataloged: {}'.format(path))
+
+            jam = core.load(path, validate=False, lazy=True, **kwargs)
+            jam.annotations[:] = [jam.annotations[i] for i in positions]
+
+            if validate:
+                jam.validate(strict=strict)
+
+            if not lazy:
+                for ann in jam.annotations:
+                    ann._build_pending()
+
+            yield path, jam
+
+    def __stat(self, path):
+        '''Get the (mtime, size) of a cataloged file, or `None`'''
+        row = self.connection.execute('SELECT mtime, size FROM files '
+                                      'WHERE path = ?', (path,)).fetchone()
+        return tuple(row) if row is not None else None
+
+    def __remove(self, path):
+        '''Remove a file from the catalog'''
+        self.connection.execute('DELETE FROM annotations WHERE file_id IN '
+                                '(SELECT id FROM files WHERE path = ?)',
+                                (path,))
+        self.connection.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def __add(self, path, stat, jam):
+        '''Add (or replace) a file in the catalog'''
+        self.__remove(path)
+
+        fmeta = jam.file_metadata
+        cursor = self.connection.execute(
+            'INSERT INTO files (path, mtime, size, title, artist, release, '
+            'duration, jams_version, file_metadata) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (path, stat.st_mtime, stat.st_size, fmeta.title, fmeta.artist,
+             fmeta.release, fmeta.duration, fmeta.jams_version,
+             json.dumps(fmeta.__json__)))
+
+        file_id = cursor.lastrowid
+
+        records = []
+        for position, ann in enumerate(jam.annotations):
+            ameta = ann.annotation_metadata
+            records.append((file_id, position, ann.namespace, ann.time,
+                            ann.duration, ann._n_observations(),
+                            _text(ameta.annotator.__dict__.get('name')),
+                            _text(ameta.curator.name),
+                            _text(ameta.corpus),
+                            _text(ameta.version),
+                            _text(ameta.data_source),
+                            json.dumps(ameta.__json__)))
+
+        self.connection.executemany(
+            'INSERT INTO annotations (file_id, position, namespace, time, '
+            'duration, n_observations, annotator, curator, corpus, version, '
+            'data_source, annotation_metadata) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', records)
+
+
+def _text(value):
+    '''Convert a metadata field to text, or `None` if it is unset'''
+    if value is None:
+        return None
+    return six.text_type(value)
+
+
+def _regexp(pattern, value):
+    '''Implementation of the SQLite REGEXP operator'''
+    return value is not None and re.match(pattern, value) is not None
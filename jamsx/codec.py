@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+r'''
+JSON codecs
+-----------
+
+JAMS files are parsed and serialized through a pluggable JSON codec.
+By default, the fastest installed backend is used, in order of preference:
+`orjson`, `ujson`, `simdjson`, and finally the standard library `json`
+module, which is always available.
+
+The backend can be selected globally with `set_backend`, or for a single
+call by passing `backend=` to `jams.load`, `JAMS.save`, `JObject.dumps`,
+or `JObject.loads`.
+
+Input which the selected backend cannot parse, such as the non-standard
+`NaN` literal written by the standard library, is transparently re-parsed
+with the standard library.  Likewise, objects containing non-finite
+floats are encoded by the standard library, so that they are preserved.
+
+.. autosummary::
+    :toctree: generated/
+
+    list_backends
+    get_backend
+    set_backend
+'''
+
+import json
+
+import numpy as np
+
+from .exceptions import ParameterError
+
+__all__ = ['list_backends', 'get_backend', 'set_backend']
+
+
+def _default(obj):
+    '''Fallback encoder for numpy types in the standard library codec'''
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError('Object of type {} is not JSON '
+                    'serializable'.format(type(obj).__name__))
+
+
+def _has_nonfinite(obj):
+    '''Test if an object contains any NaN or infinite floats'''
+    if isinstance(obj, (float, np.floating)):
+        return not -np.inf < obj < np.inf
+    elif isinstance(obj, np.ndarray):
+        return obj.dtype.kind in 'fc' and not np.all(np.isfinite(obj))
+    elif isinstance(obj, dict):
+        return any(_has_nonfinite(_) for _ in obj.values())
+    elif isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite(_) for _ in obj)
+    return False
+
+
+class JSONCodec(object):
+    '''Standard library JSON codec.
+
+    Codecs expose `load`, `loads`, `dump`, and `dumps` methods mirroring
+    those of the `json` module.
+
+    Attributes
+    ----------
+    name : str
+        The name of the backend
+
+    native_numpy : bool
+        If `True`, the codec can encode numpy arrays directly,
+        so they need not be converted to lists prior to serialization.
+    '''
+    name = 'json'
+    native_numpy = False
+
+    def loads(self, string):
+        '''De-serialize a JSON string'''
+        return json.loads(string)
+
+    def load(self, fdesc):
+        '''De-serialize JSON from an open file descriptor'''
+        return self.loads(fdesc.read())
+
+    def dumps(self, obj, **kwargs):
+        '''Serialize an object to a JSON string.
+
+        Parameters
+        ----------
+        obj
+            The object to serialize
+
+        kwargs
+            Additional keyword arguments to `json.dumps`
+        '''
+        kwargs.setdefault('default', _default)
+        return json.dumps(obj, **kwargs)
+
+    def dump(self, obj, fdesc, **kwargs):
+        '''Serialize an object as JSON into an open file descriptor'''
+        fdesc.write(self.dumps(obj, **kwargs))
+
+    def __repr__(self):
+        return '<{:s} codec>'.format(self.name)
+
+
+class StdlibCodec(JSONCodec):
+    '''Codec using the standard library `json` module'''
+
+    def load(self, fdesc):
+        return json.load(fdesc)
+
+
+class OrjsonCodec(JSONCodec):
+    '''Codec using `orjson`.
+
+    Numpy arrays are serialized natively.  Any options not supported by
+    `orjson` (e.g., `indent=4`) cause a fallback to the standard library.
+
+    Output is compact (no spaces after separators), so it differs in
+    formatting, but not content, from that of the standard library.
+    '''
+    name = 'orjson'
+    native_numpy = True
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, string):
+        try:
+            return self._orjson.loads(string)
+        except ValueError:
+            # Non-standard JSON (e.g., NaN) requires the standard library
+            return _STDLIB.loads(string)
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        sort_keys = kwargs.pop('sort_keys', False)
+
+        if kwargs or indent not in (None, 2):
+            return _STDLIB.dumps(obj, indent=indent, sort_keys=sort_keys,
+                                 **kwargs)
+
+        option = (self._orjson.OPT_SERIALIZE_NUMPY |
+                  self._orjson.OPT_NON_STR_KEYS)
+        if indent:
+            option |= self._orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= self._orjson.OPT_SORT_KEYS
+
+        try:
+            output = self._orjson.dumps(obj, option=option)
+        except self._orjson.JSONEncodeError:
+            return _STDLIB.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+        # orjson silently encodes NaN and infinity as null
+        if b'null' in output and _has_nonfinite(obj):
+            return _STDLIB.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+        return output.decode('utf-8')
+
+
+class UjsonCodec(JSONCodec):
+    '''Codec using `ujson`.
+
+    Any options not supported by `ujson` cause a fallback to the
+    standard library.
+    '''
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, string):
+        try:
+            return self._ujson.loads(string)
+        except ValueError:
+            # Non-standard JSON (e.g., NaN) requires the standard library
+            return _STDLIB.loads(string)
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        sort_keys = kwargs.pop('sort_keys', False)
+
+        if kwargs:
+            return _STDLIB.dumps(obj, indent=indent, sort_keys=sort_keys,
+                                 **kwargs)
+        try:
+            return self._ujson.dumps(obj, indent=indent or 0,
+                                     sort_keys=sort_keys,
+                                     escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return _STDLIB.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+class SimdjsonCodec(JSONCodec):
+    '''Codec using `simdjson` for parsing.
+
+    `simdjson` does not provide an encoder, so serialization is delegated
+    to the standard library.
+    '''
+    name = 'simdjson'
+
+    def __init__(self):
+        import simdjson
+        self._simdjson = simdjson
+
+    def loads(self, string):
+        try:
+            return self._simdjson.loads(string)
+        except ValueError:
+            # Non-standard JSON (e.g., NaN) requires the standard library
+            return _STDLIB.loads(string)
+
+    def dumps(self, obj, **kwargs):
+        return _STDLIB.dumps(obj, **kwargs)
+
+
+_STDLIB = StdlibCodec()
+
+# Backends in order of preference
+__BACKENDS__ = [('orjson', OrjsonCodec),
+                ('ujson', UjsonCodec),
+                ('simdjson', SimdjsonCodec),
+                ('json', StdlibCodec)]
+
+__CODECS__ = dict(json=_STDLIB)
+
+__DEFAULT__ = 'auto'
+
+
+def _get_codec(name):
+    '''Instantiate (or retrieve) the codec for a named backend'''
+    if name not in __CODECS__:
+        for key, cls in __BACKENDS__:
+            if key == name:
+                try:
+                    __CODECS__[key] = cls()
+                except ImportError:
+                    __CODECS__[key] = None
+                break
+        else:
+            raise ParameterError('Unknown JSON backend: {}'.format(name))
+
+    return __CODECS__[name]
+
+
+def list_backends():
+    '''List the installed JSON backends, in order of preference.
+
+    Returns
+    -------
+    backends : list of str
+        Names of available backends
+
+    Examples
+    --------
+    >>> jams.codec.list_backends()
+    ['orjson', 'json']
+    '''
+    return [name for name, _ in __BACKENDS__ if _get_codec(name) is not None]
+
+
+def get_backend(name=None):
+    '''Get a JSON codec.
+
+    Parameters
+    ----------
+    name : str or None
+        The name of the backend, one of
+        `['auto', 'orjson', 'ujson', 'simdjson', 'json']`.
+
+        If `auto`, the first available backend is used.
+
+        If `None`, the global default (see `set_backend`) is used.
+
+    Returns
+    -------
+    codec : JSONCodec
+        The codec object
+
+    Raises
+    ------
+    ParameterError
+        If `name` is unknown or not installed
+    '''
+    if name is None:
+        name = __DEFAULT__
+
+    if name == 'auto':
+        return _get_codec(list_backends()[0])
+
+    codec = _get_codec(name)
+
+    if codec is None:
+        raise ParameterError('JSON backend "{}" is not installed'.format(name))
+
+    return codec
+
+
+def set_backend(name):
+    '''Set the default JSON backend.
+
+    Parameters
+    ----------
+    name : str
+        The name of the backend, one of
+        `['auto', 'orjson', 'ujson', 'simdjson', 'json']`.
+
+    Raises
+    ------
+    ParameterError
+        If `name` is unknown or not installed
+
+    Examples
+    --------
+    >>> # Always use the standard library
+    >>> jams.codec.set_backend('json')
+    >>> # Use the fastest available backend
+    >>> jams.codec.set_backend('auto')
+    '''
+    global __DEFAULT__
+
+    # Make sure the backend exists
+    get_backend(name)
+    __DEFAULT__ = name
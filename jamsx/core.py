@@ -13,6 +13,8 @@ Function reference
     :toctree: generated/
 
     load
+    iter_annotations
+    trusted
 
 Object reference
 ^^^^^^^^^^^^^^^^
@@ -27,18 +29,28 @@ Object reference
     Curator
     Annotation
     Observation
+    ObservationArray
     Sandbox
     JObject
     Observation
 """
 
 import json
+import codecs
 from collections import namedtuple
+try:
+    from collections.abc import Sequence
+except ImportError:  # pragma: no cover
+    from collections import Sequence
 
 import os
 import re
+import bisect
+import operator
+import weakref
 import warnings
 import contextlib
+import threading
 import gzip
 import six
 
@@ -50,14 +62,19 @@ from decorator import decorator
 
 from .version import version as __VERSION__
 from . import schema
-from .exceptions import JamsError, SchemaError, ParameterError
+from . import codec
+from . import binary
+from .exceptions import JamsError, SchemaError, ParameterError, NamespaceError
 
 
-__all__ = ['load',
+__all__ = ['load', 'iter_annotations',
            'JObject', 'Sandbox',
            'Annotation', 'Curator', 'AnnotationMetadata',
            'FileMetadata', 'AnnotationArray', 'JAMS',
-           'Observation']
+           'Observation', 'ObservationArray', 'trusted']
+
+# Depth of nested `trusted` contexts, per thread
+__TRUSTED__ = threading.local()
 
 
 def deprecated(version, version_removed):
@@ -83,6 +100,43 @@ def deprecated(version, version_removed):
     return decorator(__wrapper)
 
 
+@contextlib.contextmanager
+def trusted():
+    '''A context in which annotation data is trusted to remain valid.
+
+    Each time the observations of an annotation pass validation, the
+    namespace they were validated against is recorded on the observation
+    container.  Within this context, `Annotation.validate` skips
+    validating observations which have not been modified since they were
+    last validated against the annotation's namespace.
+    The remaining (annotation-level) fields are always validated.
+
+    This avoids the repeated validation performed by, e.g.,
+    `jams.eval` and `jams.sonify`, which validate their inputs both
+    before and after namespace conversion.
+
+    Modifications through the observation container (e.g.,
+    `Annotation.append`) are detected.  Modifications made in place
+    to observation values (e.g., a `dict` value, or a column of an
+    `ObservationArray`) are not, which is why this behavior must be
+    requested explicitly.
+
+    The context applies only to the current thread.
+
+    Examples
+    --------
+    >>> with jams.trusted():
+    ...     for est_ann in estimates:
+    ...         scores.append(jams.eval.chord(ref_ann, est_ann))
+    '''
+    depth = getattr(__TRUSTED__, 'depth', 0)
+    __TRUSTED__.depth = depth + 1
+    try:
+        yield
+    finally:
+        __TRUSTED__.depth = depth
+
+
 @contextlib.contextmanager
 def _open(name_or_fdesc, mode='r', fmt='auto'):
     '''An intelligent wrapper for ``open``.
@@ -98,7 +152,7 @@ def _open(name_or_fdesc, mode='r', fmt='auto'):
         The mode with which to open the file.
         See ``open`` for details.
 
-    fmt : string ['auto', 'jams', 'json', 'jamz']
+    fmt : string ['auto', 'jams', 'json', 'jamz', 'jamb']
         The encoding for the input/output stream.
 
         If `auto`, the format is inferred from the filename extension.
@@ -115,7 +169,8 @@ def _open(name_or_fdesc, mode='r', fmt='auto'):
     open_map = {'jams': open,
                 'json': open,
                 'jamz': gzip.open,
-                'gz': gzip.open}
+                'gz': gzip.open,
+                'jamb': open}
 
     # If we've been given an open descriptor, do the right thing
     if hasattr(name_or_fdesc, 'read') or hasattr(name_or_fdesc, 'write'):
@@ -123,22 +178,17 @@ def _open(name_or_fdesc, mode='r', fmt='auto'):
 
     elif isinstance(name_or_fdesc, six.string_types):
         # Infer the opener from the extension
-
-        if fmt == 'auto':
-            _, ext = os.path.splitext(name_or_fdesc)
-
-            # Pull off the extension separator
-            ext = ext[1:]
-        else:
-            ext = fmt
+        ext = _get_format(name_or_fdesc, fmt)
 
         try:
-            ext = ext.lower()
-
             # Force text mode if we're using gzip
             if ext in ['jamz', 'gz'] and 't' not in mode:
                 mode = '{:s}t'.format(mode)
 
+            # Force binary mode for binary containers
+            if ext == 'jamb' and 'b' not in mode:
+                mode = '{:s}b'.format(mode)
+
             with open_map[ext](name_or_fdesc, mode=mode) as fdesc:
                 yield fdesc
 
@@ -152,7 +202,36 @@ def _open(name_or_fdesc, mode='r', fmt='auto'):
                              'descriptor: {}'.format(name_or_fdesc))
 
 
-def load(path_or_file, validate=True, strict=True, fmt='auto'):
+def _get_format(name_or_fdesc, fmt='auto'):
+    '''Determine the encoding format of a file.
+
+    Parameters
+    ----------
+    name_or_fdesc : string-type or open file descriptor
+        The file in question
+
+    fmt : string
+        The requested format.
+        If `auto`, the format is inferred from the filename extension,
+        and open file descriptors are assumed to be `jams`.
+
+    Returns
+    -------
+    fmt : str
+        The lower-case format identifier
+    '''
+    if fmt == 'auto':
+        if isinstance(name_or_fdesc, six.string_types):
+            # Pull off the extension separator
+            fmt = os.path.splitext(name_or_fdesc)[1][1:]
+        else:
+            fmt = 'jams'
+
+    return fmt.lower()
+
+
+def load(path_or_file, validate=True, strict=True, fmt='auto',
+         columnar=False, backend=None, lazy=False, mmap=False):
     r"""Load a JAMS Annotation from a file.
 
 
@@ -169,7 +248,7 @@ def load(path_or_file, validate=True, strict=True, fmt='auto'):
     strict : bool
         if `validate == True`, enforce strict schema validation
 
-    fmt : str ['auto', 'jams', 'jamz']
+    fmt : str ['auto', 'jams', 'jamz', 'jamb']
         The encoding format of the input
 
         If `auto`, encoding is inferred from the file name.
@@ -177,6 +256,36 @@ def load(path_or_file, validate=True, strict=True, fmt='auto'):
         If the input is an open file handle, `jams` encoding
         is used.
 
+        `jamb` files must be opened in binary mode.
+        See `jams.binary` for details.
+
+    columnar : bool
+        If `True`, store annotation observations in columnar
+        `ObservationArray` containers.
+
+        See `Annotation` for details.
+
+    backend : str or None
+        The JSON backend used to parse the input.
+        If `None`, the default backend is used.
+        This has no effect for `jamb` input.
+
+        See `jams.codec.get_backend` for details.
+
+    lazy : bool
+        If `True`, observation data of each annotation is only
+        built (and validated) the first time it is accessed.
+        File and annotation metadata are loaded (and validated) immediately.
+
+    mmap : bool
+        If `True`, numeric observation columns are memory-mapped
+        read-only from the file, rather than read into memory.
+        Annotations are stored in columnar `ObservationArray` containers,
+        which are backed by `np.memmap` arrays.
+        This requires `jamb` input from a file on disk, and
+        implies `columnar=True`.
+        Modifying a memory-mapped annotation copies its data into memory.
+
 
     Returns
     -------
@@ -189,11 +298,15 @@ def load(path_or_file, validate=True, strict=True, fmt='auto'):
     SchemaError
         if `validate == True`, `strict==True`, and validation fails
 
+    ParameterError
+        if `mmap == True` and the input is not a `jamb` file on disk
+
 
     See also
     --------
     JAMS.validate
     JAMS.save
+    jams.codec.set_backend
 
 
     Examples
@@ -207,10 +320,40 @@ def load(path_or_file, validate=True, strict=True, fmt='auto'):
     >>> J = jams.load('data.jams', strict=False)
     >>> # No validation at all
     >>> J = jams.load('data.jams', validate=False)
+    >>> # Columnar observation storage
+    >>> J = jams.load('data.jams', columnar=True)
+    >>> # Only build the observations of annotations which are used
+    >>> J = jams.load('data.jams', lazy=True)
+    >>> chords = J.search(namespace='chord')
+    >>> # Share numeric data between processes via the page cache
+    >>> J = jams.load('data.jamb', mmap=True)
     """
 
+    fmt = _get_format(path_or_file, fmt)
+
+    if mmap and fmt != 'jamb':
+        raise ParameterError('mmap=True requires jamb input, '
+                             'not {}'.format(fmt))
+
     with _open(path_or_file, mode='r', fmt=fmt) as fdesc:
-        jam = JAMS(**json.load(fdesc))
+        if fmt == 'jamb':
+            jam_dict = _jamb_decode(*binary.load(fdesc, mmap=mmap))
+        else:
+            jam_dict = codec.get_backend(backend).load(fdesc)
+
+    if mmap:
+        annotations = jam_dict.pop('annotations', None) or []
+        jam = JAMS(**jam_dict)
+        jam.annotations.extend(_mapped_annotation(**ann)
+                               for ann in annotations)
+
+    elif columnar or lazy:
+        annotations = jam_dict.pop('annotations', None) or []
+        jam = JAMS(**jam_dict)
+        jam.annotations.extend(Annotation(columnar=columnar, lazy=lazy, **ann)
+                               for ann in annotations)
+    else:
+        jam = JAMS(**jam_dict)
 
     if validate:
         jam.validate(strict=strict)
@@ -218,6 +361,363 @@ def load(path_or_file, validate=True, strict=True, fmt='auto'):
     return jam
 
 
+def _jamb_encode(jam):
+    '''Convert a JAMS object to a binary container document.
+
+    Numeric observation columns are stored as arrays.
+    All other fields are stored as JSON.
+
+    Parameters
+    ----------
+    jam : JAMS
+        The JAMS object
+
+    Returns
+    -------
+    document : dict
+        The JSON document
+
+    arrays : list of np.ndarray
+        The numeric columns referenced from `document`
+    '''
+    document = jam.__json_light__
+    document['annotations'] = []
+    arrays = []
+
+    for ann in jam.annotations:
+        ann_dict = ann.__json_light__(data=False)
+        ann_dict['data'] = dict()
+
+        for field, values in zip(Observation._fields, ann._data_columns()):
+            arr = _binary_column(values)
+
+            if arr is None:
+                ann_dict['data'][field] = [serialize_obj(_) for _ in values]
+            else:
+                ann_dict['data'][field] = dict(array=len(arrays))
+                arrays.append(arr)
+
+        document['annotations'].append(ann_dict)
+
+    return document, arrays
+
+
+def _jamb_decode(document, arrays):
+    '''Convert a binary container document to a JAMS dictionary.
+
+    Parameters
+    ----------
+    document : dict
+        The JSON document, as produced by `_jamb_encode`
+
+    arrays : list of np.ndarray
+        The arrays referenced from `document`
+
+    Returns
+    -------
+    jam_dict : dict
+        The JAMS dictionary, with observation data as columns
+    '''
+    for ann in document.get('annotations') or []:
+        data = ann.get('data')
+
+        if isinstance(data, dict):
+            for field, column in six.iteritems(data):
+                if isinstance(column, dict):
+                    data[field] = arrays[column['array']]
+
+    return document
+
+
+def _mapped_annotation(data=None, **kwargs):
+    '''Construct a columnar annotation which uses the given observation
+    columns (e.g., memory-mapped arrays) without copying them.
+
+    Parameters
+    ----------
+    data : dict of columns
+        Observation columns, as produced by `_jamb_decode`.
+        Numeric columns should be arrays; other columns may be lists.
+
+    kwargs
+        Additional parameters to `Annotation`
+
+    Returns
+    -------
+    ann : Annotation
+    '''
+    ann = Annotation(columnar=True, **kwargs)
+
+    if not isinstance(data, dict):
+        ann.append_records(data or [])
+        return ann
+
+    if set(data) != set(Observation._fields):
+        raise ParameterError('Observation columns must be '
+                             '{}'.format(Observation._fields))
+
+    columns = []
+    for field, dtype in zip(Observation._fields,
+                            [np.float64, np.float64,
+                             ann.data._value.dtype,
+                             ann.data._confidence.dtype]):
+        column = data[field]
+
+        if not isinstance(column, np.ndarray):
+            typed = _typed_array(column, dtype)
+            column = _object_array(column) if typed is None else typed
+
+        if field in ('time', 'duration') and column.dtype.kind != 'f':
+            column = _float_array(column)
+
+        columns.append(column)
+
+    if (len(set(len(_) for _ in columns)) == 1 and
+            _is_sorted(columns[0])):
+        ann.data = ObservationArray._wrap(*columns)
+    else:
+        ann.append_columns(dict(zip(Observation._fields, columns)))
+
+    return ann
+
+
+def _binary_column(values):
+    '''Pack an observation column as a numeric array, if it can be
+    stored exactly.
+
+    Parameters
+    ----------
+    values : sequence
+        The column
+
+    Returns
+    -------
+    column : np.ndarray or None
+        The packed column, or `None` if `values` are not all floats,
+        all integers, or all booleans.
+
+    Notes
+    -----
+    Float columns containing NaN are not packed, so that they load
+    (and compare) identically to JSON input.
+    '''
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        column = values
+
+    else:
+        column = _pack_native(values)
+
+    if column is not None and column.dtype.kind == 'f' and \
+            np.isnan(column).any():
+        return None
+
+    return column
+
+
+def _pack_native(values):
+    '''Pack a sequence of native floats, integers, or booleans into an
+    array, or return `None` if the types are mixed.'''
+    types = set(map(type, values))
+
+    if not types:
+        return None
+    elif all(issubclass(_, float) for _ in types):
+        return np.asarray(values, dtype=np.float64)
+    elif types == {bool}:
+        return np.asarray(values, dtype=np.bool_)
+    elif all(issubclass(_, six.integer_types) and not issubclass(_, bool)
+             for _ in types):
+        try:
+            return np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            return None
+
+    return None
+
+
+def iter_annotations(path_or_file, validate=True, strict=True, fmt='auto',
+                     columnar=False, chunk_size=2**16):
+    r"""Iterate over the annotations of a JAMS file without loading
+    the entire file.
+
+    The input is parsed incrementally, so that only one annotation
+    is held in memory at a time.  Fields other than `annotations`
+    (e.g., `file_metadata`) are skipped.
+
+    Parameters
+    ----------
+    path_or_file : str or file-like
+        Path to the JAMS file to load
+        OR
+        An open file handle to load from.
+
+    validate : bool
+        Attempt to validate each annotation
+
+    strict : bool
+        if `validate == True`, enforce strict schema validation
+
+    fmt : str ['auto', 'jams', 'jamz']
+        The encoding format of the input
+
+        If `auto`, encoding is inferred from the file name.
+
+        If the input is an open file handle, `jams` encoding
+        is used.
+
+    columnar : bool
+        If `True`, store annotation observations in columnar
+        `ObservationArray` containers.
+
+    chunk_size : int > 0
+        The number of characters to read from the input at a time
+
+    Yields
+    ------
+    index : int
+        The position of the annotation within the file
+
+    annotation : Annotation
+        The annotation object
+
+    Raises
+    ------
+    SchemaError
+        if `validate == True`, `strict==True`, and validation fails
+
+    JamsError
+        if the input is not a JSON object
+
+    See also
+    --------
+    load
+
+    Examples
+    --------
+    >>> for i, ann in jams.iter_annotations('huge.jamz'):
+    ...     if ann.namespace == 'beat':
+    ...         print(i, len(ann.data))
+    """
+
+    with _open(path_or_file, mode='r', fmt=fmt) as fdesc:
+        stream = _JSONStream(fdesc, chunk_size=chunk_size)
+
+        stream.expect('{')
+        delimiter = stream.next_char('}')
+
+        while delimiter != '}':
+            key = stream.decode()
+            stream.expect(':')
+
+            if key != 'annotations':
+                # Parse and discard the value
+                stream.decode()
+
+            elif stream.expect('[', 'null') == '[':
+                index = 0
+                delimiter = stream.next_char(']')
+
+                while delimiter != ']':
+                    ann = Annotation(columnar=columnar, **stream.decode())
+
+                    if validate:
+                        ann.validate(strict=strict)
+
+                    yield index, ann
+                    index += 1
+                    delimiter = stream.expect(',', ']')
+
+            delimiter = stream.expect(',', '}')
+
+
+class _JSONStream(object):
+    '''Incremental decoder for JSON values from a text stream.
+
+    Values are decoded from a buffer, which is extended from the
+    stream until it contains a complete value.
+    '''
+
+    _WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, fdesc, chunk_size=2**16):
+        self.fdesc = fdesc
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.bytes_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def _fill(self, size):
+        '''Discard consumed input, and read up to `size` more characters'''
+        chunk = self.fdesc.read(size)
+
+        if isinstance(chunk, six.binary_type):
+            chunk = self.bytes_decoder.decode(chunk, final=not chunk)
+
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def _skip(self):
+        '''Skip whitespace, reading more input if necessary'''
+        while True:
+            self.pos = self._WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return
+            self._fill(self.chunk_size)
+
+    def next_char(self, *tokens):
+        '''Consume the next token if it is one of `tokens`.
+
+        Returns the consumed token, or the next character if it is not
+        one of `tokens`.  At the end of the input, an empty string
+        is returned.
+        '''
+        self._skip()
+
+        for token in tokens:
+            while (len(self.buffer) - self.pos < len(token) and
+                   not self.eof):
+                self._fill(self.chunk_size)
+
+            if self.buffer.startswith(token, self.pos):
+                self.pos += len(token)
+                return token
+
+        return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, *tokens):
+        '''Consume one of `tokens`, or raise an exception if none is next'''
+        found = self.next_char(*tokens)
+        if found not in tokens:
+            raise JamsError('Expected {} in JSON input, found "{:s}"'
+                            .format(' or '.join('"{:s}"'.format(_)
+                                                for _ in tokens), found))
+        return found
+
+    def decode(self):
+        '''Decode the next complete JSON value'''
+        self._skip()
+
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer, self.pos)
+
+                # A value ending at the buffer boundary may be incomplete
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return obj
+
+            except ValueError:
+                if self.eof:
+                    raise
+
+            # Grow the buffer geometrically, so that large values
+            # are re-parsed only a few times.
+            self._fill(max(self.chunk_size, len(self.buffer)))
+
+
 class JObject(object):
     r"""Dict-like object for JSON Serialization.
 
@@ -227,6 +727,11 @@ class JObject(object):
     By setting the `type` attribute to a defined schema entry, only the fields
     allowed by the schema are permitted as attributes.
     """
+    # Containers to notify when a searchable field changes (see `_touch`).
+    # These are registered by `_SearchIndex`, and kept out of `__dict__`
+    # so that they are neither serialized nor compared.
+    __slots__ = ['__dict__', '__weakref__', '_owners']
+
     def __init__(self, **kwargs):
         '''Construct a new JObject
 
@@ -262,6 +767,19 @@ class JObject(object):
     def __json__(self):
         r"""Return the JObject as a set of native data types for serialization.
 
+        Note: attributes beginning with underscores are suppressed.
+        """
+        return self.__json_encode__()
+
+    def __json_encode__(self, native_numpy=False):
+        r"""Return the JObject as a set of data types for serialization.
+
+        Parameters
+        ----------
+        native_numpy : bool
+            If `True`, observation data may be left as numpy arrays
+            for encoders which support them natively.
+
         Note: attributes beginning with underscores are suppressed.
         """
         filtered_dict = dict()
@@ -270,7 +788,9 @@ class JObject(object):
             if k.startswith('_'):
                 continue
 
-            if hasattr(item, '__json__'):
+            if hasattr(item, '__json_encode__'):
+                filtered_dict[k] = item.__json_encode__(native_numpy=native_numpy)
+            elif hasattr(item, '__json__'):
                 filtered_dict[k] = item.__json__
             else:
                 filtered_dict[k] = serialize_obj(item)
@@ -299,8 +819,63 @@ class JObject(object):
             if name not in props:
                 raise SchemaError("Attribute {} not in {}"
                                   .format(name, props.keys()))
+
+        touch = (name in _SearchIndex.FIELDS or isinstance(value, JObject) or
+                 isinstance(self.__dict__.get(name), JObject))
+
         self.__dict__[name] = value
 
+        if touch:
+            self._touch()
+
+    def __getstate__(self):
+        return self.__dict__
+
+    def _attach(self, owner):
+        '''Register a container of this object, to be notified by `_touch`
+
+        Parameters
+        ----------
+        owner : JObject or AnnotationArray
+            The container.  Only a weak reference is kept.
+        '''
+        owners = getattr(self, '_owners', None)
+
+        if owners is None:
+            owners = dict()
+            object.__setattr__(self, '_owners', owners)
+        elif len(owners) >= 16:
+            # Forget containers which no longer exist
+            for key, ref in list(six.iteritems(owners)):
+                if ref() is None:
+                    del owners[key]
+
+        owners[id(owner)] = weakref.ref(owner)
+
+    def _touch(self):
+        '''Notify the containers of this object (and their containers) that
+        a searchable field may have changed'''
+        if not getattr(self, '_owners', None):
+            return
+
+        pending = [self]
+        seen = set()
+
+        while pending:
+            obj = pending.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+
+            if isinstance(obj, AnnotationArray):
+                obj._invalidate()
+                continue
+
+            for ref in list(six.itervalues(getattr(obj, '_owners', {}))):
+                owner = ref()
+                if owner is not None:
+                    pending.append(owner)
+
     def __contains__(self, key):
         return key in self.__dict__
 
@@ -390,11 +965,17 @@ class JObject(object):
     def __str__(self):
         return json.dumps(self.__json__, indent=2)
 
-    def dumps(self, **kwargs):
+    def dumps(self, backend=None, **kwargs):
         '''Serialize the JObject to a string.
 
         Parameters
         ----------
+        backend : str or None
+            The JSON backend to use.
+            If `None`, the default backend is used.
+
+            See `jams.codec.get_backend` for details.
+
         kwargs
             Keyword arguments to json.dumps
 
@@ -403,19 +984,30 @@ class JObject(object):
         object_str : str
             Serialized JObject
 
+            The output decodes to the same data with every backend, but its
+            formatting (e.g., whitespace) depends on the backend, and hence
+            on which packages are installed.
+            Use `backend='json'` for the formatting of `json.dumps`.
+
         See Also
         --------
         json.dumps
         loads
+        jams.codec.set_backend
 
         Examples
         --------
         >>> J = jams.JObject(foo=5, bar='baz')
-        >>> J.dumps()
+        >>> J.dumps(backend='json')
         '{"foo": 5, "bar": "baz"}'
+        >>> # With orjson installed, the default backend is compact
+        >>> J.dumps()
+        '{"foo":5,"bar":"baz"}'
 
         '''
-        return json.dumps(self.__json__, **kwargs)
+        encoder = codec.get_backend(backend)
+        return encoder.dumps(self.__json_encode__(native_numpy=encoder.native_numpy),
+                             **kwargs)
 
     def keys(self):
         """Return a list of the attributes of the object.
@@ -459,7 +1051,7 @@ class JObject(object):
         return self.__class__.__name__
 
     @classmethod
-    def loads(cls, string):
+    def loads(cls, string, backend=None):
         '''De-serialize a JObject
 
         Parameters
@@ -467,6 +1059,12 @@ class JObject(object):
         string : str
             A serialized (JSON string) JObject
 
+        backend : str or None
+            The JSON backend to use.
+            If `None`, the default backend is used.
+
+            See `jams.codec.get_backend` for details.
+
         Returns
         -------
         J : JObject
@@ -485,7 +1083,7 @@ class JObject(object):
         >>> jams.JObject.loads(J.dumps())
         <JObject foo, bar>
         '''
-        return cls.__json_init__(**json.loads(string))
+        return cls.__json_init__(**codec.get_backend(backend).loads(string))
 
     def search(self, **kwargs):
         '''Query this object (and its descendants).
@@ -529,34 +1127,7 @@ class JObject(object):
         >>> J.search(foo=lambda x: x > 10)
         False
         '''
-
-        match = False
-
-        r_query = {}
-        myself = self.__class__.__name__
-
-        # Pop this object name off the query
-        for k, value in six.iteritems(kwargs):
-            k_pop = query_pop(k, myself)
-
-            if k_pop:
-                r_query[k_pop] = value
-
-        if not r_query:
-            return False
-
-        for key in r_query:
-            if hasattr(self, key):
-                match |= match_query(getattr(self, key), r_query[key])
-
-        if not match:
-            for attr in dir(self):
-                obj = getattr(self, attr)
-
-                if isinstance(obj, JObject):
-                    match |= obj.search(**r_query)
-
-        return match
+        return _Query.compile(kwargs).match(self)
 
     def validate(self, strict=True):
         '''Validate a JObject against its schema
@@ -599,62 +1170,618 @@ Observation = namedtuple('Observation',
 '''Core observation type: (time, duration, value, confidence).'''
 
 
-class Sandbox(JObject):
-    """Sandbox (unconstrained)
+class ObservationArray(Sequence):
+    '''Columnar container for annotation observations.
 
-    Functionally identical to JObjects, but the class hierarchy might be
-    confusing if all objects inherit from Sandboxes."""
-    pass
+    This is a drop-in replacement for the `SortedKeyList` used by
+    `Annotation.data`.  Rather than storing one `Observation` tuple
+    per row, the `time` and `duration` fields are held in float64 arrays,
+    and the `value` and `confidence` fields are held in arrays whose dtypes
+    are determined by the namespace (see `schema.get_dtypes`).
 
+    If a value cannot be represented exactly in its column's dtype
+    (e.g., `None` in a numeric column), that column is promoted to
+    `object` dtype.
 
-class Annotation(JObject):
-    """Annotation base class."""
+    Observations are kept sorted by `time`.  Observations with equal
+    `time` retain their insertion order.
 
-    def __init__(self, namespace, data=None, annotation_metadata=None,
-                 sandbox=None, time=0, duration=None):
-        """Create an Annotation.
+    Examples
+    --------
+    >>> data = jams.ObservationArray(value_dtype=np.float64)
+    >>> data.add(jams.Observation(time=1.0, duration=0.0,
+    ...                           value=440.0, confidence=None))
+    >>> data.time
+    array([1.])
+    >>> data[0]
+    Observation(time=1.0, duration=0.0, value=440.0, confidence=None)
+    '''
 
-        Note that, if an argument is None, an empty Annotation is created in
-        its place. Additionally, a dictionary matching the expected structure
-        of the arguments will be parsed (i.e. instantiating from JSON).
+    _FIELDS = ('_time', '_duration', '_value', '_confidence')
+
+    # Cached `_IntervalIndex`, and the namespace against which the
+    # observations were last validated; both are cleared by any modification
+    _interval_index = None
+    _validated = None
+
+    def __init__(self, iterable=None, value_dtype=np.object_,
+                 confidence_dtype=np.object_):
+        '''Create an ObservationArray.
 
         Parameters
         ----------
-        namespace : str
-            The namespace for this annotation
+        iterable : iterable of Observations, optional
+            Initial contents of the array
 
-        data : dict of lists, list of dicts, or list of Observations
-            Data for the new annotation
+        value_dtype : numpy.dtype
+        confidence_dtype : numpy.dtype
+            Preferred storage types for the `value` and `confidence` fields
+        '''
+        self._n = 0
+        self._time = np.empty(0, dtype=np.float64)
+        self._duration = np.empty(0, dtype=np.float64)
+        self._value = np.empty(0, dtype=value_dtype)
+        self._confidence = np.empty(0, dtype=confidence_dtype)
 
-        annotation_metadata : AnnotationMetadata (or dict), default=None.
-            Metadata corresponding to this Annotation.
+        if iterable is not None:
+            self.update(iterable)
 
-        sandbox : Sandbox (dict), default=None
-            Miscellaneous information; keep to native datatypes if possible.
+    @property
+    def time(self):
+        '''Read-only view of the observation times'''
+        return self._view('_time')
 
-        time : non-negative number
-            The starting time for this annotation
+    @property
+    def duration(self):
+        '''Read-only view of the observation durations'''
+        return self._view('_duration')
 
-        duration : non-negative number
-            The duration of this annotation
-        """
+    @property
+    def value(self):
+        '''Read-only view of the observation values'''
+        return self._view('_value')
 
-        super(Annotation, self).__init__()
+    @property
+    def confidence(self):
+        '''Read-only view of the observation confidences'''
+        return self._view('_confidence')
 
-        if annotation_metadata is None:
+    def _view(self, field):
+        view = getattr(self, field)[:self._n]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        n = self._n
+        return six.moves.map(Observation._make,
+                             six.moves.zip(self._time[:n].tolist(),
+                                           self._duration[:n].tolist(),
+                                           self._value[:n].tolist(),
+                                           self._confidence[:n].tolist()))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._n))]
+
+        if idx < 0:
+            idx += self._n
+
+        if not 0 <= idx < self._n:
+            raise IndexError('ObservationArray index out of range')
+
+        return Observation(*[_as_native(getattr(self, field)[idx])
+                             for field in self._FIELDS])
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        return (len(self) == len(other) and
+                all(a == b for a, b in six.moves.zip(self, other)))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{:s}({!r})'.format(self.__class__.__name__, list(self))
+
+    def add(self, obs):
+        '''Insert a single observation, maintaining sort order.
+
+        Parameters
+        ----------
+        obs : Observation
+
+        Raises
+        ------
+        JamsError
+            If `obs` is not an `Observation`
+        '''
+        if not isinstance(obs, Observation):
+            raise JamsError('{} must be of type jams.Observation'.format(obs))
+
+        time, duration = float(obs.time), float(obs.duration)
+
+        for field, val in [('_value', obs.value),
+                           ('_confidence', obs.confidence)]:
+            column = getattr(self, field)
+            if (column.dtype != np.object_ and
+                    not _is_scalar_kind(val, column.dtype.kind)):
+                setattr(self, field, column.astype(np.object_))
+
+        n = self._n
+        self._reserve(n + 1)
+
+        if n and time < self._time[n - 1]:
+            # Out-of-order insertion: shift the tail
+            idx = self.bisect_key_right(time)
+            for field in self._FIELDS:
+                buf = getattr(self, field)
+                buf[idx + 1:n + 1] = buf[idx:n]
+        else:
+            idx = n
+
+        self._time[idx] = time
+        self._duration[idx] = duration
+        self._value[idx] = obs.value
+        self._confidence[idx] = obs.confidence
+        self._n = n + 1
+        self._invalidate()
+
+    def update(self, iterable):
+        '''Insert a collection of observations, maintaining sort order.
+
+        Parameters
+        ----------
+        iterable : iterable of Observations
+        '''
+        if isinstance(iterable, ObservationArray):
+            self._extend(iterable.time, iterable.duration,
+                         iterable.value, iterable.confidence)
+            return
+
+        records = list(iterable)
+        for obs in records:
+            if not isinstance(obs, Observation):
+                raise JamsError('{} must be of type '
+                                'jams.Observation'.format(obs))
+
+        if records:
+            self._extend(*zip(*records))
+
+    def clear(self):
+        '''Remove all observations, retaining column dtypes.'''
+        self._n = 0
+        self._invalidate()
+        for field in self._FIELDS:
+            setattr(self, field, getattr(self, field)[:0].copy())
+
+    def _invalidate(self):
+        '''Clear cached state derived from the observations'''
+        self._interval_index = None
+        self._validated = None
+
+    @classmethod
+    def _wrap(cls, time, duration, value, confidence):
+        '''Construct an array from existing columns without copying.
+
+        The columns must be one-dimensional, of equal length, and sorted
+        by `time`.  They may be read-only (e.g., memory-mapped), since
+        any growth of the array allocates new buffers.
+        '''
+        new = cls()
+        new._time = time
+        new._duration = duration
+        new._value = value
+        new._confidence = confidence
+        new._n = len(time)
+        return new
+
+    def copy(self):
+        '''Return a shallow copy of this array.'''
+        new = ObservationArray(value_dtype=self._value.dtype,
+                               confidence_dtype=self._confidence.dtype)
+        new.update(self)
+        return new
+
+    def bisect_key_left(self, key):
+        '''Index of the first observation with `time >= key`'''
+        return int(np.searchsorted(self.time, key, side='left'))
+
+    def bisect_key_right(self, key):
+        '''Index of the first observation with `time > key`'''
+        return int(np.searchsorted(self.time, key, side='right'))
+
+    def _reserve(self, size):
+        '''Grow the column buffers to hold at least `size` observations.'''
+        capacity = len(self._time)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity, 16)
+        for field in self._FIELDS:
+            old = getattr(self, field)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, field, new)
+
+    def _fit(self, field, values):
+        '''Coerce `values` to the dtype of a column, promoting the column
+        to object dtype if necessary.'''
+        column = getattr(self, field)
+
+        if column.dtype != np.object_:
+            arr = _typed_array(values, column.dtype)
+            if arr is not None:
+                return arr
+            setattr(self, field, column.astype(np.object_))
+
+        return _object_array(values)
+
+    def _extend(self, time, duration, value, confidence):
+        '''Merge columns of new observations into the array.'''
+        time = _float_array(time)
+        duration = _float_array(duration)
+
+        k = len(time)
+        if not k:
+            return
+
+        if not (len(duration) == len(value) == len(confidence) == k):
+            raise ParameterError('Observation columns must have '
+                                 'equal length')
+
+        value = self._fit('_value', value)
+        confidence = self._fit('_confidence', confidence)
+
+        n = self._n
+        columns = (time, duration, value, confidence)
+
+        if (n == 0 or time[0] >= self._time[n - 1]) and _is_sorted(time):
+            # Fast path: new observations go at the end
+            self._reserve(n + k)
+            for field, col in zip(self._FIELDS, columns):
+                getattr(self, field)[n:n + k] = col
+
+        else:
+            # General case: stable merge of old and new observations
+            order = np.argsort(np.concatenate([self._time[:n], time]),
+                               kind='mergesort')
+            for field, col in zip(self._FIELDS, columns):
+                merged = np.concatenate([getattr(self, field)[:n], col])
+                setattr(self, field, merged[order])
+
+        self._n = n + k
+        self._invalidate()
+
+
+class _ObservationList(SortedKeyList):
+    '''A `SortedKeyList` of observations which caches an
+    `_IntervalIndex` and validation status, and clears them on any
+    modification.'''
+
+    _interval_index = None
+    _validated = None
+
+    def _invalidate(self):
+        '''Clear cached state derived from the observations'''
+        self._interval_index = None
+        self._validated = None
+
+    def add(self, value):
+        self._invalidate()
+        super(_ObservationList, self).add(value)
+
+    def update(self, iterable):
+        self._invalidate()
+        super(_ObservationList, self).update(iterable)
+
+    _update = update
+
+    def clear(self):
+        self._invalidate()
+        super(_ObservationList, self).clear()
+
+    _clear = clear
+
+    def _delete(self, pos, idx):
+        self._invalidate()
+        super(_ObservationList, self)._delete(pos, idx)
+
+
+class _IntervalIndex(object):
+    '''Index of observation intervals for overlap queries.
+
+    Observations are sorted by start time.  Alongside each start time,
+    the index stores the maximum end time of all observations up to and
+    including it.  Since this running maximum is non-decreasing,
+    both ends of the range of candidate observations for a query
+    can be found by binary search.
+
+    Parameters
+    ----------
+    time, duration : np.ndarray
+        Start times (in non-decreasing order) and durations
+        of the observations
+    '''
+
+    def __init__(self, time, duration):
+        self.start = np.asarray(time, dtype=np.float64)
+        self.end = self.start + np.asarray(duration, dtype=np.float64)
+
+        # NaN end times are ignored, so that the maximum remains sorted
+        if len(self.end):
+            self.max_end = np.fmax.accumulate(self.end)
+        else:
+            self.max_end = self.end
+
+    @classmethod
+    def build(cls, data):
+        '''Get the (possibly cached) index of an observation container'''
+        index = getattr(data, '_interval_index', None)
+
+        if index is None:
+            if isinstance(data, ObservationArray):
+                index = cls(data.time, data.duration)
+            else:
+                index = cls(np.fromiter((obs.time for obs in data),
+                                        dtype=np.float64, count=len(data)),
+                            np.fromiter((obs.duration for obs in data),
+                                        dtype=np.float64, count=len(data)))
+
+            # Only containers which invalidate the cache may hold it
+            if isinstance(data, (ObservationArray, _ObservationList)):
+                data._interval_index = index
+
+        return index
+
+    def query(self, start_time, end_time):
+        '''Find observations overlapping `[start_time, end_time)`.
+
+        An observation `[time, time + duration]` overlaps if it starts
+        before `end_time`, and either ends after `start_time` or has
+        zero duration and starts at or after `start_time`.
+
+        Returns
+        -------
+        indices : np.ndarray
+            Positions of the overlapping observations, in sorted order
+        '''
+        hi = int(np.searchsorted(self.start, end_time, side='left'))
+        lo = int(np.searchsorted(self.max_end[:hi], start_time, side='left'))
+
+        start = self.start[lo:hi]
+        end = self.end[lo:hi]
+
+        overlap = (end > start_time) | ((start == end) & (start >= start_time))
+
+        return lo + np.flatnonzero(overlap)
+
+
+def _as_native(item):
+    '''Convert numpy scalars to their native python equivalents'''
+    if isinstance(item, np.generic):
+        return item.item()
+    return item
+
+
+def _is_scalar_kind(value, kind):
+    '''Test if a scalar can be stored exactly in a column of a given
+    numpy dtype kind'''
+    # Booleans are integers to python, but not to the schema
+    if isinstance(value, _BOOLEAN_TYPES):
+        return kind == 'b'
+    elif kind == 'f':
+        return isinstance(value, _REAL_TYPES)
+    elif kind in 'iu':
+        return isinstance(value, _INTEGER_TYPES)
+    return False
+
+
+_BOOLEAN_TYPES = (bool, np.bool_)
+_INTEGER_TYPES = six.integer_types + (np.integer,)
+_REAL_TYPES = _INTEGER_TYPES + (float, np.floating)
+
+
+def _is_sorted(times):
+    '''Test if an array is in non-decreasing order'''
+    return bool(np.all(times[1:] >= times[:-1]))
+
+
+def _float_array(values):
+    '''Convert a sequence to a float64 array, with the same error behavior
+    as `float()` for non-numeric entries.'''
+    arr = np.asarray(values)
+    if arr.dtype.kind not in 'biuf':
+        arr = np.asarray([float(x) for x in values], dtype=np.float64)
+    return arr.astype(np.float64, copy=False).reshape(-1)
+
+
+def _as_list(values):
+    '''Convert a column to a list, unpacking 1-d numpy arrays to
+    native python types'''
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values.tolist()
+    return list(values)
+
+
+def _column_view(values):
+    '''View an observation column as an array if numeric,
+    or a list otherwise'''
+    if values.dtype == np.object_:
+        return values.tolist()
+    return values
+
+
+def _nullable_floats(values):
+    '''Convert a column to a float array, mapping `None` to `NaN`'''
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        return values.astype(np.float64)
+
+    return np.array([np.nan if v is None else v for v in values],
+                    dtype=np.float64)
+
+
+def _as_windows(windows):
+    '''Convert a collection of time ranges to a list of
+    `(start_time, end_time)` pairs'''
+    windows = np.asarray(windows)
+
+    if windows.size == 0:
+        return []
+
+    if windows.ndim != 2 or windows.shape[1] != 2:
+        raise ParameterError('windows must be a sequence of '
+                             '(start_time, end_time) pairs')
+
+    return [tuple(window) for window in windows.tolist()]
+
+
+def _log_operation(sandbox, key, record):
+    '''Copy a sandbox, appending a record to the operation log at `key`.
+
+    The log of the original sandbox is not modified.
+    '''
+    log = list(sandbox[key]) if key in sandbox else []
+    log.append(record)
+
+    sandbox = Sandbox(**sandbox)
+    sandbox.update(**{key: log})
+    return sandbox
+
+
+def _object_array(values):
+    '''Pack a sequence into a 1-d object array without numpy
+    broadcasting nested sequences into extra dimensions.'''
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values.astype(np.object_)
+
+    arr = np.empty(len(values), dtype=np.object_)
+    for i, val in enumerate(values):
+        arr[i] = val
+    return arr
+
+
+def _typed_array(values, dtype):
+    '''Convert a sequence to an array of the given numeric dtype, or
+    return `None` if the conversion would not be exact.'''
+    try:
+        arr = np.asarray(values)
+    except ValueError:
+        return None
+
+    if arr.ndim != 1:
+        return None
+
+    kind = np.dtype(dtype).kind
+
+    # numpy silently casts booleans mixed with numbers
+    if (kind != 'b' and arr.dtype.kind != 'b' and
+            not isinstance(values, np.ndarray) and
+            any(isinstance(v, _BOOLEAN_TYPES) for v in values)):
+        return None
+
+    if kind == 'f' and arr.dtype.kind in 'iuf':
+        return arr.astype(dtype, copy=False)
+    elif kind in 'iu' and arr.dtype.kind in 'iu':
+        return arr.astype(dtype, copy=False)
+    elif kind == 'b' and arr.dtype.kind == 'b':
+        return arr.astype(dtype, copy=False)
+
+    return None
+
+
+class _PendingData(object):
+    '''Placeholder for the observation data of a lazy `Annotation`'''
+
+    __slots__ = ['data', 'columnar', 'validate', 'strict']
+
+    def __init__(self, data, columnar):
+        self.data = data
+        self.columnar = columnar
+        self.validate = False
+        self.strict = True
+
+
+class Sandbox(JObject):
+    """Sandbox (unconstrained)
+
+    Functionally identical to JObjects, but the class hierarchy might be
+    confusing if all objects inherit from Sandboxes."""
+    pass
+
+
+class Annotation(JObject):
+    """Annotation base class."""
+
+    def __init__(self, namespace, data=None, annotation_metadata=None,
+                 sandbox=None, time=0, duration=None, columnar=None,
+                 lazy=False):
+        """Create an Annotation.
+
+        Note that, if an argument is None, an empty Annotation is created in
+        its place. Additionally, a dictionary matching the expected structure
+        of the arguments will be parsed (i.e. instantiating from JSON).
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace for this annotation
+
+        data : dict of lists, list of dicts, or list of Observations
+            Data for the new annotation
+
+        annotation_metadata : AnnotationMetadata (or dict), default=None.
+            Metadata corresponding to this Annotation.
+
+        sandbox : Sandbox (dict), default=None
+            Miscellaneous information; keep to native datatypes if possible.
+
+        time : non-negative number
+            The starting time for this annotation
+
+        duration : non-negative number
+            The duration of this annotation
+
+        columnar : bool or None
+            If `True`, observations are stored in an `ObservationArray`
+            rather than a `SortedKeyList` of `Observation` objects.
+            This substantially reduces memory consumption for annotations
+            with many observations.
+
+            If `None` (default), columnar storage is used only if `data`
+            is itself an `ObservationArray`.
+
+        lazy : bool
+            If `True`, `data` is retained as given, and only converted
+            to observations the first time that `Annotation.data` is
+            accessed.
+        """
+
+        super(Annotation, self).__init__()
+
+        if annotation_metadata is None:
             annotation_metadata = AnnotationMetadata()
 
         self.annotation_metadata = AnnotationMetadata(**annotation_metadata)
 
         self.namespace = namespace
 
-        self.data = SortedKeyList(key=self._key)
+        if columnar is None:
+            columnar = isinstance(data, ObservationArray)
 
-        if data is not None:
-            if isinstance(data, dict):
-                self.append_columns(data)
-            else:
-                self.append_records(data)
+        if lazy:
+            self.data = _PendingData(data, columnar)
+        else:
+            self._set_data(data, columnar)
 
         if sandbox is None:
             sandbox = Sandbox()
@@ -664,6 +1791,82 @@ class Annotation(JObject):
         self.time = time
         self.duration = duration
 
+    @property
+    def data(self):
+        '''The observation data of this annotation.
+
+        For lazily constructed annotations, observations are built
+        (and, if requested, validated) when this is first accessed.
+        '''
+        self._build_pending()
+        return self.__dict__['data']
+
+    def _build_pending(self):
+        '''Build the observation data of a lazy annotation, if pending'''
+        pending = self.__dict__.get('data')
+
+        if isinstance(pending, _PendingData):
+            self._set_data(pending.data, pending.columnar)
+
+            if pending.validate:
+                self.validate(strict=pending.strict)
+
+    @property
+    def _lazy(self):
+        '''`True` if the observation data has not yet been built'''
+        return isinstance(self.__dict__.get('data'), _PendingData)
+
+    def _n_observations(self):
+        '''Count the observations, without building pending data'''
+        data = self.__dict__['data']
+
+        if isinstance(data, _PendingData):
+            data = data.data
+            if data is None:
+                return 0
+            elif isinstance(data, dict):
+                return len(data['time'])
+
+        return len(data)
+
+    def _set_data(self, data, columnar):
+        '''Replace the observation data.
+
+        Parameters
+        ----------
+        data : dict of lists, list of dicts, list of Observations, or None
+            The new data
+
+        columnar : bool
+            If `True`, store observations in an `ObservationArray`
+        '''
+        self.data = self._empty_data(columnar)
+
+        if data is not None:
+            if isinstance(data, ObservationArray):
+                self.append_columns(dict(time=data.time,
+                                         duration=data.duration,
+                                         value=data.value,
+                                         confidence=data.confidence))
+            elif isinstance(data, dict):
+                self.append_columns(data)
+            else:
+                self.append_records(data)
+
+    def __getitem__(self, key):
+        if key == 'data':
+            return self.data
+        return super(Annotation, self).__getitem__(key)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+
+        # Build any pending observations before comparing attributes
+        self._build_pending()
+        other._build_pending()
+        return super(Annotation, self).__eq__(other)
+
     def _display_properties(self):
         return [('namespace', 'Namespace'),
                 ('time', 'Time'),
@@ -719,24 +1922,83 @@ class Annotation(JObject):
 
         This is primarily used for deserializing densely packed data.
 
+        The columns are cast and sorted in bulk, and then merged into
+        the observation container in a single step.
+
         Parameters
         ----------
-        columns : dict of lists
+        columns : dict of lists or np.ndarrays
             Keys must be `time, duration, value, confidence`,
             and each much be a list of equal length.
 
+        Raises
+        ------
+        ParameterError
+            If the columns are not of equal length
         '''
-        self.append_records([dict(time=t, duration=d, value=v, confidence=c)
-                             for (t, d, v, c)
-                             in six.moves.zip(columns['time'],
-                                              columns['duration'],
-                                              columns['value'],
-                                              columns['confidence'])])
+        time = _float_array(columns['time'])
+        duration = _float_array(columns['duration'])
+        value = columns['value']
+        confidence = columns['confidence']
+
+        if not len(time) == len(duration) == len(value) == len(confidence):
+            raise ParameterError('Observation columns must have '
+                                 'equal length')
+
+        if not len(time):
+            return
+
+        if self._columnar:
+            self.data._extend(time, duration, value, confidence)
+            return
+
+        value = _as_list(value)
+        confidence = _as_list(confidence)
+
+        if _is_sorted(time):
+            order = six.moves.range(len(time))
+        else:
+            order = np.argsort(time, kind='mergesort').tolist()
+
+        time = time.tolist()
+        duration = duration.tolist()
+
+        records = [Observation(time[i], duration[i], value[i], confidence[i])
+                   for i in order]
+
+        if len(records) * 4 < len(self.data):
+            # Few new records: insert them individually
+            for obs in records:
+                self.data.add(obs)
+        else:
+            # Rebuild the container in one step.
+            # Existing observations precede new ones with the same time.
+            if len(self.data):
+                records = list(self.data) + records
+                self.data.clear()
+            self.data.update(records)
+
+    def _data_columns(self):
+        '''Get the time, duration, value, and confidence columns of
+        the observation data.'''
+        if self._columnar:
+            return (self.data.time, self.data.duration,
+                    self.data.value, self.data.confidence)
+        elif not self.data:
+            return [], [], [], []
+        return tuple(zip(*self.data))
 
     def validate(self, strict=True):
         '''Validate this annotation object against the JAMS schema,
         and its data against the namespace schema.
 
+        If the observation data of a lazy annotation has not yet been
+        built, it is validated when it is first accessed.
+
+        Within a `jams.trusted` context, observations which have not been
+        modified since they last passed validation against this namespace
+        are not validated again.
+
         Parameters
         ----------
         strict : bool
@@ -760,8 +2022,9 @@ class Annotation(JObject):
         JObject.validate
         '''
 
-        # Get the schema for this annotation
-        ann_schema = schema.namespace_array(self.namespace)
+        # Get the validators for this annotation's namespace
+        ann_validator = schema.namespace_validator(self.namespace)
+        col_validator = schema.column_validator(self.namespace)
 
         valid = True
 
@@ -769,9 +2032,25 @@ class Annotation(JObject):
             schema.VALIDATOR.validate(self.__json_light__(data=False),
                                                 schema.JAMS_SCHEMA)
 
-            # validate each record in the frame
-            data_ser = [serialize_obj(obs) for obs in self.data]
-            schema.VALIDATOR.validate(data_ser, ann_schema)
+            if self._lazy:
+                # Defer validation of the data until it is built
+                pending = self.__dict__['data']
+                pending.validate, pending.strict = True, strict
+
+            # Column validation can only certify the data as valid;
+            # anything else goes through the full schema validator
+            # so that errors are reported in full.
+            elif getattr(__TRUSTED__, 'depth', 0) and self._data_validated():
+                pass
+
+            elif (col_validator is None or
+                  not col_validator.is_valid(*self._data_columns())):
+                # validate each record in the frame
+                data_ser = [serialize_obj(obs) for obs in self.data]
+                ann_validator.validate(data_ser)
+
+            if not self._lazy and hasattr(self.data, '_validated'):
+                self.data._validated = self.namespace
 
         except jsonschema.ValidationError as invalid:
             if strict:
@@ -782,6 +2061,11 @@ class Annotation(JObject):
 
         return valid
 
+    def _data_validated(self):
+        '''`True` if the observations are known to be valid
+        for the annotation's namespace'''
+        return getattr(self.data, '_validated', None) == self.namespace
+
     def trim(self, start_time, end_time, strict=False):
         '''
         Trim the annotation and return as a new `Annotation` object.
@@ -865,81 +2149,174 @@ class Annotation(JObject):
            time  duration  value confidence
         0     6         2  three       None
         '''
+        return self._excerpts([(start_time, end_time)], strict, False)[0]
+
+    def trim_many(self, windows, strict=False):
+        '''Trim the annotation to each of a collection of time ranges.
+
+        This is equivalent to, but much faster than,
+        ``[ann.trim(start, end, strict=strict) for (start, end) in windows]``.
+        The observations are scanned once, rather than once per window.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time), or np.ndarray, shape=(n, 2)
+            The time ranges (in seconds) to trim to.
+            Each ``end_time`` must be greater than its ``start_time``.
+
+        strict : bool
+            See `Annotation.trim`
+
+        Returns
+        -------
+        excerpts : list of Annotation
+            ``excerpts[i]`` is the annotation trimmed to ``windows[i]``
+
+        Raises
+        ------
+        ParameterError
+            If `windows` is not a sequence of pairs, or if any
+            ``end_time`` is not greater than its ``start_time``.
+
+        See Also
+        --------
+        Annotation.trim
+        '''
+        return self._excerpts(windows, strict, False)
+
+    def _excerpts(self, windows, strict, relative):
+        '''Trim or slice the annotation to a collection of time ranges.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time)
+            The time ranges
+
+        strict : bool
+            See `Annotation.trim`
+
+        relative : bool
+            If `True`, slice (see `Annotation.slice`) rather than trim.
+
+        Returns
+        -------
+        excerpts : list of Annotation
+        '''
+        windows = _as_windows(windows)
+
         # Check for basic start_time and end_time validity
-        if end_time <= start_time:
+        if any(end_time <= start_time for start_time, end_time in windows):
             raise ParameterError(
                 'end_time must be greater than start_time.')
 
         # If the annotation does not have a set duration value, we'll assume
         # trimming is possible (up to the user to ensure this is valid).
-        if self.duration is None:
-            orig_time = start_time
-            orig_duration = end_time - start_time
+        if self.duration is None and windows:
             warnings.warn(
                 "Annotation.duration is not defined, cannot check "
                 "for temporal intersection, assuming the annotation "
                 "is valid between start_time and end_time.")
-        else:
-            orig_time = self.time
-            orig_duration = self.duration
 
-        # Check whether there is intersection between the trim range and
-        # annotation: if not raise a warning and set trim_start and trim_end
-        # appropriately.
-        if start_time > (orig_time + orig_duration) or (end_time < orig_time):
-            warnings.warn(
-                'Time range defined by [start_time,end_time] does not '
-                'intersect with the time range spanned by this annotation, '
-                'the trimmed annotation will be empty.')
-            trim_start = self.time
-            trim_end = trim_start
-        else:
-            # Determine new range
-            trim_start = max(orig_time, start_time)
-            trim_end = min(orig_time + orig_duration, end_time)
-
-        # Create new annotation with same namespace/metadata
-        ann_trimmed = Annotation(
-            self.namespace,
-            data=None,
-            annotation_metadata=self.annotation_metadata,
-            sandbox=self.sandbox,
-            time=trim_start,
-            duration=trim_end - trim_start)
-
-        # Selectively add observations based on their start time / duration
-        # We do this rather than copying and directly manipulating the
-        # annotation' data frame (which might be faster) since this way trim is
-        # independent of the internal data representation.
-        for obs in self.data:
-
-            obs_start = obs.time
-            obs_end = obs_start + obs.duration
-
-            # Special-case here handles duration=0 as a closed interval
-            if obs_start < trim_end and (obs_end > trim_start or obs_start == obs_end >= trim_start):
-
-                new_start = max(obs_start, trim_start)
-                new_end = min(obs_end, trim_end)
-                new_duration = new_end - new_start
-
-                if ((not strict) or
-                        (new_start == obs_start and new_end == obs_end)):
-                    ann_trimmed.append(time=new_start,
-                                       duration=new_duration,
-                                       value=obs.value,
-                                       confidence=obs.confidence)
-
-        if 'trim' not in ann_trimmed.sandbox.keys():
-            ann_trimmed.sandbox.update(
-                trim=[{'start_time': start_time, 'end_time': end_time,
-                       'trim_start': trim_start, 'trim_end': trim_end}])
+        bounds = []
+        for start_time, end_time in windows:
+            if self.duration is None:
+                orig_time = start_time
+                orig_duration = end_time - start_time
+            else:
+                orig_time = self.time
+                orig_duration = self.duration
+
+            # Check whether there is intersection between the trim range and
+            # annotation: if not raise a warning and set trim_start and
+            # trim_end appropriately.
+            if (start_time > (orig_time + orig_duration) or
+                    (end_time < orig_time)):
+                warnings.warn(
+                    'Time range defined by [start_time,end_time] does not '
+                    'intersect with the time range spanned by this '
+                    'annotation, the trimmed annotation will be empty.')
+                bounds.append((self.time, self.time))
+            else:
+                # Determine new range
+                bounds.append((max(orig_time, start_time),
+                               min(orig_time + orig_duration, end_time)))
+
+        # Select the observations overlapping each trim range, and gather
+        # them into a single batch.
+        # Zero-duration observations are treated as closed intervals.
+        index = self._interval_index()
+        selection = [index.query(trim_start, trim_end)
+                     for trim_start, trim_end in bounds]
+        counts = [len(idx) for idx in selection]
+
+        # Gather each selected observation once, even if windows overlap
+        selected = np.concatenate(
+            [np.empty(0, dtype=int)] + selection).astype(int)
+        unique = np.unique(selected)
+        rows = np.searchsorted(unique, selected)
+        time, duration, value, confidence = [
+            column[rows] for column in self._take(unique)]
+
+        window = np.repeat(np.arange(len(bounds)), counts)
+        bounds_arr = np.asarray(bounds, dtype=np.float64).reshape(-1, 2)
+
+        obs_end = time + duration
+        new_start = np.maximum(time, bounds_arr[window, 0])
+        new_end = np.minimum(obs_end, bounds_arr[window, 1])
+        new_duration = new_end - new_start
+
+        if strict:
+            keep = np.flatnonzero((new_start == time) & (new_end == obs_end))
         else:
-            ann_trimmed.sandbox.trim.append(
-                {'start_time': start_time, 'end_time': end_time,
-                 'trim_start': trim_start, 'trim_end': trim_end})
+            keep = np.arange(len(time))
 
-        return ann_trimmed
+        if relative:
+            # if obs.time > start_time,
+            #   duration doesn't change
+            # if obs.time < start_time,
+            #   duration shrinks by start_time - obs.time
+            starts = np.asarray([w[0] for w in windows], dtype=np.float64)
+            new_start = np.maximum(0, new_start - starts[window])
+
+        edges = np.searchsorted(window[keep], np.arange(len(bounds) + 1))
+
+        excerpts = []
+        for i, ((start_time, end_time), (trim_start, trim_end)) in \
+                enumerate(zip(windows, bounds)):
+
+            sandbox = _log_operation(self.sandbox, 'trim',
+                                     {'start_time': start_time,
+                                      'end_time': end_time,
+                                      'trim_start': trim_start,
+                                      'trim_end': trim_end})
+
+            if relative:
+                sandbox = _log_operation(sandbox, 'slice',
+                                         {'start_time': start_time,
+                                          'end_time': end_time,
+                                          'slice_start': trim_start,
+                                          'slice_end': trim_end})
+                ann_time = max(0, trim_start - start_time)
+            else:
+                ann_time = trim_start
+
+            # Create new annotation with same namespace/metadata
+            excerpt = Annotation(self.namespace,
+                                 data=None,
+                                 annotation_metadata=self.annotation_metadata,
+                                 sandbox=sandbox,
+                                 time=ann_time,
+                                 duration=trim_end - trim_start,
+                                 columnar=self._columnar)
+
+            rows = keep[edges[i]:edges[i + 1]]
+            excerpt.append_columns(dict(time=new_start[rows],
+                                        duration=new_duration[rows],
+                                        value=value[rows],
+                                        confidence=confidence[rows]))
+            excerpts.append(excerpt)
+
+        return excerpts
 
     def slice(self, start_time, end_time, strict=False):
         '''
@@ -1014,55 +2391,168 @@ class Annotation(JObject):
            time  duration  value confidence
         0   1.0       2.0  three       None
         '''
-        # start by trimming the annotation
-        sliced_ann = self.trim(start_time, end_time, strict=strict)
-        raw_data = sliced_ann.pop_data()
+        return self._excerpts([(start_time, end_time)], strict, True)[0]
 
-        # now adjust the start time of the annotation and the observations it
-        # contains.
+    def slice_many(self, windows, strict=False):
+        '''Slice the annotation to each of a collection of time ranges.
 
-        for obs in raw_data:
-            new_time = max(0, obs.time - start_time)
-            # if obs.time > start_time,
-            #   duration doesn't change
-            # if obs.time < start_time,
-            #   duration shrinks by start_time - obs.time
-            sliced_ann.append(time=new_time,
-                              duration=obs.duration,
-                              value=obs.value,
-                              confidence=obs.confidence)
-
-        ref_time = sliced_ann.time
-        slice_start = ref_time
-        slice_end = ref_time + sliced_ann.duration
-
-        if 'slice' not in sliced_ann.sandbox.keys():
-            sliced_ann.sandbox.update(
-                slice=[{'start_time': start_time, 'end_time': end_time,
-                        'slice_start': slice_start, 'slice_end': slice_end}])
+        This is equivalent to, but much faster than,
+        ``[ann.slice(start, end, strict=strict) for (start, end) in windows]``.
+        The observations are scanned once, rather than once per window.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time), or np.ndarray, shape=(n, 2)
+            The time ranges (in seconds) to slice.
+            Each ``end_time`` must be greater than its ``start_time``.
+
+        strict : bool
+            See `Annotation.slice`
+
+        Returns
+        -------
+        excerpts : list of Annotation
+            ``excerpts[i]`` is the annotation sliced to ``windows[i]``
+
+        Raises
+        ------
+        ParameterError
+            If `windows` is not a sequence of pairs, or if any
+            ``end_time`` is not greater than its ``start_time``.
+
+        See Also
+        --------
+        Annotation.slice
+
+        Examples
+        --------
+        >>> ann = jams.Annotation(namespace='tag_open', time=0, duration=8)
+        >>> ann.append(time=1, duration=2, value='one')
+        >>> ann.append(time=4, duration=3, value='two')
+        >>> windows = [(0, 4), (2, 6), (4, 8)]
+        >>> [len(excerpt.data) for excerpt in ann.slice_many(windows)]
+        [1, 2, 1]
+        '''
+        return self._excerpts(windows, strict, True)
+
+    def query(self, start_time, end_time):
+        '''Find the observations overlapping a time range.
+
+        An observation overlaps `[start_time, end_time)` if it starts
+        before `end_time`, and either ends after `start_time`, or has
+        zero duration and starts at or after `start_time`.
+
+        Queries take `O(log n + k)` time for `n` observations and
+        `k` results, using an index which is rebuilt after the data
+        is modified.
+
+        Parameters
+        ----------
+        start_time : float
+            The start of the time range (in seconds)
+
+        end_time : float
+            The end of the time range (in seconds)
+
+        Returns
+        -------
+        observations : list of Observation
+            The overlapping observations, ordered by time
+
+        Examples
+        --------
+        >>> ann = jams.Annotation(namespace='tag_open')
+        >>> ann.append(time=0, duration=4, value='one')
+        >>> ann.append(time=2, duration=1, value='two')
+        >>> ann.append(time=5, duration=0, value='three')
+        >>> ann.query(3, 5)
+        [Observation(time=0.0, duration=4.0, value='one', confidence=None)]
+        >>> ann.query(3, 5.5)
+        [Observation(time=0.0, duration=4.0, value='one', confidence=None),
+         Observation(time=5.0, duration=0.0, value='three', confidence=None)]
+        '''
+        indices = self._interval_index().query(start_time, end_time)
+        return [self.data[i] for i in indices]
+
+    def _interval_index(self):
+        '''Get the interval index of the observations'''
+        return _IntervalIndex.build(self.data)
+
+    def _take(self, indices):
+        '''Gather columns of selected observations.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Sorted positions of observations within `self.data`
+
+        Returns
+        -------
+        time, duration : np.ndarray
+        value, confidence : np.ndarray
+            Object arrays, unless the data is columnar and numeric
+        '''
+        if isinstance(self.data, ObservationArray):
+            return (self.data.time[indices], self.data.duration[indices],
+                    self.data.value[indices], self.data.confidence[indices])
+
+        if len(indices):
+            lo = indices[0]
+            records = list(self.data.islice(lo, indices[-1] + 1))
+            records = [records[i] for i in indices - lo]
         else:
-            sliced_ann.sandbox.slice.append(
-                {'start_time': start_time, 'end_time': end_time,
-                 'slice_start': slice_start, 'slice_end': slice_end})
+            records = []
 
-        # Update the timing for the sliced annotation
-        sliced_ann.time = max(0, ref_time - start_time)
+        columns = list(zip(*records)) or [[], [], [], []]
 
-        return sliced_ann
+        return (np.array(columns[0], dtype=np.float64),
+                np.array(columns[1], dtype=np.float64),
+                _object_array(columns[2]),
+                _object_array(columns[3]))
 
     def pop_data(self):
         '''Replace this observation's data with a fresh container.
 
         Returns
         -------
-        annotation_data : SortedKeyList
+        annotation_data : SortedKeyList or ObservationArray
             The original annotation data container
         '''
 
         data = self.data
-        self.data = SortedKeyList(key=self._key)
+        self.data = self._empty_data(self._columnar)
         return data
 
+    @property
+    def _columnar(self):
+        '''`True` if observations are held in an `ObservationArray`'''
+        return isinstance(self.data, ObservationArray)
+
+    def _empty_data(self, columnar):
+        '''Construct an empty observation container.
+
+        Parameters
+        ----------
+        columnar : bool
+            If `True`, construct an `ObservationArray` with column types
+            determined by the namespace.
+            Otherwise, construct a `SortedKeyList`.
+
+        Returns
+        -------
+        data : ObservationArray or SortedKeyList
+        '''
+        if not columnar:
+            return _ObservationList(key=self._key)
+
+        try:
+            value_dtype, confidence_dtype = schema.get_dtypes(self.namespace)
+        except NamespaceError:
+            value_dtype, confidence_dtype = np.object_, np.object_
+
+        return ObservationArray(value_dtype=value_dtype,
+                                confidence_dtype=confidence_dtype)
+
     def to_interval_values(self):
         '''Extract observation data in a `mir_eval`-friendly format.
 
@@ -1073,19 +2563,19 @@ class Annotation(JObject):
 
             `intervals[i, :] = [time[i], time[i] + duration[i]]`
 
-        labels : list
+        labels : list or np.ndarray
             List view of value field.
-        '''
 
-        ints, vals = [], []
-        for obs in self.data:
-            ints.append([obs.time, obs.time + obs.duration])
-            vals.append(obs.value)
+            For columnar annotations with numeric values, this is a
+            read-only view of the value column.
+        '''
+        time, duration, value, _ = self._export_columns()
 
-        if not ints:
-            return np.empty(shape=(0, 2), dtype=float), []
+        intervals = np.empty((len(time), 2), dtype=np.float64)
+        intervals[:, 0] = time
+        np.add(time, duration, out=intervals[:, 1])
 
-        return np.array(ints), vals
+        return intervals, value
 
     def to_event_values(self):
         '''Extract observation data in a `mir_eval`-friendly format.
@@ -1095,15 +2585,52 @@ class Annotation(JObject):
         times : np.ndarray [shape=(n,), dtype=float]
             Start-time of all observations
 
-        labels : list
+            For columnar annotations, this is a read-only view
+            of the time column.
+
+        labels : list or np.ndarray
             List view of value field.
+
+            For columnar annotations with numeric values, this is a
+            read-only view of the value column.
         '''
-        ints, vals = [], []
-        for obs in self.data:
-            ints.append(obs.time)
-            vals.append(obs.value)
+        time, _, value, _ = self._export_columns()
+        return time, value
+
+    def _value_column(self):
+        '''The value column of a columnar annotation: an array view
+        for numeric values, or a list otherwise.'''
+        return _column_view(self.data.value)
 
-        return np.array(ints), vals
+    def _export_columns(self):
+        '''Get the observation data as columns for export.
+
+        Returns
+        -------
+        time, duration : np.ndarray
+            Float arrays of start times and durations.
+            For columnar annotations, these are read-only views.
+
+        value, confidence : list or np.ndarray
+            Read-only array views for numeric columns of columnar
+            annotations, and lists otherwise.
+        '''
+        if self._columnar:
+            return (self.data.time, self.data.duration,
+                    _column_view(self.data.value),
+                    _column_view(self.data.confidence))
+
+        # Fill preallocated columns in a single pass over the observations
+        n = len(self.data)
+        time = np.empty(n, dtype=np.float64)
+        duration = np.empty(n, dtype=np.float64)
+        value = [None] * n
+        confidence = [None] * n
+
+        for i, obs in enumerate(self.data):
+            time[i], duration[i], value[i], confidence[i] = obs
+
+        return time, duration, value, confidence
 
     def to_dataframe(self):
         '''Convert this annotation to a pandas dataframe.
@@ -1115,11 +2642,41 @@ class Annotation(JObject):
             Each row is an observation, and rows are sorted by
             ascending `time`.
         '''
-        return pd.DataFrame.from_records(list(self.data),
-                                         columns=['time', 'duration',
-                                                  'value', 'confidence'])
+        return pd.DataFrame(dict(zip(Observation._fields,
+                                     self._export_columns())),
+                            columns=list(Observation._fields))
+
+    def to_arrow(self):
+        '''Convert this annotation to an Arrow table.
+
+        Numeric columns are passed to Arrow without conversion to
+        Python objects.  Null values and confidences are stored as
+        Arrow nulls.
 
-    def to_samples(self, times, confidence=False):
+        This requires `pyarrow` to be installed.
+
+        Returns
+        -------
+        table : pyarrow.Table
+            Columns are `time, duration, value, confidence`.
+            Each row is an observation, and rows are sorted by
+            ascending `time`.
+
+        Examples
+        --------
+        >>> table = ann.to_arrow()
+        >>> table.column_names
+        ['time', 'duration', 'value', 'confidence']
+        >>> # Convert to pandas via arrow
+        >>> df = table.to_pandas()
+        '''
+        import pyarrow
+
+        return pyarrow.Table.from_arrays(
+            [pyarrow.array(column) for column in self._export_columns()],
+            names=list(Observation._fields))
+
+    def to_samples(self, times, confidence=False, dense=False):
         '''Sample the annotation at specified times.
 
         Parameters
@@ -1131,36 +2688,185 @@ class Annotation(JObject):
             If `True`, return both values and confidences.
             If `False` (default) only return values.
 
+        dense : bool
+            If `True`, return a 2-dimensional array rather than lists.
+            This is supported for enumerated namespaces
+            (see `jams.schema.values`), namespaces with numeric values
+            (see `jams.schema.get_dtypes`), and `pitch_contour`.
+
+            For enumerated namespaces, ``values[i, j]`` is `True` if an
+            observation with value ``jams.schema.values(namespace)[j]``
+            covers ``times[i]``.
+
+            For numeric namespaces, ``values[i]`` contains the values of
+            observations covering ``times[i]`` (in order of observation),
+            padded with `NaN`.
+
+            For `pitch_contour`, ``values[i, j]`` is the frequency of the
+            ``j``th contour (in ascending order of ``value['index']``)
+            at ``times[i]``, or `NaN` if the contour is unvoiced or absent.
+
         Returns
         -------
-        values : list
+        values : list or np.ndarray
             `values[i]` is a list of observation values for intervals
             that cover `times[i]`.
 
-        confidence : list (optional)
-            `confidence` values corresponding to `values`
+            If `dense=True`, an array of shape ``(len(times), n)``,
+            as described above.
+
+        confidence : list or np.ndarray (optional)
+            `confidence` values corresponding to `values`.
+
+            If `dense=True`, a float array of the same shape as `values`,
+            with `NaN` for missing or null confidences.
+
+        Raises
+        ------
+        ParameterError
+            If `times` is not 1-dimensional and non-negative,
+            or if `dense=True` and the namespace has neither
+            enumerated nor numeric values, and is not `pitch_contour`.
+
+        Examples
+        --------
+        >>> ann = jams.Annotation(namespace='tag_gtzan')
+        >>> ann.append(time=0, duration=2, value='blues')
+        >>> ann.append(time=1, duration=2, value='jazz')
+        >>> ann.to_samples([0.5, 1.5, 2.5])
+        [['blues'], ['blues', 'jazz'], ['jazz']]
+        >>> ann.to_samples([0.5, 1.5, 2.5], dense=True).astype(int)
+        array([[1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+               [1, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+               [0, 0, 0, 0, 0, 1, 0, 0, 0, 0]])
         '''
         times = np.asarray(times)
         if times.ndim != 1 or np.any(times < 0):
             raise ParameterError('times must be 1-dimensional and non-negative')
 
+        if dense:
+            if self.namespace == 'pitch_contour':
+                contours = np.unique([v['index']
+                                      for v in self._export_columns()[2]])
+            else:
+                contours = None
+                labels = self._dense_labels()
+
         idx = np.argsort(times)
         samples = times[idx]
 
-        values = [list() for _ in samples]
-        confidences = [list() for _ in samples]
+        # Only observations spanning the sample range need be considered
+        if len(samples):
+            indices = self._interval_index().query(
+                np.nextafter(samples[0], -np.inf),
+                np.nextafter(samples[-1], np.inf))
+        else:
+            indices = np.empty(0, dtype=int)
+
+        time, duration, value, conf = self._take(indices)
+
+        start = np.searchsorted(samples, time)
+        end = np.searchsorted(samples, time + duration, side='right')
+        counts = np.maximum(end - start, 0)
+
+        # Enumerate all (sample, observation) pairs, ordered by sample,
+        # and by observation within each sample
+        obs_index = np.repeat(np.arange(len(time)), counts)
+        offsets = np.repeat(start - np.cumsum(counts) + counts, counts)
+        sample_index = np.arange(len(obs_index)) + offsets
+
+        order = np.argsort(sample_index, kind='mergesort')
+        obs_index = obs_index[order]
+        sample_index = sample_index[order]
+        bounds = np.searchsorted(sample_index, np.arange(len(samples) + 1))
+
+        if dense:
+            # Rows of the output, in the order of `times`
+            rows = idx[sample_index]
+
+            if contours is not None:
+                # Look up the contour of each observation
+                obs_cols = np.searchsorted(contours,
+                                           [v['index'] for v in value])
+                cols = obs_cols[obs_index]
+                n_cols = len(contours)
+
+            elif labels is None:
+                # Pad each row to the largest number of observations
+                cols = np.arange(len(obs_index)) - bounds[sample_index]
+                n_cols = int(cols.max()) + 1 if len(cols) else 0
+            else:
+                # Look up the label index of each observation
+                lookup = dict((label, j) for j, label in enumerate(labels))
+                obs_cols = np.fromiter((lookup.get(v, -1) for v in value),
+                                       dtype=int, count=len(value))
+                cols = obs_cols[obs_index]
+                n_cols = len(labels)
+
+                # Values outside the vocabulary are ignored
+                rows, cols, obs_index = (rows[cols >= 0], cols[cols >= 0],
+                                         obs_index[cols >= 0])
+
+            outputs = []
+            if contours is not None:
+                freqs = np.array([v['frequency'] if v['voiced'] else np.nan
+                                  for v in value], dtype=np.float64)
+                output = np.full((len(times), n_cols), np.nan)
+                output[rows, cols] = freqs[obs_index]
+            elif labels is None:
+                output = np.full((len(times), n_cols), np.nan)
+                output[rows, cols] = _nullable_floats(value)[obs_index]
+            else:
+                output = np.zeros((len(times), n_cols), dtype=bool)
+                output[rows, cols] = True
+            outputs.append(output)
+
+            if confidence:
+                output = np.full((len(times), n_cols), np.nan)
+                output[rows, cols] = _nullable_floats(conf)[obs_index]
+                outputs.append(output)
 
-        for obs in self.data:
-            start = np.searchsorted(samples, obs.time)
-            end = np.searchsorted(samples, obs.time + obs.duration, side='right')
-            for i in range(start, end):
-                values[idx[i]].append(obs.value)
-                confidences[idx[i]].append(obs.confidence)
+        else:
+            fields = [value]
+            if confidence:
+                fields.append(conf)
+
+            outputs = []
+            for column in fields:
+                column = column[obs_index].tolist()
+                output = [None] * len(samples)
+                for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+                    output[idx[i]] = column[lo:hi]
+                outputs.append(output)
 
         if confidence:
-            return values, confidences
-        else:
-            return values
+            return tuple(outputs)
+        return outputs[0]
+
+    def _dense_labels(self):
+        '''Get the vocabulary of dense sampled output.
+
+        Returns
+        -------
+        labels : list or None
+            The enumerated values of the namespace,
+            or `None` if the values are numeric.
+
+        Raises
+        ------
+        ParameterError
+            If the values are neither enumerated nor numeric
+        '''
+        try:
+            return schema.values(self.namespace)
+        except NamespaceError:
+            pass
+
+        if np.dtype(schema.get_dtypes(self.namespace)[0]).kind not in 'biuf':
+            raise ParameterError('Dense sampling is not supported for '
+                                 'namespace={}'.format(self.namespace))
+
+        return None
 
     def __iter__(self):
         return iter(self.data)
@@ -1262,9 +2968,21 @@ class Annotation(JObject):
     def __json__(self):
         return self.__json_light__(data=True)
 
-    def __json_light__(self, data=True):
+    def __json_encode__(self, native_numpy=False):
+        return self.__json_light__(data=True, native_numpy=native_numpy)
+
+    def __json_light__(self, data=True, native_numpy=False):
         r"""Return the JObject as a set of native data types for serialization.
 
+        Parameters
+        ----------
+        data : bool
+            If `False`, the observation data is replaced by an empty list.
+
+        native_numpy : bool
+            If `True`, numeric columns of dense, columnar annotations
+            are left as numpy arrays.
+
         Note: attributes beginning with underscores are suppressed.
         """
         filtered_dict = dict()
@@ -1274,7 +2992,7 @@ class Annotation(JObject):
                 continue
             elif k == 'data':
                 if data:
-                    filtered_dict[k] = self.__json_data__
+                    filtered_dict[k] = self._json_data(native_numpy=native_numpy)
                 else:
                     filtered_dict[k] = []
 
@@ -1288,7 +3006,31 @@ class Annotation(JObject):
     @property
     def __json_data__(self):
         r"""JSON-serialize the observation sequence."""
-        if schema.is_dense(self.namespace):
+        return self._json_data()
+
+    def _json_data(self, native_numpy=False):
+        r"""JSON-serialize the observation sequence.
+
+        Parameters
+        ----------
+        native_numpy : bool
+            If `True`, numeric columns of dense, columnar annotations
+            are returned as numpy arrays rather than lists.
+        """
+        if schema.is_dense(self.namespace) and self._columnar:
+            dense_records = dict()
+            for field in Observation._fields:
+                column = getattr(self.data, field)
+                if column.dtype == np.object_:
+                    dense_records[field] = [serialize_obj(_) for _ in column]
+                elif native_numpy:
+                    dense_records[field] = column
+                else:
+                    dense_records[field] = column.tolist()
+
+            return dense_records
+
+        elif schema.is_dense(self.namespace):
             dense_records = dict()
             for field in Observation._fields:
                 dense_records[field] = []
@@ -1502,6 +3244,9 @@ class AnnotationArray(list):
 
         self.extend([Annotation(**obj) for obj in annotations])
 
+    # The search index (see `_SearchIndex`), built on demand
+    _index = None
+
     def search(self, **kwargs):
         '''Filter the annotation array down to only those Annotation
         objects matching the query.
@@ -1522,14 +3267,131 @@ class AnnotationArray(list):
         JObject.search
         '''
 
+        query = _Query.compile(kwargs)
+
         results = AnnotationArray()
 
-        for annotation in self:
-            if annotation.search(**kwargs):
-                results.append(annotation)
+        positions = self._search_index().find(query)
+
+        if positions is None:
+            for annotation in self:
+                if query.match(annotation):
+                    results.append(annotation)
+        else:
+            for i in positions:
+                results.append(list.__getitem__(self, i))
 
         return results
 
+    def __getstate__(self):
+        # The search index is not kept by copies
+        state = self.__dict__.copy()
+        state.pop('_index', None)
+        return state
+
+    def _search_index(self):
+        '''Get the search index, rebuilding it if it is out of date'''
+        if self._index is None or self._index.size != len(self):
+            self._index = _SearchIndex(self)
+        return self._index
+
+    def _invalidate(self):
+        '''Discard the search index'''
+        self._index = None
+
+    def append(self, annotation):
+        super(AnnotationArray, self).append(annotation)
+        self.__added(len(self) - 1, [annotation])
+
+    def extend(self, annotations):
+        for annotation in annotations:
+            self.append(annotation)
+
+    def __iadd__(self, annotations):
+        self.extend(annotations)
+        return self
+
+    def insert(self, idx, annotation):
+        position = min(max(self.__position(idx), 0), len(self))
+        super(AnnotationArray, self).insert(position, annotation)
+        self.__added(position, [annotation])
+
+    def __setitem__(self, idx, value):
+        if not isinstance(idx, slice):
+            position = self.__position(idx)
+            super(AnnotationArray, self).__setitem__(idx, value)
+            self.__removed([position])
+            self.__added(position, [value])
+            return
+
+        value = list(value)
+        start, stop, step = idx.indices(len(self))
+        super(AnnotationArray, self).__setitem__(idx, value)
+
+        if step == 1:
+            self.__removed(range(start, max(start, stop)))
+            self.__added(start, value)
+        else:
+            for position, annotation in zip(range(start, stop, step), value):
+                self.__removed([position])
+                self.__added(position, [annotation])
+
+    def __delitem__(self, idx):
+        if isinstance(idx, slice):
+            positions = range(*idx.indices(len(self)))
+        else:
+            positions = [self.__position(idx)]
+
+        super(AnnotationArray, self).__delitem__(idx)
+        self.__removed(positions)
+
+    def pop(self, idx=-1):
+        position = self.__position(idx)
+        annotation = super(AnnotationArray, self).pop(idx)
+        self.__removed([position])
+        return annotation
+
+    def remove(self, annotation):
+        del self[self.index(annotation)]
+
+    def __position(self, idx):
+        '''Resolve an index into a non-negative position'''
+        idx = operator.index(idx)
+        return idx + len(self) if idx < 0 else idx
+
+    def __added(self, position, annotations):
+        '''Add annotations inserted at `position` to the index'''
+        if self._index is not None:
+            self._index.insert(position, annotations, self)
+
+    def __removed(self, positions):
+        '''Drop the annotations formerly at `positions` from the index'''
+        if self._index is not None:
+            self._index.remove(positions)
+
+    def __mutator(method):
+        '''Wrap a list method to invalidate the search index'''
+        def __wrapped(self, *args, **kwargs):
+            self._invalidate()
+            return method(self, *args, **kwargs)
+
+        __wrapped.__name__ = method.__name__
+        __wrapped.__doc__ = method.__doc__
+        return __wrapped
+
+    reverse = __mutator(list.reverse)
+    sort = __mutator(list.sort)
+    __imul__ = __mutator(list.__imul__)
+
+    if hasattr(list, 'clear'):
+        clear = __mutator(list.clear)
+
+    if six.PY2:  # pragma: no cover
+        __setslice__ = __mutator(list.__setslice__)
+        __delslice__ = __mutator(list.__delslice__)
+
+    del __mutator
+
     def __getitem__(self, idx):
         '''Overloaded getitem for syntactic search sugar'''
 
@@ -1544,7 +3406,11 @@ class AnnotationArray(list):
 
     @property
     def __json__(self):
-        return [item.__json__ for item in self]
+        return self.__json_encode__()
+
+    def __json_encode__(self, native_numpy=False):
+        return [item.__json_encode__(native_numpy=native_numpy)
+                for item in self]
 
     def trim(self, start_time, end_time, strict=False):
         '''
@@ -1616,6 +3482,63 @@ class AnnotationArray(list):
 
         return sliced_array
 
+    def trim_many(self, windows, strict=False):
+        '''
+        Trim every annotation contained in the annotation array to each of
+        a collection of time ranges using `Annotation.trim_many`.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time), or np.ndarray, shape=(n, 2)
+            The time ranges (in seconds) to trim to.
+
+        strict : bool
+            See `Annotation.trim`
+
+        Returns
+        -------
+        trimmed_arrays : list of AnnotationArray
+            ``trimmed_arrays[i]`` contains the annotations trimmed to
+            ``windows[i]``.
+        '''
+        return self._excerpts(windows, strict, False)
+
+    def slice_many(self, windows, strict=False):
+        '''
+        Slice every annotation contained in the annotation array to each of
+        a collection of time ranges using `Annotation.slice_many`.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time), or np.ndarray, shape=(n, 2)
+            The time ranges (in seconds) to slice.
+
+        strict : bool
+            See `Annotation.slice`
+
+        Returns
+        -------
+        sliced_arrays : list of AnnotationArray
+            ``sliced_arrays[i]`` contains the annotations sliced to
+            ``windows[i]``.
+        '''
+        return self._excerpts(windows, strict, True)
+
+    def _excerpts(self, windows, strict, relative):
+        '''Trim or slice every annotation to a collection of time ranges.
+
+        See `Annotation._excerpts`.
+        '''
+        windows = _as_windows(windows)
+
+        arrays = [AnnotationArray() for _ in windows]
+        for ann in self:
+            for array, excerpt in zip(arrays,
+                                      ann._excerpts(windows, strict, relative)):
+                array.append(excerpt)
+
+        return arrays
+
     def __repr__(self):
         n = len(self)
 
@@ -1741,7 +3664,7 @@ class JAMS(JObject):
 
         return self.annotations.search(**kwargs)
 
-    def save(self, path_or_file, strict=True, fmt='auto'):
+    def save(self, path_or_file, strict=True, fmt='auto', backend=None):
         """Serialize annotation as a JSON formatted stream to file.
 
         Parameters
@@ -1754,7 +3677,7 @@ class JAMS(JObject):
         strict : bool
             Force strict schema validation
 
-        fmt : str ['auto', 'jams', 'jamz']
+        fmt : str ['auto', 'jams', 'jamz', 'jamb']
             The output encoding format.
 
             If `auto`, it is inferred from the file name.
@@ -1762,6 +3685,16 @@ class JAMS(JObject):
             If the input is an open file handle, `jams` encoding
             is used.
 
+            `jamb` files must be opened in binary mode.
+            See `jams.binary` for details.
+
+        backend : str or None
+            The JSON backend to use.
+            If `None`, the default backend is used.
+            This has no effect for `jamb` output.
+
+            See `jams.codec.get_backend` for details.
+
 
         Raises
         ------
@@ -1772,12 +3705,20 @@ class JAMS(JObject):
         See also
         --------
         validate
+        jams.codec.set_backend
         """
 
         self.validate(strict=strict)
 
+        fmt = _get_format(path_or_file, fmt)
+
         with _open(path_or_file, mode='w', fmt=fmt) as fdesc:
-            json.dump(self.__json__, fdesc, indent=2)
+            if fmt == 'jamb':
+                binary.dump(*_jamb_encode(self), fdesc=fdesc)
+            else:
+                encoder = codec.get_backend(backend)
+                encoder.dump(self.__json_encode__(native_numpy=encoder.native_numpy),
+                             fdesc, indent=2)
 
     def validate(self, strict=True):
         '''Validate a JAMS object against the schema.
@@ -1870,38 +3811,7 @@ class JAMS(JObject):
             object.
 
         '''
-        # Make sure duration is set in file metadata
-        if self.file_metadata.duration is None:
-            raise JamsError(
-                'Duration must be set (jam.file_metadata.duration) before '
-                'trimming can be performed.')
-
-        # Make sure start and end times are within the file start/end times
-        if not (0 <= start_time <= end_time <= float(
-                self.file_metadata.duration)):
-            raise ParameterError(
-                'start_time and end_time must be within the original file '
-                'duration ({:f}) and end_time cannot be smaller than '
-                'start_time.'.format(float(self.file_metadata.duration)))
-
-        # Create a new jams
-        jam_trimmed = JAMS(annotations=None,
-                           file_metadata=self.file_metadata,
-                           sandbox=self.sandbox)
-
-        # trim annotations
-        jam_trimmed.annotations = self.annotations.trim(
-            start_time, end_time, strict=strict)
-
-        # Document jam-level trim in top level sandbox
-        if 'trim' not in jam_trimmed.sandbox.keys():
-            jam_trimmed.sandbox.update(
-                trim=[{'start_time': start_time, 'end_time': end_time}])
-        else:
-            jam_trimmed.sandbox.trim.append(
-                {'start_time': start_time, 'end_time': end_time})
-
-        return jam_trimmed
+        return self._excerpts([(start_time, end_time)], strict, False)[0]
 
     def slice(self, start_time, end_time, strict=False):
         '''
@@ -1946,43 +3856,149 @@ class JAMS(JObject):
             JAMS object.
 
         '''
+        return self._excerpts([(start_time, end_time)], strict, True)[0]
+
+    def trim_many(self, windows, strict=False):
+        '''
+        Trim all the annotations inside the jam to each of a collection
+        of time ranges, and return a new `JAMS` object for each.
+
+        This is equivalent to, but much faster than,
+        ``[jam.trim(start, end, strict=strict) for (start, end) in windows]``.
+        The observations of each annotation are scanned once, rather than
+        once per window.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time), or np.ndarray, shape=(n, 2)
+            The time ranges (in seconds) to trim to.
+
+        strict : bool
+            See `JAMS.trim`
+
+        Returns
+        -------
+        jams_trimmed : list of JAMS
+            ``jams_trimmed[i]`` is the jam trimmed to ``windows[i]``
+
+        Raises
+        ------
+        JamsError
+            If the duration of the jam is not set
+
+        ParameterError
+            If any time range does not lie within the duration of the jam
+
+        See Also
+        --------
+        JAMS.trim
+        '''
+        return self._excerpts(windows, strict, False)
+
+    def slice_many(self, windows, strict=False):
+        '''
+        Slice all the annotations inside the jam to each of a collection
+        of time ranges, and return a new `JAMS` object for each.
+
+        This is equivalent to, but much faster than,
+        ``[jam.slice(start, end, strict=strict) for (start, end) in windows]``.
+        The observations of each annotation are scanned once, rather than
+        once per window.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time), or np.ndarray, shape=(n, 2)
+            The time ranges (in seconds) to slice.
+
+        strict : bool
+            See `JAMS.slice`
+
+        Returns
+        -------
+        jams_sliced : list of JAMS
+            ``jams_sliced[i]`` is the jam sliced to ``windows[i]``
+
+        Raises
+        ------
+        JamsError
+            If the duration of the jam is not set
+
+        ParameterError
+            If any time range does not lie within the duration of the jam
+
+        See Also
+        --------
+        JAMS.slice
+
+        Examples
+        --------
+        >>> jam = jams.load('example.jams')
+        >>> duration = jam.file_metadata.duration
+        >>> # Split the jam into 10-second excerpts
+        >>> starts = np.arange(0, duration - 10, 10)
+        >>> excerpts = jam.slice_many(np.column_stack([starts, starts + 10]))
+        '''
+        return self._excerpts(windows, strict, True)
+
+    def _excerpts(self, windows, strict, relative):
+        '''Trim or slice the jam to a collection of time ranges.
+
+        Parameters
+        ----------
+        windows : iterable of (start_time, end_time)
+            The time ranges
+
+        strict : bool
+            See `JAMS.trim`
+
+        relative : bool
+            If `True`, slice (see `JAMS.slice`) rather than trim.
+
+        Returns
+        -------
+        excerpts : list of JAMS
+        '''
+        operation = 'slice' if relative else 'trim'
+
         # Make sure duration is set in file metadata
         if self.file_metadata.duration is None:
             raise JamsError(
                 'Duration must be set (jam.file_metadata.duration) before '
-                'slicing can be performed.')
+                '{} can be performed.'.format('slicing' if relative
+                                              else 'trimming'))
 
-        # Make sure start and end times are within the file start/end times
-        if (start_time < 0 or
-                start_time > float(self.file_metadata.duration) or
-                end_time < start_time or
-                end_time > float(self.file_metadata.duration)):
-            raise ParameterError(
-                'start_time and end_time must be within the original file '
-                'duration ({:f}) and end_time cannot be smaller than '
-                'start_time.'.format(float(self.file_metadata.duration)))
+        windows = _as_windows(windows)
 
-        # Create a new jams
-        jam_sliced = JAMS(annotations=None,
-                          file_metadata=self.file_metadata,
-                          sandbox=self.sandbox)
+        # Make sure start and end times are within the file start/end times
+        duration = float(self.file_metadata.duration)
+        for start_time, end_time in windows:
+            if not (0 <= start_time <= end_time <= duration):
+                raise ParameterError(
+                    'start_time and end_time must be within the original file '
+                    'duration ({:f}) and end_time cannot be smaller than '
+                    'start_time.'.format(duration))
 
         # trim annotations
-        jam_sliced.annotations = self.annotations.slice(
-            start_time, end_time, strict=strict)
+        arrays = self.annotations._excerpts(windows, strict, relative)
+
+        excerpts = []
+        for (start_time, end_time), annotations in zip(windows, arrays):
+            # Create a new jams, documenting the jam-level operation
+            # in the top level sandbox
+            excerpt = JAMS(annotations=annotations,
+                           file_metadata=self.file_metadata,
+                           sandbox=_log_operation(
+                               self.sandbox, operation,
+                               {'start_time': start_time,
+                                'end_time': end_time}))
 
-        # adjust dutation
-        jam_sliced.file_metadata.duration = end_time - start_time
+            # adjust duration
+            if relative:
+                excerpt.file_metadata.duration = end_time - start_time
 
-        # Document jam-level trim in top level sandbox
-        if 'slice' not in jam_sliced.sandbox.keys():
-            jam_sliced.sandbox.update(
-                slice=[{'start_time': start_time, 'end_time': end_time}])
-        else:
-            jam_sliced.sandbox.slice.append(
-                {'start_time': start_time, 'end_time': end_time})
+            excerpts.append(excerpt)
 
-        return jam_sliced
+        return excerpts
 
     @property
     def __json_light__(self):
@@ -2079,6 +4095,274 @@ def match_query(string, query):
         return query == string
 
 
+class _Query(object):
+    '''A compiled search query.
+
+    See `JObject.search` for the query syntax.
+
+    Each query value is compiled to a matching function once, and each
+    search key is split into its dotted path once.  The query obtained by
+    popping a class name off the front of these paths is cached, so that
+    searching a hierarchy of objects does not re-parse the query at every
+    level.
+
+    Only the attributes stored on an object are tested against the query:
+    methods and properties are not evaluated.
+
+    Parameters
+    ----------
+    terms : tuple of (path, match)
+        `path` is a tuple of field names, and `match` is a function
+        which tests a field value.
+    '''
+
+    # Most recently compiled queries, keyed by their (hashable) arguments
+    __CACHE__ = dict()
+    __CACHE_SIZE__ = 256
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.fields = [(path[0], match) for path, match in terms
+                       if len(path) == 1]
+        self.__popped = dict()
+
+    @classmethod
+    def compile(cls, kwargs):
+        '''Compile (or retrieve) the query for a set of search arguments'''
+        key = tuple(sorted(six.iteritems(kwargs), key=lambda item: item[0]))
+
+        try:
+            return cls.__CACHE__[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable query values cannot be cached
+            key = None
+
+        query = cls(tuple((tuple(k.split('.')), _compile_match(value))
+                          for k, value in key or six.iteritems(kwargs)))
+
+        if key is not None:
+            if len(cls.__CACHE__) >= cls.__CACHE_SIZE__:
+                cls.__CACHE__.clear()
+            cls.__CACHE__[key] = query
+
+        return query
+
+    def pop(self, prefix):
+        '''Get the query for objects named `prefix`.
+
+        The prefix is popped from the front of each path (see `query_pop`),
+        and empty paths are discarded.
+        '''
+        try:
+            return self.__popped[prefix]
+        except KeyError:
+            pass
+
+        terms = []
+        for path, match in self.terms:
+            if path[0] == prefix:
+                path = path[1:]
+            if path:
+                terms.append((path, match))
+
+        query = self.__popped[prefix] = _Query(tuple(terms))
+        return query
+
+    def match(self, obj):
+        '''Test if an object (or any of its descendants) matches'''
+        query = self.pop(obj.__class__.__name__)
+
+        if not query.terms:
+            return False
+
+        fields = obj.__dict__
+        for key, match in query.fields:
+            if key in fields and match(getattr(obj, key)):
+                return True
+
+        for value in six.itervalues(fields):
+            if isinstance(value, JObject) and query.match(value):
+                return True
+
+        return False
+
+
+class _SearchIndex(object):
+    '''Index of the searchable fields of a collection of annotations.
+
+    For each field name in `FIELDS`, the index maps each distinct value of
+    that field, wherever it occurs within an annotation (e.g., the
+    `namespace` of the annotation itself, or the `name` of its
+    `annotation_metadata.annotator`), to the positions of the annotations
+    containing it.
+
+    Queries over these fields (see `JObject.search`) are evaluated once
+    per distinct value, rather than once per annotation.
+
+    The index is kept up to date by its `AnnotationArray` as annotations
+    are added or removed (see `insert` and `remove`).  Since annotations
+    may be modified in place, assigning an indexed field (or a
+    `JObject`-valued attribute) of an annotation, or of any object within
+    it, discards the indices of the arrays containing it (see
+    `JObject._touch`).  To this end, each indexed object is registered
+    with its container (see `JObject._attach`).
+
+    Parameters
+    ----------
+    annotations : iterable of Annotation
+        The annotations to index
+    '''
+
+    FIELDS = frozenset(['namespace', 'name', 'corpus', 'version',
+                        'data_source'])
+
+    def __init__(self, annotations):
+        self.size = 0
+
+        # field -> {value: [positions]}
+        self.values = dict((field, dict()) for field in self.FIELDS)
+
+        # field -> [(position, value)] for unhashable values
+        self.unhashable = dict((field, list()) for field in self.FIELDS)
+
+        for position, annotation in enumerate(annotations):
+            self.add(position, annotation, annotations)
+
+    def insert(self, position, annotations, owner):
+        '''Add annotations inserted at `position`, shifting the positions of
+        those following them'''
+        count = len(annotations)
+
+        if position < self.size:
+            self.__remap(lambda i: i + count if i >= position else i)
+        self.size += count
+
+        for offset, annotation in enumerate(annotations):
+            self.add(position + offset, annotation, owner)
+
+    def remove(self, positions):
+        '''Remove the annotations at `positions`, shifting the positions of
+        those following them'''
+        removed = sorted(set(positions))
+
+        if not removed:
+            return
+
+        def __shift(i):
+            offset = bisect.bisect_left(removed, i)
+            if offset < len(removed) and removed[offset] == i:
+                return None
+            return i - offset
+
+        self.__remap(__shift)
+        self.size -= len(removed)
+
+    def __remap(self, func):
+        '''Map the positions of all entries through `func`, dropping those
+        which map to `None`.  `func` must be increasing.'''
+        for field in self.FIELDS:
+            values = self.values[field]
+            for value, positions in list(six.iteritems(values)):
+                positions[:] = [i for i in map(func, positions)
+                                if i is not None]
+                if not positions:
+                    del values[value]
+
+            unhashable = [(func(i), value)
+                          for i, value in self.unhashable[field]]
+            self.unhashable[field] = [(i, value) for i, value in unhashable
+                                      if i is not None]
+
+    def add(self, position, obj, owner):
+        '''Add the fields of an object (and its descendants) to the index
+
+        Parameters
+        ----------
+        position : int
+            The position of the annotation containing `obj`
+
+        obj : JObject
+            The annotation, or an object within it
+
+        owner : AnnotationArray or JObject
+            The container of `obj`
+        '''
+        obj._attach(owner)
+        fields = obj.__dict__
+
+        for field in self.FIELDS.intersection(fields):
+            value = fields[field]
+            try:
+                positions = self.values[field].setdefault(value, [])
+            except TypeError:
+                self.unhashable[field].append((position, value))
+            else:
+                i = bisect.bisect_left(positions, position)
+                if i == len(positions) or positions[i] != position:
+                    positions.insert(i, position)
+
+        for value in six.itervalues(fields):
+            if isinstance(value, JObject):
+                self.add(position, value, obj)
+
+        self.size = max(self.size, position + 1)
+
+    def find(self, query):
+        '''Find the positions of annotations matching a query.
+
+        Parameters
+        ----------
+        query : _Query
+            The query, as applied to each annotation
+
+        Returns
+        -------
+        positions : list of int or None
+            The sorted positions of matching annotations,
+            or `None` if the query cannot be answered from the index.
+        '''
+        query = query.pop(Annotation.__name__)
+
+        if any(len(path) != 1 or path[0] not in self.FIELDS
+               for path, _ in query.terms):
+            return None
+
+        matches = set()
+        for (field, ), match in query.terms:
+            for value, positions in six.iteritems(self.values[field]):
+                if match(value):
+                    matches.update(positions)
+
+            matches.update(position
+                           for position, value in self.unhashable[field]
+                           if match(value))
+
+        return sorted(matches)
+
+
+def _compile_match(query):
+    '''Compile a query value into a function which tests a field value.
+
+    See `match_query` for details.
+    '''
+    if six.callable(query):
+        return query
+
+    elif isinstance(query, six.string_types):
+        pattern = re.compile(query)
+
+        def __match(string):
+            if isinstance(string, six.string_types):
+                return pattern.match(string) is not None
+            return query == string
+
+        return __match
+
+    return lambda string: query == string
+
+
 def serialize_obj(obj):
     '''Custom serialization functionality for working with advanced data types.
 
@@ -2121,14 +4405,14 @@ def summary(obj, indent=0):
     r : str
         If `obj` has a `__summary__` method, it is used.
 
-        If `obj` is a `SortedKeyList`, then it returns a description
-        of the length of the list.
+        If `obj` is a `SortedKeyList` or `ObservationArray`, then it
+        returns a description of the length of the list.
 
         Otherwise, `repr(obj)`.
     '''
     if hasattr(obj, '__summary__'):
         rep = obj.__summary__()
-    elif isinstance(obj, SortedKeyList):
+    elif isinstance(obj, (SortedKeyList, ObservationArray)):
         rep = '<{:d} observations>'.format(len(obj))
     else:
         rep = repr(obj)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+r'''
+Corpus loading
+--------------
+
+Load collections of JAMS files in parallel.
+
+.. autosummary::
+    :toctree: generated/
+
+    load_corpus
+    find_corpus
+'''
+
+import collections
+import glob
+import multiprocessing
+import os
+import pickle
+
+import six
+from concurrent import futures
+
+from . import core
+from .util import find_with_extension
+from .exceptions import ParameterError
+
+__all__ = ['load_corpus', 'find_corpus']
+
+# Extensions of loadable JAMS files
+__EXTENSIONS__ = ['jams', 'jamz', 'jamb']
+
+
+def find_corpus(source, depth=3, sort=True):
+    '''Find the JAMS files of a corpus.
+
+    Parameters
+    ----------
+    source : str or iterable of str
+        A directory to search, a glob pattern, or a collection of paths.
+
+    depth : int
+        If `source` is a directory, the depth of sub-directories to search
+
+    sort : bool
+        Sort the paths alphabetically
+
+    Returns
+    -------
+    paths : list of str
+        The JAMS files (`.jams`, `.jamz`, or `.jamb`) in `source`
+
+    Examples
+    --------
+    >>> jams.corpus.find_corpus('annotations/')
+    ['annotations/track01.jams', 'annotations/track02.jamz']
+    >>> jams.corpus.find_corpus('annotations/*/*.jams')
+    ['annotations/a/track01.jams', 'annotations/b/track01.jams']
+    '''
+    if not isinstance(source, six.string_types):
+        paths = list(source)
+
+    elif os.path.isdir(source):
+        paths = []
+        for ext in __EXTENSIONS__:
+            paths.extend(find_with_extension(source, ext, depth=depth,
+                                             sort=False))
+
+    else:
+        paths = glob.glob(source)
+
+    if sort:
+        paths.sort()
+
+    return paths
+
+
+def load_corpus(source, n_jobs=None, pool='process', ordered=True,
+                errors='raise', namespace=None, query=None,
+                validate=True, strict=True, lazy=False, depth=3,
+                **kwargs):
+    r'''Load a collection of JAMS files in parallel.
+
+    Results are generated as they become available, so the entire
+    corpus need not be held in memory.
+
+    Parameters
+    ----------
+    source : str or iterable of str
+        A directory to search, a glob pattern, or a collection of paths.
+
+        See `find_corpus` for details.
+
+    n_jobs : int > 0 or None
+        The number of parallel workers.
+        If `None`, the number of CPUs is used.
+        If `1`, files are loaded sequentially in the calling process.
+
+    pool : str ['process', 'thread']
+        The type of worker pool
+
+    ordered : bool
+        If `True`, results are generated in the order of the input paths.
+        If `False`, results are generated as they complete.
+
+    errors : str ['raise', 'skip', 'collect']
+        What to do if a file fails to load:
+
+        - `raise`: raise the exception
+        - `skip`: skip the file
+        - `collect`: generate the exception in place of the result
+
+        This applies only to failures while loading.
+        If `lazy=True`, observations are built (and validated) when first
+        accessed by the caller, so malformed observations raise then.
+
+    namespace : str, callable, or iterable of str, optional
+        If provided, only annotations whose namespace matches
+        (see `jams.JObject.search`) are loaded.
+        An iterable of strings matches any of its elements.
+
+        If `pool='process'`, a callable must be picklable
+        (e.g., a module-level function, but not a lambda).
+
+        Observations of other annotations are never constructed
+        or validated.
+
+    query : dict, optional
+        If provided, generate the annotations matching
+        `jam.search(**query)` rather than the `JAMS` object itself.
+
+        If `pool='process'`, it must be picklable.
+
+    validate : bool
+        Validate each file (after namespace filtering)
+
+    strict : bool
+        if `validate == True`, enforce strict schema validation
+
+    lazy : bool
+        If `True`, observations are built when they are first accessed
+        (see `jams.load`), outside of the error policy.
+        Otherwise, they are built by the workers.
+
+    depth : int
+        If `source` is a directory, the depth of sub-directories to search
+
+    kwargs
+        Additional keyword arguments to `jams.load`, e.g., `columnar`
+
+    Yields
+    ------
+    path : str
+        The path of the file
+
+    result : JAMS, AnnotationArray, or Exception
+        The loaded `JAMS` object, or the annotations matching `query`.
+
+        If `errors='collect'`, this is the exception if loading failed.
+
+    Raises
+    ------
+    ParameterError
+        If `pool` or `errors` are not supported,
+        or if `pool='process'` and `namespace` or `query` cannot be pickled
+
+    Examples
+    --------
+    >>> for path, jam in jams.corpus.load_corpus('annotations/'):
+    ...     print(path, len(jam.annotations))
+    >>> # Load only beat annotations, skipping unreadable files
+    >>> beats = dict(jams.corpus.load_corpus('annotations/*.jams',
+    ...                                      namespace='beat',
+    ...                                      query=dict(namespace='beat'),
+    ...                                      errors='skip'))
+    '''
+
+    if errors not in ('raise', 'skip', 'collect'):
+        raise ParameterError('Unsupported error policy: {}'.format(errors))
+
+    executors = dict(process=futures.ProcessPoolExecutor,
+                     thread=futures.ThreadPoolExecutor)
+
+    if pool not in executors:
+        raise ParameterError('Unsupported pool: {}'.format(pool))
+
+    paths = find_corpus(source, depth=depth)
+
+    if namespace is not None and not (isinstance(namespace, six.string_types)
+                                      or callable(namespace)):
+        namespace = list(namespace)
+
+    options = dict(namespace=namespace, query=query, validate=validate,
+                   strict=strict, lazy=lazy, kwargs=kwargs)
+
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+
+    if n_jobs != 1 and pool == 'process':
+        _check_picklable(namespace=namespace, query=query)
+
+    if n_jobs == 1:
+        results = (_call(_load_file, path, options) for path in paths)
+        for path, (result, exc) in six.moves.zip(paths, results):
+            if _keep(exc, errors):
+                yield path, result if exc is None else exc
+        return
+
+    with executors[pool](max_workers=n_jobs) as executor:
+        for path, future in _submit(executor, _load_file, paths, options,
+                                    ordered, 4 * n_jobs):
+            exc = future.exception()
+            if _keep(exc, errors):
+                yield path, future.result() if exc is None else exc
+
+
+def _check_picklable(**kwargs):
+    '''Check that arguments can be sent to worker processes.
+
+    Raises
+    ------
+    ParameterError
+        If an argument cannot be pickled
+    '''
+    for name, value in six.iteritems(kwargs):
+        try:
+            pickle.dumps(value)
+        except Exception:
+            raise ParameterError('{} must be picklable for pool="process": '
+                                 '{!r}'.format(name, value))
+
+
+def _call(func, *args):
+    '''Call a function, returning either its result or its exception'''
+    try:
+        return func(*args), None
+    except Exception as exc:
+        return None, exc
+
+
+def _keep(exc, errors):
+    '''Apply the error policy to the outcome of loading a file.
+
+    Returns `True` if the outcome should be generated.
+    '''
+    if exc is None or errors == 'collect':
+        return True
+    elif errors == 'skip':
+        return False
+    raise exc
+
+
+def _submit(executor, func, paths, options, ordered, window):
+    '''Submit jobs `func(path, options)` to an executor, keeping at most
+    `window` jobs in flight, and generate `(path, future)` pairs as they
+    complete.'''
+
+    paths = iter(paths)
+    pending = collections.OrderedDict()
+
+    def __fill():
+        while len(pending) < window:
+            path = next(paths, None)
+            if path is None:
+                break
+            pending[executor.submit(func, path, options)] = path
+
+    __fill()
+
+    while pending:
+        if ordered:
+            done = [next(iter(pending))]
+            futures.wait(done)
+        else:
+            done, _ = futures.wait(list(pending),
+                                   return_when=futures.FIRST_COMPLETED)
+
+        for future in done:
+            yield pending.pop(future), future
+
+        __fill()
+
+
+def _match_namespace(ns, query):
+    '''Test if a namespace matches a query, or any of a list of queries'''
+    if isinstance(query, list):
+        return any(core.match_query(ns, q) for q in query)
+    return core.match_query(ns, query)
+
+
+def _load_file(path, options):
+    '''Load a single file of a corpus.
+
+    See `load_corpus` for a description of the options.
+    '''
+    namespace = options['namespace']
+
+    # Load lazily so that annotations can be filtered before
+    # their observations are built or validated
+    jam = core.load(path, validate=False, lazy=True, **options['kwargs'])
+
+    if namespace is not None:
+        jam.annotations[:] = [ann for ann in jam.annotations
+                              if _match_namespace(ann.namespace, namespace)]
+
+    if options['validate']:
+        jam.validate(strict=options['strict'])
+
+    if not options['lazy']:
+        for ann in jam.annotations:
+            ann._build_pending()
+
+    if options['query'] is not None:
+        return jam.search(**options['query'])
+
+    return jam
@@ -8,6 +8,11 @@ Display
 
     display
     display_multi
+
+Long annotations are drawn at the resolution of their axes: observations
+which would fall within the same pixel column are decimated before they
+are passed to matplotlib, and the display is re-decimated whenever the
+x-limits of the axes change (e.g., by zooming or panning).
 '''
 
 from collections import OrderedDict
@@ -20,9 +25,12 @@ import numpy as np
 
 import matplotlib.pyplot as plt
 from matplotlib.offsetbox import AnchoredText
+from matplotlib.ticker import MultipleLocator
 
 import mir_eval.display
+import mir_eval.util
 
+from .core import trusted
 from .eval import hierarchy_flatten
 from .exceptions import NamespaceError, ParameterError
 from .eval import coerce_annotation
@@ -65,7 +73,7 @@ def intervals(annotation, **kwargs):
     '''Plotting wrapper for labeled intervals'''
     times, labels = annotation.to_interval_values()
 
-    return mir_eval.display.labeled_intervals(times, labels, **kwargs)
+    return _labeled_intervals(times, labels, **kwargs)
 
 
 def hierarchy(annotation, **kwargs):
@@ -79,23 +87,43 @@ def hierarchy(annotation, **kwargs):
 def pitch_contour(annotation, **kwargs):
     '''Plotting wrapper for pitch contours'''
     ax = kwargs.pop('ax', None)
+    midi = kwargs.pop('midi', False)
 
     # If the annotation is empty, we need to construct a new axes
     ax = mir_eval.display.__get_axes(ax=ax)[0]
 
     times, values = annotation.to_interval_values()
+    times = times[:, 0]
+
+    index = np.asarray([v['index'] for v in values])
+    freqs = np.asarray([v['frequency'] for v in values], dtype=np.float64)
+    voiced = np.asarray([v['voiced'] for v in values], dtype=bool)
+
+    # Unvoiced observations are drawn (translucent) if they have a frequency
+    unvoiced = ~voiced & (freqs != 0)
+    freqs = np.abs(freqs)
+
+    if midi:
+        freqs[freqs > 0] = mir_eval.util.hz_to_midi(freqs[freqs > 0])
+        ax.yaxis.set_minor_locator(MultipleLocator(1))
 
-    indices = np.unique([v['index'] for v in values])
+    # Group the observations by contour, preserving their order in time
+    order = np.argsort(index, kind='mergesort')
+    _, starts = np.unique(index[order], return_index=True)
 
-    for idx in indices:
-        rows = [i for (i, v) in enumerate(values) if v['index'] == idx]
-        freqs = np.asarray([values[r]['frequency'] for r in rows])
-        unvoiced = ~np.asarray([values[r]['voiced'] for r in rows])
-        freqs[unvoiced] *= -1
+    for rows in np.split(order, starts[1:]):
+        t = times[rows]
+        v_freqs = np.where(voiced[rows], freqs[rows], np.nan)
+        u_freqs = np.where(unvoiced[rows], freqs[rows], np.nan)
+
+        style = dict(kwargs)
+        v_line = _series(ax, t, v_freqs, **style)
+
+        style.pop('label', None)
+        style['color'] = v_line.get_color()
+        style['alpha'] = 0.5 * style.get('alpha', 1.0)
+        _series(ax, t, u_freqs, **style)
 
-        ax = mir_eval.display.pitch(times[rows, 0], freqs, unvoiced=True,
-                                    ax=ax,
-                                    **kwargs)
     return ax
 
 
@@ -109,7 +137,7 @@ def event(annotation, **kwargs):
     else:
         labels = None
 
-    return mir_eval.display.events(times, labels=labels, **kwargs)
+    return _events(times[:, 0], labels=labels, **kwargs)
 
 
 def beat_position(annotation, **kwargs):
@@ -120,7 +148,7 @@ def beat_position(annotation, **kwargs):
     labels = [_['position'] for _ in values]
 
     # TODO: plot time signature, measure number
-    return mir_eval.display.events(times, labels=labels, **kwargs)
+    return _events(times[:, 0], labels=labels, **kwargs)
 
 
 def piano_roll(annotation, **kwargs):
@@ -130,6 +158,310 @@ def piano_roll(annotation, **kwargs):
     return mir_eval.display.piano_roll(times, midi=midi, **kwargs)
 
 
+def _width(ax):
+    '''The width of an axes, in pixels'''
+    return max(1, int(np.ceil(ax.get_window_extent().width)))
+
+
+def _on_xlim(ax, update):
+    '''Call `update(x0, x1, n_bins)` whenever the x-limits of `ax` change.
+
+    `n_bins` is the width of the axes in pixels.
+
+    Artists must be updated in place (e.g., `Line2D.set_data`), rather than
+    re-added, so that the data limits of the axes (and hence autoscaling)
+    are unaffected.
+    '''
+    def __update(changed):
+        x0, x1 = sorted(changed.get_xlim())
+        update(x0, x1, _width(ax))
+
+    # Axes sharing x-limits with `ax` do not notify it of changes,
+    # and may do so before its limits are updated
+    for other in ax.get_shared_x_axes().get_siblings(ax):
+        other.callbacks.connect('xlim_changed', __update)
+
+
+def _bins(x, x0, x1, n_bins):
+    '''Map positions to pixel columns of the range `[x0, x1]`'''
+    scale = n_bins / max(x1 - x0, np.finfo(float).tiny)
+    return np.floor((x - x0) * scale).astype(np.int64)
+
+
+def _decimate_series(x, y, x0, x1, n_bins):
+    '''Min/max decimation of a series to a number of pixel columns.
+
+    Within each column, the first, last, minimum, and maximum samples are
+    kept, as are the samples on either side of each gap (`nan`) in `y`,
+    so the decimated series draws the same pixels as the original.
+    Samples outside of `[x0, x1]` are discarded, except for those
+    adjacent to it.
+
+    Parameters
+    ----------
+    x : np.ndarray, shape=(n,)
+        Sample positions, in ascending order
+
+    y : np.ndarray, shape=(n,)
+        Sample values, with `nan` for gaps
+
+    x0, x1 : float
+        The visible range of `x`
+
+    n_bins : int > 0
+        The number of pixel columns in the visible range
+
+    Returns
+    -------
+    idx : np.ndarray, shape=(m,)
+        The indices of the samples to keep, in ascending order
+    '''
+    start = max(np.searchsorted(x, x0, side='left') - 1, 0)
+    end = min(np.searchsorted(x, x1, side='right') + 1, len(x))
+
+    if end - start <= 4 * n_bins:
+        return np.arange(start, end)
+
+    x, y = x[start:end], y[start:end]
+
+    bins = _bins(x, x0, x1, n_bins)
+    firsts = np.flatnonzero(np.concatenate([[True], bins[1:] != bins[:-1]]))
+    counts = np.diff(np.append(firsts, len(x)))
+    group = np.repeat(np.arange(len(firsts)), counts)
+
+    finite = np.isfinite(y)
+    edges = np.flatnonzero(finite[1:] != finite[:-1])
+
+    keep = [firsts, firsts + counts - 1, edges, edges + 1]
+
+    for y_fill, extremum in [(np.where(finite, y, np.inf), np.minimum),
+                             (np.where(finite, y, -np.inf), np.maximum)]:
+        extreme = np.repeat(extremum.reduceat(y_fill, firsts), counts)
+        hits = np.flatnonzero(y_fill == extreme)
+        first = np.concatenate([[True], group[hits[1:]] != group[hits[:-1]]])
+        keep.append(hits[first])
+
+    return start + np.unique(np.concatenate(keep))
+
+
+def _series(ax, x, y, **kwargs):
+    '''Plot a line, decimated to the resolution of the axes.
+
+    Returns
+    -------
+    line : matplotlib.lines.Line2D
+    '''
+    if len(x):
+        x0, x1 = x[0], x[-1]
+    else:
+        x0, x1 = 0, 1
+
+    idx = _decimate_series(x, y, x0, x1, _width(ax))
+    line, = ax.plot(x[idx], y[idx], **kwargs)
+
+    def __update(x0, x1, n_bins):
+        idx = _decimate_series(x, y, x0, x1, n_bins)
+        line.set_data(x[idx], y[idx])
+
+    _on_xlim(ax, __update)
+
+    return line
+
+
+def _decimate_events(times, x0, x1, n_bins):
+    '''Decimate events to at most one per pixel column.
+
+    Parameters
+    ----------
+    times : np.ndarray, shape=(n,)
+        Event times, in ascending order
+
+    x0, x1 : float
+        The visible time range
+
+    n_bins : int > 0
+        The number of pixel columns in the visible range
+
+    Returns
+    -------
+    idx : np.ndarray, shape=(m,)
+        The indices of the first event in each occupied column within
+        `[x0, x1]`, and of the last event overall, in ascending order
+    '''
+    start = np.searchsorted(times, x0, side='left')
+    end = np.searchsorted(times, x1, side='right')
+
+    bins = _bins(times[start:end], x0, x1, n_bins)
+    first = np.ones(len(bins), dtype=bool)
+    first[1:] = bins[1:] != bins[:-1]
+    idx = start + np.flatnonzero(first)
+
+    if end == len(times) and len(times):
+        idx = np.union1d(idx, [len(times) - 1])
+
+    return idx
+
+
+def _events(times, labels=None, ax=None, text_kw=None, base=None,
+            height=None, **kwargs):
+    '''Plot events as vertical lines, decimated to the resolution of the
+    axes.  See `mir_eval.display.events` for a description of the
+    parameters.'''
+
+    if text_kw is None:
+        text_kw = dict()
+    text_kw.setdefault('va', 'top')
+    text_kw.setdefault('clip_on', True)
+    text_kw.setdefault('bbox', dict(boxstyle='round', facecolor='white'))
+
+    order = np.argsort(times, kind='mergesort')
+    times = np.asarray(times)[order]
+    if labels:
+        labels = [labels[i] for i in order]
+
+    if len(times):
+        x0, x1 = times[0], times[-1]
+    else:
+        x0, x1 = 0, 1
+
+    ax = mir_eval.display.__get_axes(ax=ax)[0]
+    idx = _decimate_events(times, x0, x1, _width(ax))
+
+    ax = mir_eval.display.events(times[idx], ax=ax, base=base, height=height,
+                                 **kwargs)
+
+    lines = ax.collections[-1]
+
+    if base is None and height is None:
+        base, height = 0, 1
+        transform = ax.get_xaxis_transform()
+    else:
+        transform = 'data'
+
+    texts = []
+
+    def __label(idx):
+        for text in texts:
+            text.remove()
+        del texts[:]
+
+        if not labels:
+            return
+
+        for i in idx:
+            texts.append(ax.annotate(labels[i], xy=(times[i], height),
+                                     xycoords=transform,
+                                     xytext=(8, -10),
+                                     textcoords='offset points',
+                                     **text_kw))
+
+    def __update(x0, x1, n_bins):
+        idx = _decimate_events(times, x0, x1, n_bins)
+
+        segments = np.empty((len(idx), 2, 2))
+        segments[:, :, 0] = times[idx, np.newaxis]
+        segments[:, 0, 1] = base
+        segments[:, 1, 1] = base + height
+        lines.set_segments(segments)
+
+        __label(idx)
+
+    __label(idx)
+    _on_xlim(ax, __update)
+
+    return ax
+
+
+def _merge_intervals(intervals, x0, x1, n_bins):
+    '''Merge intervals separated by less than a pixel column.
+
+    Parameters
+    ----------
+    intervals : np.ndarray, shape=(n, 2)
+        Intervals, in ascending order of start time
+
+    x0, x1 : float
+        The visible time range
+
+    n_bins : int > 0
+        The number of pixel columns in the visible range
+
+    Returns
+    -------
+    merged : np.ndarray, shape=(m, 2)
+        The merged intervals which overlap `[x0, x1]`
+    '''
+    intervals = intervals[(intervals[:, 1] >= x0) & (intervals[:, 0] <= x1)]
+
+    if not len(intervals):
+        return intervals
+
+    pixel = (x1 - x0) / float(n_bins)
+    ends = np.maximum.accumulate(intervals[:, 1])
+
+    first = np.flatnonzero(np.concatenate([[True], intervals[1:, 0] >
+                                           ends[:-1] + pixel]))
+
+    return np.column_stack([intervals[first, 0],
+                            np.maximum.reduceat(intervals[:, 1], first)])
+
+
+def _labeled_intervals(intervals, labels, ax=None, **kwargs):
+    '''Plot labeled intervals, decimated to the resolution of the axes.
+    See `mir_eval.display.labeled_intervals` for a description of the
+    parameters.'''
+
+    ax = mir_eval.display.__get_axes(ax=ax)[0]
+    n_collections = len(ax.collections)
+
+    # Group the intervals by label, in ascending order of start time
+    uniques, inverse = np.unique(np.asarray(labels, dtype=object),
+                                 return_inverse=True)
+    order = np.lexsort((intervals[:, 0], inverse))
+    _, starts = np.unique(inverse[order], return_index=True)
+
+    groups = OrderedDict((uniques[inverse[rows[0]]], intervals[rows])
+                         for rows in np.split(order, starts[1:]) if len(rows))
+
+    if len(intervals):
+        x0, x1 = intervals[:, 0].min(), intervals[:, 1].max()
+    else:
+        x0, x1 = 0, 1
+
+    merged = [_merge_intervals(ivals, x0, x1, _width(ax))
+              for ivals in six.itervalues(groups)]
+
+    ax = mir_eval.display.labeled_intervals(
+        np.concatenate(merged) if merged else np.empty((0, 2)),
+        [lab for lab, ivals in zip(groups, merged) for _ in ivals],
+        ax=ax, **kwargs)
+
+    # Recover the label of each new bar collection from the tick formatter
+    formatter = ax.yaxis.get_major_formatter()
+    if not isinstance(formatter, mir_eval.display.IntervalFormatter):
+        return ax
+
+    bars = []
+    for collection in ax.collections[n_collections:]:
+        paths = collection.get_paths()
+        if not paths:
+            continue
+        y0, y1 = paths[0].vertices[:, 1].min(), paths[0].vertices[:, 1].max()
+        label = formatter(y0)
+        if label in groups:
+            bars.append((collection, groups[label], y0, y1))
+
+    def __update(x0, x1, n_bins):
+        for collection, ivals, y0, y1 in bars:
+            collection.set_verts([[(t0, y0), (t0, y1), (t1, y1), (t1, y0)]
+                                  for t0, t1 in _merge_intervals(ivals, x0,
+                                                                 x1, n_bins)])
+
+    _on_xlim(ax, __update)
+
+    return ax
+
+
 VIZ_MAPPING = OrderedDict()
 
 VIZ_MAPPING['segment_open'] = intervals
@@ -166,11 +498,18 @@ def display(annotation, meta=True, **kwargs):
     ------
     NamespaceError
         If the annotation cannot be visualized
+
+    SchemaError
+        If the annotation fails schema validation
     '''
 
+    # Validate once, rather than once for each candidate conversion
+    annotation.validate(strict=True)
+
     for namespace, func in six.iteritems(VIZ_MAPPING):
         try:
-            ann = coerce_annotation(annotation, namespace)
+            with trusted():
+                ann = coerce_annotation(annotation, namespace)
 
             axes = func(ann, **kwargs)
 
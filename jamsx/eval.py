@@ -16,19 +16,40 @@ Evaluation
     pattern
     hierarchy
     transcription
+
+Batch evaluation
+----------------
+
+.. autosummary::
+    :toctree: generated/
+
+    batch
 '''
 
+import collections
+import functools
+import multiprocessing
+import os
 from collections import defaultdict
 
 import six
 import numpy as np
+import pandas as pd
 import mir_eval
+from concurrent import futures
 
-from .nsconvert import convert
+from . import core
+from .nsconvert import convert, can_convert
+from .util import filebase
+from .corpus import find_corpus, _check_picklable
+from .exceptions import NamespaceError, ParameterError
 
 __all__ = ['beat', 'chord', 'melody', 'onset',
            'segment', 'hierarchy', 'tempo',
-           'pattern', 'transcription']
+           'pattern', 'transcription', 'batch']
+
+# Registered metrics: name -> (namespace, scoring function)
+__METRICS__ = dict()
 
 
 def coerce_annotation(ann, namespace):
@@ -64,12 +85,39 @@ def coerce_annotation(ann, namespace):
     jams.nsconvert.convert
     '''
 
-    ann = convert(ann, namespace)
-    ann.validate(strict=True)
+    ann_coerced = convert(ann, namespace)
+
+    # `convert` validates its input, so only converted copies
+    # need to be validated again
+    if ann_coerced is not ann:
+        ann_coerced.validate(strict=True)
+
+    return ann_coerced
+
+
+def _metric(namespace):
+    '''A decorator to register an evaluation metric.
+
+    The decorated function receives annotations which have been coerced
+    to `namespace` (see `coerce_annotation`).  The scoring function is
+    also registered for use by `batch`, which coerces each reference
+    annotation only once.
+    '''
+
+    def register(score):
+        '''Wrap `score` with annotation coercion'''
+        @functools.wraps(score)
+        def metric(ref, est, **kwargs):
+            return score(coerce_annotation(ref, namespace),
+                         coerce_annotation(est, namespace), **kwargs)
+
+        __METRICS__[score.__name__] = (namespace, score)
+        return metric
 
-    return ann
+    return register
 
 
+@_metric('beat')
 def beat(ref, est, **kwargs):
     r'''Beat tracking evaluation
 
@@ -103,16 +151,13 @@ def beat(ref, est, **kwargs):
     >>> scores = jams.eval.beat(ref_ann, est_ann)
     '''
 
-    namespace = 'beat'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
-
     ref_times, _ = ref.to_event_values()
     est_times, _ = est.to_event_values()
 
     return mir_eval.beat.evaluate(ref_times, est_times, **kwargs)
 
 
+@_metric('onset')
 def onset(ref, est, **kwargs):
     r'''Onset evaluation
 
@@ -145,9 +190,6 @@ def onset(ref, est, **kwargs):
     >>> est_ann = est_jam.search(namespace='onset')[0]
     >>> scores = jams.eval.onset(ref_ann, est_ann)
     '''
-    namespace = 'onset'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
 
     ref_times, _ = ref.to_event_values()
     est_times, _ = est.to_event_values()
@@ -155,6 +197,7 @@ def onset(ref, est, **kwargs):
     return mir_eval.onset.evaluate(ref_times, est_times, **kwargs)
 
 
+@_metric('chord')
 def chord(ref, est, **kwargs):
     r'''Chord evaluation
 
@@ -188,9 +231,6 @@ def chord(ref, est, **kwargs):
     >>> scores = jams.eval.chord(ref_ann, est_ann)
     '''
 
-    namespace = 'chord'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
     ref_interval, ref_value = ref.to_interval_values()
     est_interval, est_value = est.to_interval_values()
 
@@ -198,6 +238,7 @@ def chord(ref, est, **kwargs):
                                    est_interval, est_value, **kwargs)
 
 
+@_metric('segment_open')
 def segment(ref, est, **kwargs):
     r'''Segment evaluation
 
@@ -230,9 +271,6 @@ def segment(ref, est, **kwargs):
     >>> est_ann = est_jam.search(namespace='segment_.*')[0]
     >>> scores = jams.eval.segment(ref_ann, est_ann)
     '''
-    namespace = 'segment_open'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
     ref_interval, ref_value = ref.to_interval_values()
     est_interval, est_value = est.to_interval_values()
 
@@ -276,6 +314,7 @@ def hierarchy_flatten(annotation):
     return hier_intervals, hier_labels
 
 
+@_metric('multi_segment')
 def hierarchy(ref, est, **kwargs):
     r'''Multi-level segmentation evaluation
 
@@ -308,9 +347,6 @@ def hierarchy(ref, est, **kwargs):
     >>> est_ann = est_jam.search(namespace='multi_segment')[0]
     >>> scores = jams.eval.hierarchy(ref_ann, est_ann)
     '''
-    namespace = 'multi_segment'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
     ref_hier, ref_hier_lab = hierarchy_flatten(ref)
     est_hier, est_hier_lab = hierarchy_flatten(est)
 
@@ -319,6 +355,7 @@ def hierarchy(ref, est, **kwargs):
                                        **kwargs)
 
 
+@_metric('tempo')
 def tempo(ref, est, **kwargs):
     r'''Tempo evaluation
 
@@ -352,9 +389,6 @@ def tempo(ref, est, **kwargs):
     >>> scores = jams.eval.tempo(ref_ann, est_ann)
     '''
 
-    ref = coerce_annotation(ref, 'tempo')
-    est = coerce_annotation(est, 'tempo')
-
     ref_tempi = np.asarray([o.value for o in ref])
     ref_weight = ref.data[0].confidence
     est_tempi = np.asarray([o.value for o in est])
@@ -363,6 +397,7 @@ def tempo(ref, est, **kwargs):
 
 
 # melody
+@_metric('pitch_contour')
 def melody(ref, est, **kwargs):
     r'''Melody extraction evaluation
 
@@ -396,10 +431,6 @@ def melody(ref, est, **kwargs):
     >>> scores = jams.eval.melody(ref_ann, est_ann)
     '''
 
-    namespace = 'pitch_contour'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
-
     ref_times, ref_p = ref.to_event_values()
     est_times, est_p = est.to_event_values()
 
@@ -452,6 +483,7 @@ def pattern_to_mireval(ann):
     return [list(_.values()) for _ in six.itervalues(patterns)]
 
 
+@_metric('pattern_jku')
 def pattern(ref, est, **kwargs):
     r'''Pattern detection evaluation
 
@@ -485,16 +517,13 @@ def pattern(ref, est, **kwargs):
     >>> scores = jams.eval.pattern(ref_ann, est_ann)
     '''
 
-    namespace = 'pattern_jku'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
-
     ref_patterns = pattern_to_mireval(ref)
     est_patterns = pattern_to_mireval(est)
 
     return mir_eval.pattern.evaluate(ref_patterns, est_patterns, **kwargs)
 
 
+@_metric('pitch_contour')
 def transcription(ref, est, **kwargs):
     r'''Note transcription evaluation
 
@@ -529,9 +558,6 @@ def transcription(ref, est, **kwargs):
     >>> scores = jams.eval.transcription(ref_ann, est_ann)
     '''
 
-    namespace = 'pitch_contour'
-    ref = coerce_annotation(ref, namespace)
-    est = coerce_annotation(est, namespace)
     ref_intervals, ref_p = ref.to_interval_values()
     est_intervals, est_p = est.to_interval_values()
 
@@ -540,3 +566,215 @@ def transcription(ref, est, **kwargs):
 
     return mir_eval.transcription.evaluate(
         ref_intervals, ref_pitches, est_intervals, est_pitches, **kwargs)
+
+
+def batch(metric, pairs, query=None, n_jobs=1, pool='process',
+          errors='raise', **kwargs):
+    r'''Evaluate a collection of reference and estimated annotations.
+
+    Evaluations sharing a reference are grouped together, so that the
+    reference is loaded, converted, and validated only once, regardless
+    of the number of estimates it is compared against.
+
+    Parameters
+    ----------
+    metric : str
+        The name of the evaluation metric in `jams.eval`, e.g., `'beat'`
+
+    pairs : iterable of (reference, estimate)
+        Each reference and estimate may be:
+
+        - a `jams.Annotation`
+        - a `jams.JAMS` object, or the path to a JAMS file, from which
+          an annotation is selected by `query`
+        - the path to a directory of JAMS files
+
+        If both the reference and the estimate are directories, files are
+        matched by name (ignoring extensions), and each match is evaluated.
+        Unmatched files are ignored.
+
+    query : str or callable, optional
+        A namespace query (see `jams.JObject.search`) to select annotations
+        from `JAMS` objects.  The first matching annotation is used.
+
+        By default, the first annotation which can be converted to the
+        namespace of the metric is used.
+
+        If `pool='process'`, a callable must be picklable
+        (e.g., a module-level function, but not a lambda).
+
+    n_jobs : int > 0 or None
+        The number of parallel workers.
+        If `None`, the number of CPUs is used.
+        If `1`, evaluation runs sequentially in the calling process.
+
+    pool : str ['process', 'thread']
+        The type of worker pool
+
+    errors : str ['raise', 'skip']
+        What to do if an evaluation fails.
+        Skipped evaluations are omitted from the results.
+
+    kwargs
+        Additional keyword arguments to the metric.
+        If `pool='process'`, they must be picklable.
+
+    Returns
+    -------
+    scores : pd.DataFrame
+        One row per evaluation, in the order of `pairs`.
+        The columns `reference` and `estimate` hold the paths of the
+        evaluated files (`None` for objects passed directly),
+        `track` holds the name of the reference file (without extension),
+        and each remaining column holds a score.
+
+    Raises
+    ------
+    ParameterError
+        If `metric`, `pool` or `errors` are not supported,
+        or if `pool='process'` and `query` or `kwargs` cannot be pickled
+
+    NamespaceError
+        If no annotation matching `query` can be found
+
+    Examples
+    --------
+    >>> # Score several systems against the same references
+    >>> systems = ['system_a/', 'system_b/', 'system_c/']
+    >>> scores = jams.eval.batch('chord', [('reference/', est)
+    ...                                    for est in systems],
+    ...                          n_jobs=4)
+    >>> scores.groupby(scores.estimate.map(os.path.dirname)).mean()
+    '''
+    if metric not in __METRICS__:
+        raise ParameterError('Unknown metric: {}'.format(metric))
+
+    if errors not in ('raise', 'skip'):
+        raise ParameterError('Unsupported error policy: {}'.format(errors))
+
+    executors = dict(process=futures.ProcessPoolExecutor,
+                     thread=futures.ThreadPoolExecutor)
+
+    if pool not in executors:
+        raise ParameterError('Unsupported pool: {}'.format(pool))
+
+    # Group evaluations by reference
+    tasks = collections.OrderedDict()
+    rows = []
+    for ref, est in _expand_pairs(pairs):
+        key = ref if isinstance(ref, six.string_types) else id(ref)
+        tasks.setdefault(key, (ref, []))[1].append((len(rows), est))
+        rows.append((ref, est))
+
+    tasks = [(metric, ref, ests, query, kwargs)
+             for ref, ests in six.itervalues(tasks)]
+
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+
+    if n_jobs != 1 and pool == 'process':
+        _check_picklable(query=query, kwargs=kwargs)
+
+    if n_jobs == 1:
+        outcomes = [_score_reference(task) for task in tasks]
+    else:
+        with executors[pool](max_workers=n_jobs) as executor:
+            outcomes = list(executor.map(_score_reference, tasks))
+
+    results = dict()
+    for outcome in outcomes:
+        results.update(outcome)
+
+    records = []
+    index = []
+    for i, (ref, est) in enumerate(rows):
+        scores, exc = results[i]
+        if exc is not None:
+            if errors == 'raise':
+                raise exc
+            continue
+
+        record = collections.OrderedDict()
+        record['reference'] = _path_of(ref)
+        record['estimate'] = _path_of(est)
+        record['track'] = (filebase(record['reference'])
+                           if record['reference'] is not None else None)
+        record.update(scores)
+        records.append(record)
+        index.append(i)
+
+    columns = ['reference', 'estimate', 'track']
+    for record in records:
+        columns.extend(key for key in record if key not in columns)
+
+    return pd.DataFrame(records, index=index, columns=columns)
+
+
+def _path_of(obj):
+    '''The path of an evaluated file, or `None` for in-memory objects'''
+    if isinstance(obj, six.string_types):
+        return obj
+    return None
+
+
+def _expand_pairs(pairs):
+    '''Expand pairs of directories into pairs of matching files'''
+    for ref, est in pairs:
+        if (isinstance(ref, six.string_types) and os.path.isdir(ref) and
+                isinstance(est, six.string_types) and os.path.isdir(est)):
+
+            estimates = dict((filebase(path), path)
+                             for path in find_corpus(est))
+            for path in find_corpus(ref):
+                if filebase(path) in estimates:
+                    yield path, estimates[filebase(path)]
+        else:
+            yield ref, est
+
+
+def _select(obj, query, namespace):
+    '''Select the annotation to evaluate from an annotation,
+    JAMS object, or path'''
+    if isinstance(obj, six.string_types):
+        obj = core.load(obj, validate=False, lazy=True)
+
+    if isinstance(obj, core.Annotation):
+        return obj
+
+    if query is not None:
+        annotations = obj.search(namespace=query)
+    else:
+        annotations = [ann for ann in obj.annotations
+                       if can_convert(ann, namespace)]
+
+    if not annotations:
+        raise NamespaceError('No annotation matching {} found '
+                             'in {}'.format(query or namespace, obj))
+
+    return annotations[0]
+
+
+def _score_reference(task):
+    '''Score a set of estimates against a single reference.
+
+    Returns
+    -------
+    results : list of (row, (scores, exception))
+    '''
+    metric, ref, estimates, query, kwargs = task
+    namespace, score = __METRICS__[metric]
+
+    try:
+        ref = coerce_annotation(_select(ref, query, namespace), namespace)
+    except Exception as exc:
+        return [(row, (None, exc)) for row, _ in estimates]
+
+    results = []
+    for row, est in estimates:
+        try:
+            est = coerce_annotation(_select(est, query, namespace), namespace)
+            results.append((row, (score(ref, est, **kwargs), None)))
+        except Exception as exc:
+            results.append((row, (None, exc)))
+
+    return results
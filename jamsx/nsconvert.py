@@ -13,9 +13,9 @@ Namespace conversion
 
 import numpy as np
 
-from copy import deepcopy
 from collections import defaultdict
 
+from . import core
 from .exceptions import NamespaceError
 
 
@@ -28,12 +28,14 @@ __all__ = ['convert', 'can_convert']
 def _conversion(target, source):
     '''A decorator to register namespace conversions.
 
+    Conversion functions must return a new annotation,
+    and leave their input unmodified.
+
     Usage
     -----
     >>> @conversion('tag_open', 'tag_.*')
     ... def tag_to_open(annotation):
-    ...     annotation.namespace = 'tag_open'
-    ...     return annotation
+    ...     return _derive(annotation, 'tag_open')
     '''
 
     def register(func):
@@ -61,8 +63,9 @@ def convert(annotation, target_namespace):
         if `annotation` already belongs to `target_namespace`, then
         it is returned directly.
 
-        otherwise, `annotation` is copied and automatically converted
-        to the target namespace.
+        otherwise, a new annotation is constructed by converting
+        `annotation` to the target namespace.  Metadata is copied
+        as in `jams.Annotation.trim`.
 
     Raises
     ------
@@ -91,9 +94,6 @@ def convert(annotation, target_namespace):
         return annotation
 
     if target_namespace in __CONVERSION__:
-        # Otherwise, make a copy to mangle
-        annotation = deepcopy(annotation)
-
         # Look for a way to map this namespace to the target
         for source in __CONVERSION__[target_namespace]:
             if annotation.search(namespace=source):
@@ -141,134 +141,131 @@ def can_convert(annotation, target_namespace):
 @_conversion('pitch_contour', 'pitch_hz')
 def pitch_hz_to_contour(annotation):
     '''Convert a pitch_hz annotation to a contour'''
-    annotation.namespace = 'pitch_contour'
-    data = annotation.pop_data()
-
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence,
-                          value=dict(index=0,
-                                     frequency=np.abs(obs.value),
-                                     voiced=obs.value > 0))
-    return annotation
+    return _derive(annotation, 'pitch_contour', _hz_to_contour)
 
 
 @_conversion('pitch_contour', 'pitch_midi')
 def pitch_midi_to_contour(annotation):
     '''Convert a pitch_hz annotation to a contour'''
-    annotation = pitch_midi_to_hz(annotation)
-    return pitch_hz_to_contour(annotation)
+    return _derive(annotation, 'pitch_contour',
+                   lambda values: _hz_to_contour(_midi_to_hz(values)))
 
 
 @_conversion('note_hz', 'note_midi')
 def note_midi_to_hz(annotation):
     '''Convert a pitch_midi annotation to pitch_hz'''
-
-    annotation.namespace = 'note_hz'
-    data = annotation.pop_data()
-
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence,
-                          value=440 * (2.0**((obs.value - 69.0)/12.0)))
-
-    return annotation
+    return _derive(annotation, 'note_hz', _midi_to_hz)
 
 
 @_conversion('note_midi', 'note_hz')
 def note_hz_to_midi(annotation):
     '''Convert a pitch_hz annotation to pitch_midi'''
-
-    annotation.namespace = 'note_midi'
-
-    data = annotation.pop_data()
-
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence,
-                          value=12 * (np.log2(obs.value) - np.log2(440.0)) + 69)
-
-    return annotation
+    return _derive(annotation, 'note_midi', _hz_to_midi)
 
 
 @_conversion('pitch_hz', 'pitch_midi')
 def pitch_midi_to_hz(annotation):
     '''Convert a pitch_midi annotation to pitch_hz'''
-
-    annotation.namespace = 'pitch_hz'
-
-    data = annotation.pop_data()
-
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence,
-                          value=440 * (2.0**((obs.value - 69.0)/12.0)))
-
-    return annotation
+    return _derive(annotation, 'pitch_hz', _midi_to_hz)
 
 
 @_conversion('pitch_midi', 'pitch_hz')
 def pitch_hz_to_midi(annotation):
     '''Convert a pitch_hz annotation to pitch_midi'''
-
-    annotation.namespace = 'pitch_midi'
-
-    data = annotation.pop_data()
-
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence,
-                          value=12 * (np.log2(obs.value) - np.log2(440.0)) + 69)
-    return annotation
+    return _derive(annotation, 'pitch_midi', _hz_to_midi)
 
 
 @_conversion('segment_open', 'segment_.*')
 def segment_to_open(annotation):
     '''Convert any segmentation to open label space'''
-
-    annotation.namespace = 'segment_open'
-    return annotation
+    return _derive(annotation, 'segment_open')
 
 
 @_conversion('tag_open', 'tag_.*')
 def tag_to_open(annotation):
     '''Convert any tag annotation to open label space'''
-
-    annotation.namespace = 'tag_open'
-    return annotation
+    return _derive(annotation, 'tag_open')
 
 
 @_conversion('tag_open', 'scaper')
 def scaper_to_tag(annotation):
     '''Convert scaper annotations to tag_open'''
-
-    annotation.namespace = 'tag_open'
-
-    data = annotation.pop_data()
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence, value=obs.value['label'])
-
-    return annotation
+    return _derive(annotation, 'tag_open',
+                   lambda values: [value['label'] for value in values])
 
 
 @_conversion('beat', 'beat_position')
 def beat_position(annotation):
     '''Convert beat_position to beat'''
-
-    annotation.namespace = 'beat'
-    data = annotation.pop_data()
-    for obs in data:
-        annotation.append(time=obs.time, duration=obs.duration,
-                          confidence=obs.confidence,
-                          value=obs.value['position'])
-
-    return annotation
+    return _derive(annotation, 'beat',
+                   lambda values: [value['position'] for value in values])
 
 
 @_conversion('chord', 'chord_harte')
 def chordh_to_chord(annotation):
     '''Convert Harte annotation to chord'''
+    return _derive(annotation, 'chord')
 
-    annotation.namespace = 'chord'
-    return annotation
+
+def _derive(annotation, namespace, transform=None):
+    '''Construct a copy of an annotation in a new namespace.
+
+    Metadata is copied as in `Annotation.trim`, and observations are
+    copied column-wise, so the input annotation is neither deep-copied
+    nor modified.
+
+    Parameters
+    ----------
+    annotation : jams.Annotation
+        The source annotation
+
+    namespace : str
+        The namespace of the new annotation
+
+    transform : callable, optional
+        A function mapping the column of observation values
+        (a list or `np.ndarray`) to the new values
+
+    Returns
+    -------
+    derived : jams.Annotation
+    '''
+    time, duration, value, confidence = annotation._export_columns()
+
+    if transform is not None:
+        value = transform(value)
+
+    derived = core.Annotation(
+        namespace,
+        annotation_metadata=annotation.annotation_metadata,
+        sandbox=annotation.sandbox,
+        time=annotation.time,
+        duration=annotation.duration,
+        columnar=annotation._columnar)
+
+    derived.append_columns(dict(time=time, duration=duration,
+                                value=value, confidence=confidence))
+    return derived
+
+
+def _midi_to_hz(values):
+    '''Convert an array of MIDI note numbers to frequencies (Hz)'''
+    values = np.asarray(values, dtype=np.float64)
+    return 440.0 * (2.0**((values - 69.0) / 12.0))
+
+
+def _hz_to_midi(values):
+    '''Convert an array of frequencies (Hz) to MIDI note numbers'''
+    return 12 * (np.log2(np.asarray(values, dtype=np.float64))
+                 - np.log2(440.0)) + 69
+
+
+def _hz_to_contour(values):
+    '''Convert an array of signed frequencies (Hz) to contour values.
+
+    Non-positive frequencies are unvoiced.
+    '''
+    values = np.asarray(values, dtype=np.float64)
+    return [dict(index=0, frequency=frequency, voiced=voiced)
+            for frequency, voiced in zip(np.abs(values).tolist(),
+                                         (values > 0).tolist())]
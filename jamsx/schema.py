@@ -10,6 +10,8 @@ Namespace management
     add_namespace
     namespace
     namespace_array
+    namespace_validator
+    column_validator
     is_dense
     values
     get_dtypes
@@ -25,13 +27,21 @@ from pkg_resources import resource_filename
 
 import numpy as np
 import jsonschema
+import six
 
 from .exceptions import NamespaceError, JamsError
 
-__all__ = ['add_namespace', 'namespace', 'is_dense', 'values', 'get_dtypes', 'VALIDATOR']
+__all__ = ['add_namespace', 'namespace', 'namespace_validator',
+           'column_validator', 'is_dense', 'values', 'get_dtypes', 'VALIDATOR']
 
 __NAMESPACE__ = dict()
 
+# Compiled validators for observation arrays, keyed by namespace
+__VALIDATORS__ = dict()
+
+# Vectorized column validators, keyed by namespace
+__COLUMN_VALIDATORS__ = dict()
+
 
 def add_namespace(filename):
     '''Add a namespace definition to our working set.
@@ -45,7 +55,14 @@ def add_namespace(filename):
         Path to json file defining the namespace object
     '''
     with open(filename, mode='r') as fileobj:
-        __NAMESPACE__.update(json.load(fileobj))
+        definitions = json.load(fileobj)
+
+    __NAMESPACE__.update(definitions)
+
+    # Invalidate any compiled validators for redefined namespaces
+    for ns_key in definitions:
+        __VALIDATORS__.pop(ns_key, None)
+        __COLUMN_VALIDATORS__.pop(ns_key, None)
 
 
 def namespace(ns_key):
@@ -98,6 +115,347 @@ def namespace_array(ns_key):
     return sch
 
 
+def namespace_validator(ns_key):
+    '''Get a compiled validator for arrays of a given namespace.
+
+    Validators are constructed once per namespace and cached until
+    the namespace is redefined by `add_namespace`.
+
+    Parameters
+    ----------
+    ns_key : str
+        Namespace key identifier
+
+    Returns
+    -------
+    validator : jsonschema.Draft4Validator
+        A validator for `namespace_array(ns_key)`
+
+    Raises
+    ------
+    NamespaceError
+        If `ns_key` is not found
+
+    Examples
+    --------
+    >>> validator = jams.schema.namespace_validator('beat')
+    >>> validator.is_valid([{'time': 0.5, 'duration': 0.0,
+    ...                      'value': 1, 'confidence': None}])
+    True
+    '''
+
+    if ns_key not in __VALIDATORS__:
+        sch = namespace_array(ns_key)
+        resolver = jsonschema.RefResolver.from_schema(JAMS_SCHEMA)
+        __VALIDATORS__[ns_key] = jsonschema.Draft4Validator(sch,
+                                                            resolver=resolver)
+
+    return __VALIDATORS__[ns_key]
+
+
+def column_validator(ns_key):
+    '''Get a vectorized validator for the observations of a namespace.
+
+    The namespace schema is compiled into checks which operate on entire
+    columns (`time`, `duration`, `value`, `confidence`) at once.
+    Only simple schemas are supported: `type`, numeric bounds, string
+    `enum`, and their combinations under `oneOf`, `anyOf`, and `allOf`.
+
+    Column validators never report errors themselves: they only
+    certify that data is valid.  If a column validator rejects the data,
+    `namespace_validator` should be used to produce the error.
+
+    Parameters
+    ----------
+    ns_key : str
+        Namespace key identifier
+
+    Returns
+    -------
+    validator : ColumnValidator or None
+        A validator for columns of `ns_key`, or `None` if the namespace
+        schema cannot be vectorized.
+
+    Raises
+    ------
+    NamespaceError
+        If `ns_key` is not found
+
+    Examples
+    --------
+    >>> validator = jams.schema.column_validator('tempo')
+    >>> validator.is_valid([0.0], [10.0], [120.0], [0.5])
+    True
+    >>> validator.is_valid([0.0], [10.0], [-120.0], [0.5])
+    False
+    >>> jams.schema.column_validator('chord') is None
+    True
+    '''
+
+    if ns_key not in __COLUMN_VALIDATORS__:
+        __COLUMN_VALIDATORS__[ns_key] = ColumnValidator.compile(
+            namespace(ns_key))
+
+    return __COLUMN_VALIDATORS__[ns_key]
+
+
+class ColumnValidator(object):
+    '''Vectorized validator for columns of observations.
+
+    See Also
+    --------
+    column_validator
+    '''
+
+    FIELDS = ('time', 'duration', 'value', 'confidence')
+
+    def __init__(self, checks):
+        self.checks = checks
+
+    @classmethod
+    def compile(cls, obs_schema):
+        '''Compile an observation schema.
+
+        Parameters
+        ----------
+        obs_schema : dict
+            JSON schema for a single observation, as produced by `namespace`
+
+        Returns
+        -------
+        validator : ColumnValidator or None
+            The compiled validator, or `None` if the schema is not supported
+        '''
+        if set(obs_schema) - _OBSERVATION_KEYS:
+            return None
+
+        if obs_schema.get('type', 'object') != 'object':
+            return None
+
+        props = obs_schema.get('properties', {})
+        if set(props) - set(cls.FIELDS):
+            return None
+
+        checks = []
+        for field in cls.FIELDS:
+            check = _compile_check(props.get(field, {}))
+            if check is None:
+                return None
+            checks.append(check)
+
+        return cls(checks)
+
+    def is_valid(self, time, duration, value, confidence):
+        '''Test whether columns of observations are valid.
+
+        Parameters
+        ----------
+        time, duration, value, confidence : iterable
+            Columns of observation fields, all of the same length
+
+        Returns
+        -------
+        valid : bool
+            `True` if every observation conforms to the schema.
+            `False` if any observation may not conform.
+        '''
+        for check, values in zip(self.checks,
+                                 [time, duration, value, confidence]):
+            if not np.all(check(_Column(values))):
+                return False
+        return True
+
+    def __repr__(self):
+        return '<{:s}>'.format(self.__class__.__name__)
+
+
+# Schema keys which do not affect validation
+_ANNOTATION_KEYS = frozenset(['title', 'description', 'default',
+                              'examples', '$comment'])
+
+_OBSERVATION_KEYS = _ANNOTATION_KEYS | frozenset(['type', 'properties',
+                                                  'required'])
+
+_BOUND_KEYS = frozenset(['minimum', 'maximum',
+                         'exclusiveMinimum', 'exclusiveMaximum'])
+
+# JSON types, and the value kinds which satisfy them
+_KINDS = dict(number=frozenset(['integer', 'number']),
+              integer=frozenset(['integer']),
+              boolean=frozenset(['boolean']),
+              string=frozenset(['string']),
+              null=frozenset(['null']))
+
+_ALL_KINDS = frozenset(['integer', 'number', 'boolean', 'string',
+                        'null', 'other'])
+
+_NUMERIC_KINDS = _KINDS['number']
+
+# Value kinds of typed numpy columns
+_DTYPE_KINDS = dict(f='number', i='integer', u='integer', b='boolean')
+
+
+def _value_kind(vtype):
+    '''Classify a python type by the JSON type of its serialization'''
+    if vtype is type(None):
+        return 'null'
+    elif issubclass(vtype, bool):
+        return 'boolean'
+    elif issubclass(vtype, six.integer_types + (np.integer,)):
+        return 'integer'
+    elif issubclass(vtype, (float, np.floating)):
+        return 'number'
+    elif issubclass(vtype, six.string_types):
+        return 'string'
+    return 'other'
+
+
+class _Column(object):
+    '''A column of observation values, with cached type information'''
+
+    def __init__(self, values):
+        if isinstance(values, np.ndarray) and \
+                values.dtype.kind in _DTYPE_KINDS:
+            self.typed = True
+            self.kind_of = dict()
+            self.kinds = frozenset([_DTYPE_KINDS[values.dtype.kind]])
+        else:
+            if not isinstance(values, (list, tuple, np.ndarray)):
+                values = list(values)
+            self.typed = False
+            self.kind_of = {t: _value_kind(t) for t in set(map(type, values))}
+            self.kinds = frozenset(self.kind_of.values())
+        self.values = values
+        self._numeric = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def kind_mask(self, accepted):
+        '''Boolean mask of values whose kind is in `accepted`'''
+        if self.kinds <= accepted:
+            return np.ones(len(self), dtype=bool)
+        elif not self.kinds & accepted:
+            return np.zeros(len(self), dtype=bool)
+
+        return np.fromiter((self.kind_of[type(v)] in accepted
+                            for v in self.values),
+                           dtype=bool, count=len(self))
+
+    def numeric(self):
+        '''Values as floats, with NaN in place of non-numeric values'''
+        if self._numeric is None:
+            if self.typed:
+                self._numeric = self.values.astype(np.float64, copy=False)
+            elif self.kinds <= _NUMERIC_KINDS:
+                self._numeric = np.asarray(self.values, dtype=np.float64)
+            else:
+                self._numeric = np.fromiter(
+                    (float(v) if self.kind_of[type(v)] in _NUMERIC_KINDS
+                     else np.nan for v in self.values),
+                    dtype=np.float64, count=len(self))
+        return self._numeric
+
+
+def _compile_check(spec):
+    '''Compile a field schema into a function mapping a `_Column` to
+    a boolean mask of valid entries.
+
+    Returns `None` if the schema is not supported.
+    '''
+    if not isinstance(spec, dict):
+        return None
+
+    keys = set(spec) - _ANNOTATION_KEYS
+
+    if not keys:
+        return lambda col: np.ones(len(col), dtype=bool)
+
+    if keys <= {'type'} | _BOUND_KEYS:
+        return _compile_type(spec)
+
+    if keys == {'enum'}:
+        return _compile_enum(spec['enum'])
+
+    for key, combine in [('oneOf', lambda n: n == 1),
+                         ('anyOf', lambda n: n >= 1)]:
+        if keys == {key}:
+            subchecks = [_compile_check(_) for _ in spec[key]]
+            if not subchecks or None in subchecks:
+                return None
+            return _combine(subchecks, combine)
+
+    if keys == {'allOf'}:
+        subchecks = [_compile_check(_) for _ in spec['allOf']]
+        if not subchecks or None in subchecks:
+            return None
+        return _combine(subchecks, lambda n: n == len(subchecks))
+
+    return None
+
+
+def _combine(subchecks, combine):
+    '''Combine the masks of several checks by counting matches'''
+    def check(col):
+        return combine(sum(sub(col).astype(np.int_) for sub in subchecks))
+    return check
+
+
+def _compile_type(spec):
+    '''Compile a `type` and numeric bounds check'''
+    json_type = spec.get('type', None)
+
+    if json_type is None:
+        accepted = _ALL_KINDS
+    else:
+        if isinstance(json_type, six.string_types):
+            json_type = [json_type]
+        if not all(_ in _KINDS for _ in json_type):
+            return None
+        accepted = frozenset().union(*[_KINDS[_] for _ in json_type])
+
+    bounds = []
+    for key, exclusive, lower in [('minimum', 'exclusiveMinimum', True),
+                                  ('maximum', 'exclusiveMaximum', False)]:
+        if key in spec:
+            bounds.append((spec[key], bool(spec.get(exclusive, False)),
+                           lower))
+
+    def check(col):
+        mask = col.kind_mask(accepted)
+
+        # Bounds apply only to numbers.  NaN passes, as it compares false.
+        if bounds and accepted & _NUMERIC_KINDS:
+            values = col.numeric()
+            for limit, exclusive, lower in bounds:
+                if lower:
+                    bad = (values <= limit) if exclusive else (values < limit)
+                else:
+                    bad = (values >= limit) if exclusive else (values > limit)
+                mask &= ~bad
+        return mask
+
+    return check
+
+
+def _compile_enum(members):
+    '''Compile an `enum` check.  Only string members are supported.'''
+    if not all(isinstance(_, six.string_types) for _ in members):
+        return None
+
+    members = frozenset(members)
+
+    def check(col):
+        mask = col.kind_mask(_KINDS['string'])
+        if not np.any(mask):
+            return mask
+        return np.fromiter((ok and v in members
+                            for ok, v in zip(mask, col.values)),
+                           dtype=bool, count=len(col))
+
+    return check
+
+
 def is_dense(ns_key):
     '''Determine whether a namespace has dense formatting.
 
@@ -8,18 +8,43 @@ Sonification
     :toctree: generated/
 
     sonify
+    stream
+    write_wav
+    batch
+
+Kernel cache
+------------
+
+.. autosummary::
+    :toctree: generated/
+
+    cache_info
+    cache_clear
 '''
 
+import contextlib
+import multiprocessing
+import os
+import threading
+import wave
 from itertools import product
-from collections import OrderedDict, defaultdict
+from collections import Counter, OrderedDict, namedtuple
 import six
 import numpy as np
-import mir_eval.sonify
-from mir_eval.util import filter_kwargs
+from concurrent import futures
+import mir_eval.chord
+from .core import trusted, _IntervalIndex
+from .corpus import (find_corpus, _call, _check_picklable, _keep, _submit,
+                     _load_file)
 from .eval import coerce_annotation, hierarchy_flatten
-from .exceptions import NamespaceError
+from .exceptions import NamespaceError, ParameterError
+from .util import filebase
+
+__all__ = ['sonify', 'stream', 'write_wav', 'batch',
+           'cache_info', 'cache_clear']
 
-__all__ = ['sonify']
+# The maximum number of samples synthesized in one vectorized block
+BLOCK_SIZE = 2**18
 
 
 def mkclick(freq, sr=22050, duration=0.1):
@@ -36,52 +61,520 @@ def mkclick(freq, sr=22050, duration=0.1):
     return click
 
 
-def clicks(annotation, sr=22050, length=None, **kwargs):
-    '''Sonify events with clicks.
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _KernelCache(object):
+    '''A bounded, least-recently-used cache of synthesis kernels.
 
-    This uses mir_eval.sonify.clicks, and is appropriate for instantaneous
-    events such as beats or segment boundaries.
+    Cached arrays are read-only, so they may be shared between callers
+    (and threads).
+
+    Parameters
+    ----------
+    maxsize : int > 0
+        The maximum number of cached kernels
     '''
 
-    interval, _ = annotation.to_interval_values()
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
 
-    return filter_kwargs(mir_eval.sonify.clicks, interval[:, 0],
-                         fs=sr, length=length, **kwargs)
+    def get(self, key, factory):
+        '''Get a kernel, constructing it by `factory()` if not cached'''
+        with self.__lock:
+            if key in self.__items:
+                self.hits += 1
+                # Mark as most recently used
+                kernel = self.__items.pop(key)
+                self.__items[key] = kernel
+                return kernel
+            self.misses += 1
 
+        kernel = factory()
+        kernel.setflags(write=False)
 
-def downbeat(annotation, sr=22050, length=None, **kwargs):
-    '''Sonify beats and downbeats together.
+        with self.__lock:
+            self.__items[key] = kernel
+            while len(self.__items) > self.maxsize:
+                self.__items.popitem(last=False)
+
+        return kernel
+
+    def info(self):
+        '''Get the cache statistics'''
+        with self.__lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self.__items))
+
+    def clear(self):
+        '''Empty the cache, and reset its statistics'''
+        with self.__lock:
+            self.__items.clear()
+            self.hits = self.misses = 0
+
+
+# Cache of synthesis kernels, keyed by their parameters
+__KERNELS__ = _KernelCache(maxsize=256)
+
+
+def cache_info():
+    '''Get statistics of the sonification kernel cache.
+
+    Click waveforms and chord templates are cached, so that they are
+    synthesized once for all annotations sonified at the same
+    sampling rate.
+
+    Returns
+    -------
+    info : CacheInfo
+        A named tuple of `(hits, misses, maxsize, currsize)`
+
+    See Also
+    --------
+    cache_clear
+
+    Examples
+    --------
+    >>> for ann in beat_annotations:
+    ...     y = jams.sonify.sonify(ann, sr=22050)
+    >>> info = jams.sonify.cache_info()
+    >>> info.hits / float(info.hits + info.misses)
+    0.999
     '''
+    return __KERNELS__.info()
 
-    beat_click = mkclick(440 * 2, sr=sr)
-    downbeat_click = mkclick(440 * 3, sr=sr)
 
-    intervals, values = annotation.to_interval_values()
+def cache_clear():
+    '''Empty the sonification kernel cache, and reset its statistics.
 
-    beats, downbeats = [], []
+    See Also
+    --------
+    cache_info
+    '''
+    __KERNELS__.clear()
 
-    for time, value in zip(intervals[:, 0], values):
-        if value['position'] == 1:
-            downbeats.append(time)
-        else:
-            beats.append(time)
 
-    if length is None:
-        length = int(sr * np.max(intervals)) + len(beat_click) + 1
+def _click(freq, sr, duration=0.1, dtype=np.float64):
+    '''Get a cached click kernel (see `mkclick`)'''
+    return __KERNELS__.get(
+        ('click', float(freq), sr, duration, np.dtype(dtype).str),
+        lambda: mkclick(freq, sr=sr, duration=duration).astype(dtype))
 
-    y = filter_kwargs(mir_eval.sonify.clicks,
-                      np.asarray(beats),
-                      fs=sr, length=length, click=beat_click)
 
-    y += filter_kwargs(mir_eval.sonify.clicks,
-                       np.asarray(downbeats),
-                       fs=sr, length=length, click=downbeat_click)
+def _chord_template(label):
+    '''Get the (cached) Shepard tone template of a chord label.
 
-    return y
+    Each pitch class of the chord is repeated over 7 octaves from C1,
+    and weighted by a normal distribution centered an octave above
+    middle C, as in mir_eval.sonify.chroma.
+    Notes of negligible weight are discarded.
 
+    Returns
+    -------
+    notes : np.ndarray [shape=(n,), dtype=int]
+        The MIDI note numbers of the template
+    '''
+
+    def __template():
+        root, bitmap, _ = mir_eval.chord.encode(label)
+        chroma = np.roll(bitmap, root)
+
+        notes = np.arange(12 * 7) + 24
+        keep = np.tile(chroma, 7).astype(bool)
+        keep &= _shepard_weight(notes) >= 0.01
+        return notes[keep]
+
+    return __KERNELS__.get(('chord', label), __template)
+
+
+def _shepard_weight(notes):
+    '''The Shepard tone weight of MIDI notes'''
+    return np.exp(-(notes - 72)**2 / (2.0 * 6**2))
+
+
+def _max(values):
+    '''The maximum of an array, or 0 if it is empty'''
+    return np.max(values) if np.size(values) else 0
+
+
+class _Synthesizer(object):
+    '''Base class for synthesizers, which render a sonification
+    one window of samples at a time.
+
+    Parameters
+    ----------
+    sr : number > 0
+        The sampling rate
+
+    length : int
+        The default length of the output, in samples
+    '''
+
+    def __init__(self, sr, length):
+        self.sr = sr
+        self.length = length
+
+    def render(self, start=0, end=None, dtype=np.float64):
+        '''Render the samples in `[start, end)`.
+
+        Parameters
+        ----------
+        start, end : int
+            The range of samples to render.
+            By default, `end` is the default length of the output.
+
+        dtype : np.dtype
+            The data type of the output
+
+        Returns
+        -------
+        y : np.ndarray [shape=(end - start,)]
+        '''
+        if end is None:
+            end = self.length
+
+        y = np.zeros(max(end - start, 0), dtype=dtype)
+        if len(y):
+            self._render(y, start)
+        return y
+
+    def _render(self, y, start):
+        '''Add the samples in `[start, start + len(y))` to `y`'''
+        raise NotImplementedError
+
+
+class _Kernels(_Synthesizer):
+    '''Synthesize copies of kernels (e.g., clicks) at event times.
+
+    Overlapping events are mixed together.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        The time (in seconds) of each event
+
+    kernels : list of np.ndarray
+        The waveforms to render
+
+    sr : number > 0
+        The sampling rate
+
+    length : int
+        The default length of the output
+
+    which : np.ndarray of int, optional
+        The index of the kernel of each event.
+        By default, all events use the first kernel.
+    '''
+
+    def __init__(self, times, kernels, sr, length, which=None):
+        super(_Kernels, self).__init__(sr, length)
+
+        self.width = max(len(kernel) for kernel in kernels)
+        self.table = np.zeros((len(kernels), self.width))
+        for i, kernel in enumerate(kernels):
+            self.table[i, :len(kernel)] = kernel
+
+        starts = (np.asarray(times, dtype=np.float64) * sr).astype(np.int64)
+        if which is None:
+            which = np.zeros(len(starts), dtype=np.int64)
+
+        order = np.argsort(starts, kind='mergesort')
+        self.starts = starts[order]
+        self.which = np.asarray(which, dtype=np.int64)[order]
+        self.index = _IntervalIndex(self.starts,
+                                    np.full(len(starts), self.width))
+
+    def _render(self, y, start):
+        selection = self.index.query(start, start + len(y))
+
+        starts = self.starts[selection] - start
+        which = self.which[selection]
+
+        # Events which lie entirely within the window are rendered in place;
+        # the (few) others are masked to the window
+        inside = (starts >= 0) & (starts + self.width <= len(y))
+
+        offsets = np.arange(self.width)
+        step = max(1, BLOCK_SIZE // self.width)
+
+        for clip in [False, True]:
+            mask = inside ^ clip
+            events, kernels = starts[mask], which[mask]
+
+            for i in six.moves.range(0, len(events), step):
+                positions = (events[i:i + step, np.newaxis] + offsets).ravel()
+                values = self.table[kernels[i:i + step]].ravel()
+
+                if clip:
+                    keep = (positions >= 0) & (positions < len(y))
+                    positions, values = positions[keep], values[keep]
+
+                np.add.at(y, positions, values)
+
+
+class _Tones(_Synthesizer):
+    '''Synthesize sinusoidal tones.
+
+    Tones are synthesized in phase with absolute time, so that
+    consecutive tones of equal frequency join smoothly,
+    and are faded in and out over two periods.
+
+    The output is scaled by the maximum total gain of simultaneous
+    tones, so that it does not exceed unit amplitude.
+
+    Parameters
+    ----------
+    intervals : np.ndarray [shape=(n, 2)]
+        The start and end time (in seconds) of each tone
+
+    freqs : np.ndarray
+        The frequency (in Hz) of each tone
+
+    sr : number > 0
+        The sampling rate
+
+    length : int
+        The default length of the output
+
+    gains : np.ndarray, optional
+        The amplitude of each tone
+    '''
+
+    def __init__(self, intervals, freqs, sr, length, gains=None):
+        super(_Tones, self).__init__(sr, length)
+
+        intervals = np.asarray(intervals, dtype=np.float64).reshape(-1, 2)
+        starts = np.maximum(intervals[:, 0] * sr, 0).astype(np.int64)
+        ends = np.maximum(intervals[:, 1] * sr, 0).astype(np.int64)
+        freqs = np.asarray(freqs, dtype=np.float64)
+
+        if gains is None:
+            gains = np.ones(len(freqs))
+        gains = np.asarray(gains, dtype=np.float64)
+
+        keep = (ends > starts) & (freqs > 0) & (gains > 0)
+        order = np.argsort(starts[keep], kind='mergesort')
+
+        self.starts = starts[keep][order]
+        self.ends = ends[keep][order]
+        self.freqs = freqs[keep][order]
+        self.gains = gains[keep][order]
+        self.ramps = np.maximum(1.0, 2 * sr / self.freqs)
+        self.index = _IntervalIndex(self.starts, self.ends - self.starts)
+
+        # Find the peak total gain, with tones ending before others start
+        edges = np.concatenate([self.starts, self.ends])
+        deltas = np.concatenate([self.gains, -self.gains])
+        peak = _max(np.cumsum(deltas[np.lexsort((deltas, edges))]))
+        self.scale = 1.0 / peak if peak > 0 else 1.0
+
+    def _render(self, y, start):
+        end = start + len(y)
+        tone = self.index.query(start, end)
+
+        if not len(tone):
+            return
+
+        # Split tones at the window, and into pieces of at most
+        # BLOCK_SIZE samples
+        lo = np.maximum(self.starts[tone], start)
+        hi = np.minimum(self.ends[tone], end)
+
+        n_pieces = -(-(hi - lo) // BLOCK_SIZE)
+        first = np.repeat(np.cumsum(n_pieces) - n_pieces, n_pieces)
+        tone_lo = np.repeat(lo, n_pieces)
+        tone = np.repeat(tone, n_pieces)
+
+        piece_start = tone_lo + (np.arange(len(tone)) - first) * BLOCK_SIZE
+        piece_end = np.minimum(piece_start + BLOCK_SIZE,
+                               np.minimum(self.ends[tone], end))
+
+        # Group pieces into blocks of roughly BLOCK_SIZE samples
+        counts = piece_end - piece_start
+        offset = np.cumsum(counts) - counts
+        edges = np.flatnonzero(np.diff(offset // BLOCK_SIZE)) + 1
+
+        for block in np.split(np.arange(len(tone)), edges):
+            n = counts[block]
+            idx = np.repeat(tone[block], n)
+            local = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+            positions = np.repeat(piece_start[block], n) + local
+
+            # Distance (in samples) to either end of the tone
+            edge = np.minimum(positions - self.starts[idx] + 1,
+                              self.ends[idx] - positions)
+            envelope = (self.scale * self.gains[idx] *
+                        np.minimum(1.0, edge / self.ramps[idx]))
+
+            values = envelope * np.sin(2 * np.pi * self.freqs[idx] *
+                                       positions / self.sr)
+            np.add.at(y, positions - start, values)
 
-def multi_segment(annotation, sr=22050, length=None, **kwargs):
-    '''Sonify multi-level segmentations'''
+
+class _Contours(_Synthesizer):
+    '''Synthesize pitch contours.
+
+    As in mir_eval.sonify.pitch_contour, the frequency of each contour
+    is linearly interpolated between observations, and unvoiced
+    observations interpolate toward silence.
+
+    Phase is accumulated from the start of each contour, so windows
+    are most efficiently rendered in order.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        The time (in seconds) of each observation
+
+    index : np.ndarray of int
+        The contour of each observation
+
+    freqs : np.ndarray
+        The frequency of each observation.
+        Non-positive frequencies are unvoiced.
+
+    sr : number > 0
+        The sampling rate
+
+    length : int
+        The default length of the output
+    '''
+
+    def __init__(self, time, index, freqs, sr, length):
+        super(_Contours, self).__init__(sr, length)
+
+        time = np.asarray(time, dtype=np.float64)
+        freqs = np.nan_to_num(np.maximum(freqs, 0.0))
+
+        # Sort observations by contour, then by time
+        order = np.lexsort((time, index))
+        time, index, freqs = time[order], index[order], freqs[order]
+
+        # Each contour spans the samples between its first
+        # and last observation
+        breaks = np.flatnonzero(np.diff(index)) + 1
+        first = np.concatenate([[0], breaks]).astype(np.int64)
+        last = np.concatenate([breaks, [len(time)]]).astype(np.int64) - 1
+
+        span_start = np.maximum(np.ceil(time[first] * sr), 0)
+        span_end = np.maximum(np.floor(time[last] * sr) + 1, span_start)
+
+        # Interpolate all contours in one pass by laying them end to end:
+        # each contour (its samples and its observations) is shifted
+        # to follow the previous one
+        lo_edge = np.floor(np.minimum(span_start, time[first] * sr))
+        hi_edge = np.ceil(np.maximum(span_end, time[last] * sr))
+        extent = hi_edge - lo_edge + 1
+        self.shift = np.cumsum(extent) - extent - lo_edge
+
+        contour = np.repeat(np.arange(len(first)), last - first + 1)
+        self.grid = time * sr + self.shift[contour]
+        self.omega = 2 * np.pi * freqs / sr
+
+        self.span_start = span_start.astype(np.int64)
+        self.span_end = span_end.astype(np.int64)
+
+        self.order = np.argsort(self.span_start, kind='mergesort')
+        self.index = _IntervalIndex(self.span_start[self.order],
+                                    (self.span_end - self.span_start
+                                     )[self.order])
+
+        # The next sample of each contour, and its accumulated phase
+        self.cursor = self.span_start.copy()
+        self.phase = np.zeros(len(first))
+
+    def _render(self, y, start):
+        end = start + len(y)
+
+        active = self.order[self.index.query(start, end)]
+        active = active[self.span_end[active] > self.span_start[active]]
+
+        # Contours rendered past the start of the window start over
+        reset = active[self.cursor[active] > start]
+        self.cursor[reset] = self.span_start[reset]
+        self.phase[reset] = 0.0
+
+        # Synthesize each contour from its cursor to the end of the window
+        seg_start = self.cursor[active]
+        seg_end = np.minimum(self.span_end[active], end)
+        counts = seg_end - seg_start
+        offsets = np.cumsum(counts) - counts
+        total = counts.sum()
+
+        initial = self.phase[active]
+        base = np.zeros(len(active))
+        final = initial.copy()
+        carry = 0.0
+
+        for lo in six.moves.range(0, total, BLOCK_SIZE):
+            hi = min(lo + BLOCK_SIZE, total)
+            work = np.arange(lo, hi)
+
+            owner = np.searchsorted(offsets, work, side='right') - 1
+            positions = work - offsets[owner] + seg_start[owner]
+
+            omega = np.interp(positions + self.shift[active[owner]],
+                              self.grid, self.omega)
+
+            accum = carry + np.cumsum(omega)
+            previous = np.concatenate([[carry], accum[:-1]])
+            carry = accum[-1]
+
+            # Segments which begin in this block
+            new = np.flatnonzero((offsets >= lo) & (offsets < hi) &
+                                 (counts > 0))
+            base[new] = previous[offsets[new] - lo]
+
+            phase = accum - base[owner] + initial[owner]
+
+            # Segments which end in this block
+            stop = offsets + counts - 1
+            done = np.flatnonzero((stop >= lo) & (stop < hi) & (counts > 0))
+            final[done] = phase[stop[done] - lo]
+
+            write = positions >= start
+            values = np.where(omega > 0, np.sin(phase), 0.0)
+            np.add.at(y, positions[write] - start, values[write])
+
+        self.cursor[active] = seg_end
+        self.phase[active] = final
+
+
+def _clicks(annotation, sr, click=None, **kwargs):
+    '''Construct a synthesizer for `clicks`'''
+    times, _ = annotation.to_event_values()
+
+    if click is None:
+        click = _click(1000, sr)
+
+    length = int(sr * _max(times)) + len(click) + 1
+
+    return _Kernels(times, [click], sr, length)
+
+
+def _downbeat(annotation, sr, **kwargs):
+    '''Construct a synthesizer for `downbeat`'''
+    beat_click = _click(440 * 2, sr)
+    downbeat_click = _click(440 * 3, sr)
+
+    intervals, values = annotation.to_interval_values()
+
+    is_downbeat = np.fromiter((value['position'] == 1 for value in values),
+                              dtype=np.int64, count=len(values))
+
+    length = int(sr * _max(intervals)) + len(beat_click) + 1
+
+    return _Kernels(intervals[:, 0], [beat_click, downbeat_click], sr,
+                    length, which=is_downbeat)
+
+
+def _multi_segment(annotation, sr, **kwargs):
+    '''Construct a synthesizer for `multi_segment`'''
 
     # Pentatonic scale, because why not
     PENT = [1, 32./27, 4./3, 3./2, 16./9]
@@ -89,88 +582,165 @@ def multi_segment(annotation, sr=22050, length=None, **kwargs):
 
     h_int, _ = hierarchy_flatten(annotation)
 
-    if length is None:
-        length = int(sr * (max(np.max(_) for _ in h_int) + 1. / DURATION) + 1)
+    length = int(sr * (max(np.max(_) for _ in h_int) + 1. / DURATION) + 1)
 
-    y = 0.0
-    for ints, (oc, scale) in zip(h_int, product(range(3, 3 + len(h_int)),
-                                                PENT)):
-        click = mkclick(440.0 * scale * oc, sr=sr, duration=DURATION)
-        y = y + filter_kwargs(mir_eval.sonify.clicks,
-                              np.unique(ints),
-                              fs=sr, length=length,
-                              click=click)
-    return y
+    # Render the boundaries of all levels together,
+    # with one click per level
+    kernels, times, which = [], [], []
+    for level, (ints, (oc, scale)) in enumerate(
+            zip(h_int, product(range(3, 3 + len(h_int)), PENT))):
+        kernels.append(_click(440.0 * scale * oc, sr, duration=DURATION))
+        boundaries = np.unique(ints)
+        times.append(boundaries)
+        which.append(np.full(len(boundaries), level, dtype=np.int64))
 
+    return _Kernels(np.concatenate(times), kernels, sr, length,
+                    which=np.concatenate(which))
 
-def chord(annotation, sr=22050, length=None, **kwargs):
-    '''Sonify chords
 
-    This uses mir_eval.sonify.chords.
-    '''
+def _chord(annotation, sr, **kwargs):
+    '''Construct a synthesizer for `chord`'''
 
     intervals, chords = annotation.to_interval_values()
 
-    return filter_kwargs(mir_eval.sonify.chords,
-                         chords, intervals,
-                         fs=sr, length=length,
-                         **kwargs)
+    # Each chord is synthesized from the Shepard tones of its template
+    templates = [_chord_template(label) for label in chords]
+    sizes = np.array([len(notes) for notes in templates], dtype=np.int64)
 
+    notes = np.concatenate(templates) if templates else np.empty(0, int)
+    intervals, notes = _merge_tones(np.repeat(intervals, sizes, axis=0),
+                                    notes, sr)
 
-def pitch_contour(annotation, sr=22050, length=None, **kwargs):
-    '''Sonify pitch contours.
+    length = int(sr * _max(intervals))
+
+    return _Tones(intervals, 440.0 * 2.0**((notes - 69) / 12.0), sr,
+                  length, gains=_shepard_weight(notes))
 
-    This uses mir_eval.sonify.pitch_contour, and should only be applied
-    to pitch annotations using the pitch_contour namespace.
 
-    Each contour is sonified independently, and the resulting waveforms
-    are summed together.
+def _merge_tones(intervals, notes, sr):
+    '''Merge consecutive intervals of the same note,
+    so that sustained notes are not re-articulated.
+
+    Returns
+    -------
+    intervals : np.ndarray [shape=(m, 2)]
+    notes : np.ndarray [shape=(m,)]
     '''
+    if not len(notes):
+        return intervals.reshape(-1, 2), notes
 
-    # Map contours to lists of observations
+    order = np.lexsort((intervals[:, 0], notes))
+    intervals, notes = intervals[order], notes[order]
 
-    times = defaultdict(list)
-    freqs = defaultdict(list)
+    samples = (intervals * sr).astype(np.int64)
+    joined = ((notes[1:] == notes[:-1]) &
+              (samples[1:, 0] <= samples[:-1, 1]))
+    first = np.flatnonzero(np.concatenate([[True], ~joined]))
 
-    for obs in annotation:
-        times[obs.value['index']].append(obs.time)
-        freqs[obs.value['index']].append(obs.value['frequency'] *
-                                         (-1)**(~obs.value['voiced']))
+    merged = np.column_stack([intervals[first, 0],
+                              np.maximum.reduceat(intervals[:, 1], first)])
 
-    y_out = 0.0
-    for ix in times:
-        y_out = y_out + filter_kwargs(mir_eval.sonify.pitch_contour,
-                                      np.asarray(times[ix]),
-                                      np.asarray(freqs[ix]),
-                                      fs=sr, length=length,
-                                      **kwargs)
-        if length is None:
-            length = len(y_out)
+    return merged, notes[first]
 
-    return y_out
 
+def _pitch_contour(annotation, sr, **kwargs):
+    '''Construct a synthesizer for `pitch_contour`'''
 
-def piano_roll(annotation, sr=22050, length=None, **kwargs):
-    '''Sonify a piano-roll
+    time, _, values, _ = annotation._export_columns()
 
-    This uses mir_eval.sonify.time_frequency, and is appropriate
-    for sparse transcription data, e.g., annotations in the `note_midi`
-    namespace.
-    '''
+    index = np.fromiter((value['index'] for value in values),
+                        dtype=np.int64, count=len(values))
+    freqs = np.fromiter((value['frequency'] if value['voiced'] else 0.0
+                         for value in values),
+                        dtype=np.float64, count=len(values))
+
+    length = int(sr * _max(time))
+
+    return _Contours(time, index, freqs, sr, length)
+
+
+def _piano_roll(annotation, sr, **kwargs):
+    '''Construct a synthesizer for `piano_roll`'''
 
     intervals, pitches = annotation.to_interval_values()
 
-    # Construct the pitchogram
-    pitch_map = {f: idx for idx, f in enumerate(np.unique(pitches))}
+    length = int(sr * _max(intervals))
+
+    return _Tones(intervals, pitches, sr, length)
+
 
-    gram = np.zeros((len(pitch_map), len(intervals)))
+def clicks(annotation, sr=22050, length=None, dtype=np.float64, **kwargs):
+    '''Sonify events with clicks.
+
+    This is appropriate for instantaneous events such as beats or segment
+    boundaries.  Unless a `click` waveform is provided, a 1 kHz click
+    (as in mir_eval.sonify.clicks) is used.
+    Overlapping clicks are mixed together.
+    '''
+
+    return _clicks(annotation, sr, **kwargs).render(0, length, dtype)
 
-    for col, f in enumerate(pitches):
-        gram[pitch_map[f], col] = 1
 
-    return filter_kwargs(mir_eval.sonify.time_frequency,
-                         gram, pitches, intervals,
-                         sr, length=length, **kwargs)
+def downbeat(annotation, sr=22050, length=None, dtype=np.float64, **kwargs):
+    '''Sonify beats and downbeats together.
+    '''
+
+    return _downbeat(annotation, sr, **kwargs).render(0, length, dtype)
+
+
+def multi_segment(annotation, sr=22050, length=None, dtype=np.float64,
+                  **kwargs):
+    '''Sonify multi-level segmentations'''
+
+    return _multi_segment(annotation, sr, **kwargs).render(0, length, dtype)
+
+
+def chord(annotation, sr=22050, length=None, dtype=np.float64, **kwargs):
+    '''Sonify chords
+
+    Each chord is synthesized as a chord of Shepard tones,
+    as in mir_eval.sonify.chords.
+    '''
+
+    return _chord(annotation, sr, **kwargs).render(0, length, dtype)
+
+
+def pitch_contour(annotation, sr=22050, length=None, dtype=np.float64,
+                  **kwargs):
+    '''Sonify pitch contours.
+
+    This should only be applied to pitch annotations using the
+    pitch_contour namespace.
+
+    As in mir_eval.sonify.pitch_contour, the frequency of each contour
+    is linearly interpolated between observations, and unvoiced
+    observations interpolate toward silence.
+    All contours are synthesized together, and mixed into a single output.
+    '''
+
+    return _pitch_contour(annotation, sr, **kwargs).render(0, length, dtype)
+
+
+def piano_roll(annotation, sr=22050, length=None, dtype=np.float64,
+               **kwargs):
+    '''Sonify a piano-roll
+
+    Each note is synthesized as a sinusoid, and the output is scaled
+    by the maximum number of simultaneous notes.
+    This is appropriate for sparse transcription data,
+    e.g., annotations in the `note_midi` namespace.
+    '''
+
+    return _piano_roll(annotation, sr, **kwargs).render(0, length, dtype)
+
+
+# Synthesizers of the built-in sonification functions, used for streaming
+__SYNTHESIZERS__ = {clicks: _clicks,
+                    downbeat: _downbeat,
+                    multi_segment: _multi_segment,
+                    chord: _chord,
+                    pitch_contour: _pitch_contour,
+                    piano_roll: _piano_roll}
 
 
 SONIFY_MAPPING = OrderedDict()
@@ -184,8 +754,55 @@ SONIFY_MAPPING['note_hz'] = piano_roll
 SONIFY_MAPPING['pitch_contour'] = pitch_contour
 
 
-def sonify(annotation, sr=22050, duration=None, **kwargs):
-    '''Sonify a jams annotation through mir_eval
+def _resolve(annotation):
+    '''Find the sonification function of an annotation.
+
+    Returns
+    -------
+    annotation : jams.Annotation
+        The annotation, coerced to the namespace of the function
+
+    func : callable
+        The sonification function, from `SONIFY_MAPPING`
+
+    Raises
+    ------
+    NamespaceError
+        If the annotation has an un-sonifiable namespace
+    '''
+
+    # If the annotation can be directly sonified, try that first
+    if annotation.namespace in SONIFY_MAPPING:
+        return (coerce_annotation(annotation, annotation.namespace),
+                SONIFY_MAPPING[annotation.namespace])
+
+    # Validate once, rather than once for each candidate conversion
+    annotation.validate(strict=True)
+
+    with trusted():
+        for namespace, func in six.iteritems(SONIFY_MAPPING):
+            try:
+                return coerce_annotation(annotation, namespace), func
+            except NamespaceError:
+                pass
+
+    raise NamespaceError('Unable to sonify annotation of namespace="{:s}"'
+                         .format(annotation.namespace))
+
+
+def _length(annotation, sr, duration):
+    '''The length of the output in samples, or `None` if unspecified'''
+    if duration is None:
+        duration = annotation.duration
+
+    if duration is not None:
+        return int(duration * sr)
+
+    return None
+
+
+def sonify(annotation, sr=22050, duration=None, dtype=np.float64, **kwargs):
+    '''Sonify a jams annotation
 
     Parameters
     ----------
@@ -198,8 +815,12 @@ def sonify(annotation, sr=22050, duration=None, **kwargs):
     duration : float (optional)
         Optional length (in seconds) of the output waveform
 
+    dtype : np.dtype
+        The data type of the output waveform, e.g., `np.float32`
+
     kwargs
-        Additional keyword arguments to mir_eval.sonify functions
+        Additional keyword arguments to the sonification function,
+        e.g., `click` for event namespaces
 
     Returns
     -------
@@ -210,30 +831,519 @@ def sonify(annotation, sr=22050, duration=None, **kwargs):
     ------
     NamespaceError
         If the annotation has an un-sonifiable namespace
+
+    See Also
+    --------
+    stream
     '''
 
-    length = None
+    ann, func = _resolve(annotation)
 
-    if duration is None:
-        duration = annotation.duration
+    return func(ann, sr=sr, length=_length(annotation, sr, duration),
+                dtype=dtype, **kwargs)
 
-    if duration is not None:
-        length = int(duration * sr)
 
-    # If the annotation can be directly sonified, try that first
-    if annotation.namespace in SONIFY_MAPPING:
-        ann = coerce_annotation(annotation, annotation.namespace)
-        return SONIFY_MAPPING[annotation.namespace](ann,
-                                                    sr=sr,
-                                                    length=length,
-                                                    **kwargs)
+def stream(annotation, sr=22050, duration=None, block_size=65536,
+           dtype=np.float64, **kwargs):
+    '''Sonify a jams annotation one block at a time.
+
+    Each block is synthesized only from the observations which overlap it,
+    so memory usage is bounded by the block size rather than the duration
+    of the annotation.
+    Concatenating the blocks reproduces the output of `sonify`.
+
+    Parameters
+    ----------
+    annotation : jams.Annotation
+        The annotation to sonify
+
+    sr : positive number
+        The sampling rate of the output waveform
+
+    duration : float (optional)
+        Optional length (in seconds) of the output waveform
+
+    block_size : int > 0
+        The number of samples in each block
+
+    dtype : np.dtype
+        The data type of the output waveform, e.g., `np.float32`
+
+    kwargs
+        Additional keyword arguments to the sonification function
+
+    Returns
+    -------
+    blocks : generator of np.ndarray
+        Consecutive blocks of `block_size` samples.
+        The last block may be shorter.
+
+    Raises
+    ------
+    NamespaceError
+        If the annotation has an un-sonifiable namespace
+
+    ParameterError
+        If `block_size` is not positive
+
+    See Also
+    --------
+    sonify
+    write_wav
+
+    Examples
+    --------
+    >>> for y_block in jams.sonify.stream(ann, sr=44100):
+    ...     player.write(y_block)
+    '''
+
+    if block_size < 1:
+        raise ParameterError('Invalid block_size: {}'.format(block_size))
+
+    return _blocks(annotation, sr, _length(annotation, sr, duration),
+                   block_size, dtype, **kwargs)
+
+
+def _blocks(annotation, sr, length, block_size, dtype=np.float64,
+            **kwargs):
+    '''Generate consecutive blocks of the sonification of an annotation.
+
+    See `stream` for details; here `length` is given in samples
+    (or `None`, for the natural length of the sonification).
+    '''
+
+    ann, func = _resolve(annotation)
+
+    build = __SYNTHESIZERS__.get(func)
+
+    if build is None:
+        # Sonification functions without a synthesizer are rendered in full
+        y = func(ann, sr=sr, length=length, dtype=dtype, **kwargs)
+        return (y[i:i + block_size]
+                for i in six.moves.range(0, len(y), block_size))
+
+    synth = build(ann, sr, **kwargs)
+    if length is None:
+        length = synth.length
+
+    return (synth.render(i, min(i + block_size, length), dtype=dtype)
+            for i in six.moves.range(0, length, block_size))
+
+
+def write_wav(path, annotation, sr=22050, duration=None, block_size=65536,
+              **kwargs):
+    '''Sonify a jams annotation directly to a WAV file.
+
+    The output is synthesized block by block (see `stream`), clipped to
+    `[-1, 1]`, and written as 16-bit PCM.
+
+    Parameters
+    ----------
+    path : str or file-like
+        The output file
+
+    annotation : jams.Annotation
+        The annotation to sonify
+
+    sr : positive integer
+        The sampling rate of the output
+
+    duration : float (optional)
+        Optional length (in seconds) of the output
+
+    block_size : int > 0
+        The number of samples to synthesize at a time
+
+    kwargs
+        Additional keyword arguments to the sonification function
+
+    Returns
+    -------
+    n_samples : int
+        The number of samples written
+
+    Examples
+    --------
+    >>> jams.sonify.write_wav('beats.wav', beat_ann, sr=44100)
+    '''
+
+    blocks = stream(annotation, sr=sr, duration=duration,
+                    block_size=block_size, dtype=np.float32, **kwargs)
+
+    n_samples = 0
+    with _audio_writer(path, sr) as write:
+        for y in blocks:
+            write(y)
+            n_samples += len(y)
+
+    return n_samples
+
+
+# Output formats supported by `batch`
+__FORMATS__ = ['wav', 'flac']
+
+# PCM sample widths readable from WAV files: (dtype, offset)
+__PCM__ = {1: ('u1', 128), 2: ('<i2', 0), 4: ('<i4', 0)}
+
+
+@contextlib.contextmanager
+def _audio_writer(path, sr, n_channels=1, fmt='wav'):
+    '''Open an audio file for writing as 16-bit PCM.
+
+    Yields a function which writes a block of samples, of shape `(n,)`
+    or `(n, n_channels)`, clipped to `[-1, 1]`.
+
+    WAV files are written by the standard library;
+    other formats require `soundfile` to be installed.
+    '''
+    if fmt == 'wav':
+        with contextlib.closing(wave.open(path, 'wb')) as out:
+            out.setnchannels(n_channels)
+            out.setsampwidth(2)
+            out.setframerate(int(sr))
+
+            def __write(y):
+                pcm = np.clip(y, -1, 1) * np.iinfo(np.int16).max
+                out.writeframes(pcm.astype('<i2').tobytes())
+
+            yield __write
+
+    else:
+        import soundfile
+
+        with soundfile.SoundFile(path, 'w', samplerate=int(sr),
+                                 channels=n_channels, format=fmt.upper(),
+                                 subtype='PCM_16') as out:
+            yield lambda y: out.write(np.clip(y, -1, 1))
 
-    for namespace, func in six.iteritems(SONIFY_MAPPING):
+
+@contextlib.contextmanager
+def _audio_reader(path):
+    '''Open an audio file for reading.
+
+    Yields `(sr, n_channels, n_frames, read)`, where `read(n)` returns
+    the next (at most) `n` frames as an array of shape `(n, n_channels)`.
+
+    PCM WAV files are read by the standard library;
+    other formats require `soundfile` to be installed.
+    '''
+    if os.path.splitext(path)[1].lower() == '.wav':
+        with contextlib.closing(wave.open(path, 'rb')) as src:
+            width = src.getsampwidth()
+            if width not in __PCM__:
+                raise ParameterError('Unsupported WAV sample width: '
+                                     '{}'.format(width))
+
+            dtype, offset = __PCM__[width]
+            scale = 2.0**(8 * width - 1)
+            n_channels = src.getnchannels()
+
+            def __read(n):
+                pcm = np.frombuffer(src.readframes(n), dtype=dtype)
+                return ((pcm - offset) / scale).reshape((-1, n_channels))
+
+            yield (src.getframerate(), n_channels, src.getnframes(),
+                   __read)
+
+    else:
+        import soundfile
+
+        with soundfile.SoundFile(path) as src:
+            yield (src.samplerate, src.channels, src.frames,
+                   lambda n: src.read(n, always_2d=True))
+
+
+def _sonify_file(path, options):
+    '''Sonify the selected annotations of a single file of a corpus.
+
+    See `batch` for a description of the options.
+
+    Returns
+    -------
+    outputs : list of str
+        The paths of the audio files written
+    '''
+
+    # Observations are only built for the selected annotations,
+    # and are validated when they are coerced for sonification
+    jam = _load_file(path, dict(namespace=options['namespace'], query=None,
+                                validate=False, strict=False, lazy=True,
+                                kwargs=dict()))
+
+    audio = None
+    if options['audio_dir'] is not None:
+        audio = os.path.join(options['audio_dir'],
+                             '{:s}.{:s}'.format(filebase(path),
+                                                options['audio_ext']))
+
+    counter = Counter()
+    outputs = []
+
+    for ann in jam.annotations:
+        index = counter[ann.namespace]
+        counter[ann.namespace] += 1
+
+        output = os.path.join(options['output_dir'],
+                              _output_name(filebase(path), ann.namespace,
+                                           index, options['fmt']))
+
+        if audio is None:
+            written = _write_annotation(output, ann,
+                                        jam.file_metadata.duration, options)
+        else:
+            written = _mix_annotation(output, ann, audio, options)
+
+        if written:
+            outputs.append(output)
+
+    return outputs
+
+
+def _write_annotation(output, ann, duration, options):
+    '''Sonify an annotation to an audio file.
+
+    Returns `False` if the annotation cannot be sonified.
+    '''
+    sr = options['sr']
+
+    try:
+        blocks = _blocks(ann, sr, _length(ann, sr, duration),
+                         options['block_size'], np.float32,
+                         **options['kwargs'])
+    except NamespaceError:
+        return False
+
+    with _audio_writer(output, sr, fmt=options['fmt']) as write:
+        for y in blocks:
+            write(y)
+
+    return True
+
+
+def _mix_annotation(output, ann, audio, options):
+    '''Sonify an annotation and mix it over its source audio.
+
+    The output has the sampling rate, length, and channels of the audio.
+
+    Returns `False` if the annotation cannot be sonified.
+    '''
+    mix = options['mix']
+
+    with _audio_reader(audio) as (sr, n_channels, n_frames, read):
         try:
-            ann = coerce_annotation(annotation, namespace)
-            return func(ann, sr=sr, length=length, **kwargs)
+            blocks = _blocks(ann, sr, n_frames, options['block_size'],
+                             np.float32, **options['kwargs'])
         except NamespaceError:
-            pass
+            return False
 
-    raise NamespaceError('Unable to sonify annotation of namespace="{:s}"'
-                         .format(annotation.namespace))
+        with _audio_writer(output, sr, n_channels=n_channels,
+                           fmt=options['fmt']) as write:
+            for y in blocks:
+                x = np.zeros((len(y), n_channels))
+                frames = read(len(y))
+                x[:len(frames)] = frames
+
+                write((1 - mix) * x + mix * y[:, np.newaxis])
+
+    return True
+
+
+def _output_name(output_prefix, namespace, index, fmt):
+    '''Get the output file name of a batch sonification.
+
+    Names follow `scripts/jams_to_lab.py`:
+    `{output_prefix}__{namespace}__{index:02d}.{fmt}`
+
+    Parameters
+    ----------
+    output_prefix : str
+        The prefix of the name, e.g., the base name of the JAMS file
+
+    namespace : str
+        The namespace of the annotation
+
+    index : int
+        The index of the annotation among those of its namespace
+
+    fmt : str
+        The audio format, used as the file extension
+
+    Returns
+    -------
+    name : str
+        The output file name
+    '''
+    return '{:s}__{:s}__{:02d}.{:s}'.format(output_prefix, namespace, index,
+                                            fmt)
+
+
+def batch(source, output_dir, namespace=None, sr=22050, fmt='wav',
+          audio_dir=None, audio_ext='wav', mix=0.5, block_size=65536,
+          n_jobs=None, pool='process', ordered=True, errors='raise',
+          depth=3, **kwargs):
+    r'''Sonify the annotations of a collection of JAMS files to disk.
+
+    Each file is loaded, sonified, and written by a single worker,
+    which receives only the path of the file and returns only the paths
+    of its outputs.  Sonifications are streamed to disk block by block
+    (see `stream`), so the memory used by each worker is bounded by
+    `block_size` rather than the duration of the annotations.
+
+    The sonification of the annotation `i` (counting from 0) of namespace
+    `ns` in the file `track.jams` is written to
+    `{output_dir}/track__ns__{i:02d}.{fmt}`.
+    Annotations which cannot be sonified are skipped.
+
+    Parameters
+    ----------
+    source : str or iterable of str
+        A directory to search, a glob pattern, or a collection of paths.
+
+        See `jams.corpus.find_corpus` for details.
+
+    output_dir : str
+        The directory in which to write the outputs.
+        It is created if it does not exist.
+
+    namespace : str, callable, or iterable of str, optional
+        If provided, only annotations whose namespace matches
+        (see `jams.JObject.search`) are sonified.
+        An iterable of strings matches any of its elements.
+
+        If `pool='process'`, a callable must be picklable
+        (e.g., a module-level function, but not a lambda).
+
+    sr : positive integer
+        The sampling rate of the outputs.
+        If `audio_dir` is provided, the sampling rate of the source audio
+        is used instead.
+
+    fmt : str ['wav', 'flac']
+        The format of the outputs, written as 16-bit PCM.
+        FLAC output requires `soundfile` to be installed.
+
+    audio_dir : str, optional
+        If provided, each sonification is mixed over the source audio
+        `{audio_dir}/{base}.{audio_ext}`, where `base` is the name
+        of the JAMS file without its extension.
+        The output has the length and channels of the source audio.
+
+        PCM WAV audio is read by the standard library;
+        other formats require `soundfile` to be installed.
+
+    audio_ext : str
+        The extension of the source audio files
+
+    mix : float in [0, 1]
+        The weight of the sonification in the mix:
+        `output = (1 - mix) * audio + mix * sonification`
+
+    block_size : int > 0
+        The number of samples to synthesize at a time
+
+    n_jobs : int > 0 or None
+        The number of parallel workers.
+        If `None`, the number of CPUs is used.
+        If `1`, files are sonified sequentially in the calling process.
+
+    pool : str ['process', 'thread']
+        The type of worker pool
+
+    ordered : bool
+        If `True`, results are generated in the order of the input paths.
+        If `False`, results are generated as they complete.
+
+    errors : str ['raise', 'skip', 'collect']
+        What to do if a file fails to load or sonify:
+
+        - `raise`: raise the exception
+        - `skip`: skip the file
+        - `collect`: generate the exception in place of the result
+
+    depth : int
+        If `source` is a directory, the depth of sub-directories to search
+
+    kwargs
+        Additional keyword arguments to the sonification functions.
+        If `pool='process'`, they must be picklable.
+
+    Yields
+    ------
+    path : str
+        The path of the JAMS file
+
+    outputs : list of str, or Exception
+        The paths of the audio files written for `path`.
+
+        If `errors='collect'`, this is the exception if sonification failed.
+
+    Raises
+    ------
+    ParameterError
+        If `fmt`, `mix`, `block_size`, `pool`, or `errors` are not supported,
+        or if `pool='process'` and `namespace` or `kwargs` cannot be pickled
+
+    See Also
+    --------
+    stream
+    jams.corpus.load_corpus
+
+    Examples
+    --------
+    >>> # Sonify the beats and chords of a corpus over its audio
+    >>> for path, outputs in jams.sonify.batch('annotations/', 'sonified/',
+    ...                                        namespace=['beat', 'chord'],
+    ...                                        audio_dir='audio/'):
+    ...     print(path, outputs)
+    '''
+
+    if errors not in ('raise', 'skip', 'collect'):
+        raise ParameterError('Unsupported error policy: {}'.format(errors))
+
+    executors = dict(process=futures.ProcessPoolExecutor,
+                     thread=futures.ThreadPoolExecutor)
+
+    if pool not in executors:
+        raise ParameterError('Unsupported pool: {}'.format(pool))
+
+    if fmt not in __FORMATS__:
+        raise ParameterError('Unsupported format: {}'.format(fmt))
+
+    if not 0 <= mix <= 1:
+        raise ParameterError('Invalid mix: {}'.format(mix))
+
+    if block_size < 1:
+        raise ParameterError('Invalid block_size: {}'.format(block_size))
+
+    paths = find_corpus(source, depth=depth)
+
+    if namespace is not None and not (isinstance(namespace, six.string_types)
+                                      or callable(namespace)):
+        namespace = list(namespace)
+
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+
+    if n_jobs != 1 and pool == 'process':
+        _check_picklable(namespace=namespace, kwargs=kwargs)
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    options = dict(output_dir=output_dir, namespace=namespace, sr=sr,
+                   fmt=fmt, audio_dir=audio_dir, audio_ext=audio_ext,
+                   mix=mix, block_size=block_size, kwargs=kwargs)
+
+    if n_jobs == 1:
+        results = (_call(_sonify_file, path, options) for path in paths)
+        for path, (result, exc) in six.moves.zip(paths, results):
+            if _keep(exc, errors):
+                yield path, result if exc is None else exc
+        return
+
+    with executors[pool](max_workers=n_jobs) as executor:
+        for path, future in _submit(executor, _sonify_file, paths, options,
+                                    ordered, 4 * n_jobs):
+            exc = future.exception()
+            if _keep(exc, errors):
+                yield path, future.result() if exc is None else exc
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+'''Convert a jams file between storage formats (jams, jamz, jamb).'''
+
+import argparse
+import sys
+
+import jamsx
+
+
+def convert(input_file, output_file, input_format='auto',
+            output_format='auto', validate=True):
+    '''Convert a jams file between formats.
+
+    Parameters
+    ----------
+    input_file : str
+        The path on disk to the input file
+
+    output_file : str
+        The path on disk to the output file
+
+    input_format : str ['auto', 'jams', 'jamz', 'jamb']
+        The format of the input.
+        If `auto`, it is inferred from the file name.
+
+    output_format : str ['auto', 'jams', 'jamz', 'jamb']
+        The format of the output.
+        If `auto`, it is inferred from the file name.
+
+    validate : bool
+        If `True`, the input is validated against the schema.
+        If `False`, validation is skipped.
+    '''
+
+    jam = jamsx.load(input_file, validate=validate, fmt=input_format,
+                     columnar=True)
+
+    jam.save(output_file, strict=validate, fmt=output_format)
+
+
+def parse_arguments(args):
+    '''Parse arguments from the command line'''
+    parser = argparse.ArgumentParser(description='Convert JAMS between '
+                                                 'jams, jamz, and jamb '
+                                                 'formats')
+
+    parser.add_argument('-i',
+                        '--input-format',
+                        dest='input_format',
+                        choices=['auto', 'jams', 'jamz', 'jamb'],
+                        default='auto',
+                        help='Format of the input file. '
+                             'Default is to infer from the file name.')
+
+    parser.add_argument('-o',
+                        '--output-format',
+                        dest='output_format',
+                        choices=['auto', 'jams', 'jamz', 'jamb'],
+                        default='auto',
+                        help='Format of the output file. '
+                             'Default is to infer from the file name.')
+
+    parser.add_argument('--no-validate',
+                        dest='validate',
+                        action='store_false',
+                        default=True,
+                        help='Skip schema validation')
+
+    parser.add_argument('input_file',
+                        help='Path to the input jams file')
+
+    parser.add_argument('output_file', help='Path to the output file')
+
+    return vars(parser.parse_args(args))
+
+
+if __name__ == '__main__':
+
+    convert(**parse_arguments(sys.argv[1:]))
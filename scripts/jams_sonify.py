@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+'''Sonify the annotations of a collection of jams files to audio files.'''
+
+from __future__ import print_function
+
+import argparse
+import sys
+
+import jamsx
+
+
+def sonify_corpus(source, output_dir, namespace=None, sr=22050, fmt='wav',
+                  audio_dir=None, audio_ext='wav', mix=0.5, n_jobs=None):
+    '''Sonify a collection of jams files.
+
+    Parameters
+    ----------
+    source : list of str
+        Paths to jams files, directories, or glob patterns
+
+    output_dir : str
+        The directory in which to write the outputs
+
+    namespace : list of str, optional
+        Sonify only annotations matching any of these namespace patterns
+
+    sr : int
+        The sampling rate of the outputs
+
+    fmt : str ['wav', 'flac']
+        The format of the outputs
+
+    audio_dir : str, optional
+        A directory of source audio to mix the sonifications over
+
+    audio_ext : str
+        The extension of the source audio files
+
+    mix : float
+        The weight of the sonification in the mix
+
+    n_jobs : int, optional
+        The number of parallel workers
+
+    Returns
+    -------
+    n_failed : int
+        The number of files which could not be sonified
+    '''
+
+    paths = []
+    for item in source:
+        paths.extend(jamsx.corpus.find_corpus(item))
+
+    n_failed = 0
+    for path, result in jamsx.sonify.batch(paths, output_dir,
+                                           namespace=namespace, sr=sr,
+                                           fmt=fmt, audio_dir=audio_dir,
+                                           audio_ext=audio_ext, mix=mix,
+                                           n_jobs=n_jobs, errors='collect'):
+        if isinstance(result, Exception):
+            n_failed += 1
+            print('{}: {}'.format(path, result), file=sys.stderr)
+        else:
+            for output in result:
+                print(output)
+
+    return n_failed
+
+
+def parse_arguments(args):
+    '''Parse arguments from the command line'''
+    parser = argparse.ArgumentParser(description='Sonify JAMS annotations')
+
+    parser.add_argument('-n',
+                        '--namespace',
+                        dest='namespace',
+                        action='append',
+                        default=None,
+                        help='Sonify only annotations matching this '
+                             'namespace pattern. '
+                             'May be given multiple times.')
+
+    parser.add_argument('-r',
+                        '--sr',
+                        dest='sr',
+                        type=int,
+                        default=22050,
+                        help='Sampling rate of the output '
+                             '(ignored if --audio-dir is given)')
+
+    parser.add_argument('-f',
+                        '--format',
+                        dest='fmt',
+                        choices=['wav', 'flac'],
+                        default='wav',
+                        help='Format of the output files')
+
+    parser.add_argument('-a',
+                        '--audio-dir',
+                        dest='audio_dir',
+                        default=None,
+                        help='Directory of source audio to mix the '
+                             'sonifications over, matched to jams files '
+                             'by name')
+
+    parser.add_argument('--audio-ext',
+                        dest='audio_ext',
+                        default='wav',
+                        help='Extension of the source audio files')
+
+    parser.add_argument('-m',
+                        '--mix',
+                        dest='mix',
+                        type=float,
+                        default=0.5,
+                        help='Weight of the sonification in the mix, '
+                             'between 0 and 1')
+
+    parser.add_argument('-j',
+                        '--jobs',
+                        dest='n_jobs',
+                        type=int,
+                        default=None,
+                        help='Number of parallel workers. '
+                             'Default is the number of CPUs.')
+
+    parser.add_argument('output_dir',
+                        help='Directory in which to write the audio files')
+
+    parser.add_argument('source',
+                        nargs='+',
+                        help='Paths to jams files, directories, '
+                             'or glob patterns')
+
+    return vars(parser.parse_args(args))
+
+
+if __name__ == '__main__':
+
+    sys.exit(1 if sonify_corpus(**parse_arguments(sys.argv[1:])) else 0)
@@ -40,12 +40,17 @@ setup(
         'jsonschema>=3.0.0',
         'numpy>=1.8.0',
         'six',
+        'futures; python_version<"3"',
         'decorator',
         'mir_eval>=0.5',
     ],
     extras_require={
         'display': ['matplotlib>=1.5.0'],
+        'fastjson': ['orjson'],
+        'arrow': ['pyarrow'],
+        'audio': ['soundfile'],
         'tests': ['pytest < 4', 'pytest-cov'],
     },
-    scripts=['scripts/jamsx_to_lab.py']
+    scripts=['scripts/jamsx_to_lab.py', 'scripts/jams_convert.py',
+             'scripts/jams_sonify.py']
 )
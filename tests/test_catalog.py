@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+'''Tests for corpus catalogs'''
+
+import os
+import time
+
+import pytest
+
+import jamsx
+
+xfail = pytest.mark.xfail
+parametrize = pytest.mark.parametrize
+
+
+@pytest.fixture
+def corpus_dir(tmpdir):
+    jam = jamsx.load('tests/fixtures/valid.jams')
+    jam.annotations[0].annotation_metadata.annotator.name = 'Annotator X'
+    jam.annotations[0].duration = 30.0
+
+    root = str(tmpdir)
+
+    paths = []
+    for i, ext in enumerate(['jams', 'jamz', 'jamb']):
+        path = os.path.join(root, 'track{:02d}.{:s}'.format(i, ext))
+        jam.file_metadata.title = 'track{:02d}'.format(i)
+        jam.file_metadata.duration = 60.0 * (i + 1)
+        jam.save(path)
+        paths.append(path)
+
+    return root, paths
+
+
+def test_catalog_query(corpus_dir):
+    root, paths = corpus_dir
+    jam = jamsx.load(paths[0])
+
+    with jamsx.catalog.Catalog() as catalog:
+        assert catalog.update(root) == paths
+        assert len(catalog) == len(paths)
+
+        # Everything
+        selection = catalog.query()
+        assert selection == [(path, list(range(len(jam.annotations))))
+                             for path in paths]
+
+        # Namespace queries match as in JObject.search
+        positions = [i for i, ann in enumerate(jam.annotations)
+                     if ann.search(namespace='tag_.*')]
+        assert catalog.query(namespace='tag_.*') == [(path, positions)
+                                                     for path in paths]
+
+        # Annotation and file metadata
+        assert catalog.query(annotator='Annotator X',
+                             min_duration=90) == [(path, [0])
+                                                  for path in paths[1:]]
+        assert catalog.query(title='track00', max_duration=60) == \
+            [(paths[0], list(range(len(jam.annotations))))]
+        assert catalog.query(corpus='no such corpus') == []
+
+        n_obs = max(len(ann.data) for ann in jam.annotations)
+        positions = [i for i, ann in enumerate(jam.annotations)
+                     if len(ann.data) >= n_obs]
+        assert catalog.query(min_observations=n_obs) == [(path, positions)
+                                                         for path in paths]
+        assert catalog.query(min_observations=n_obs + 1) == []
+
+        # Annotation durations are distinct from file durations
+        assert catalog.query(min_annotation_duration=30) == [(path, [0])
+                                                             for path in paths]
+        assert catalog.query(max_annotation_duration=20) == []
+        assert catalog.query(min_duration=90,
+                             max_annotation_duration=30) == [
+                                 (path, [0]) for path in paths[1:]]
+
+
+def test_catalog_load(corpus_dir):
+    root, paths = corpus_dir
+    jam = jamsx.load(paths[0])
+
+    catalog = jamsx.catalog.Catalog()
+    catalog.update(root)
+
+    selection = catalog.query(namespace='tag_open', title='track0[12]')
+    results = list(catalog.load(selection))
+
+    assert [path for path, _ in results] == paths[1:]
+    for _, jam_sel in results:
+        assert jam_sel.annotations == jam.annotations['tag_open']
+        assert not any(ann._lazy for ann in jam_sel.annotations)
+
+
+def test_catalog_incremental(corpus_dir, tmpdir):
+    root, paths = corpus_dir
+    db = os.path.join(str(tmpdir), 'catalog.db')
+
+    with jamsx.catalog.Catalog(db) as catalog:
+        assert catalog.update(root) == paths
+
+    with jamsx.catalog.Catalog(db) as catalog:
+        # Nothing has changed
+        assert catalog.update(root) == []
+
+        # Modify one file
+        jam = jamsx.load(paths[0])
+        jam.annotations.pop()
+        jam.save(paths[0])
+        os.utime(paths[0], (time.time() + 10, time.time() + 10))
+
+        assert catalog.update(root) == paths[:1]
+        assert catalog.query(title='track00')[0][1] == \
+            list(range(len(jam.annotations)))
+
+        # Remove one file
+        os.remove(paths[1])
+        assert catalog.update(root, prune=False) == []
+        assert len(catalog) == 3
+        catalog.update(root, prune=True)
+        assert len(catalog) == 2
+
+
+@xfail(raises=jamsx.JamsError)
+def test_catalog_load_stale(corpus_dir):
+    root, paths = corpus_dir
+
+    catalog = jamsx.catalog.Catalog()
+    catalog.update(root)
+    selection = catalog.query()
+
+    os.remove(paths[0])
+    list(catalog.load(selection))
+
+
+@parametrize('errors', ['skip', xfail('raise', raises=ValueError),
+                        xfail('collect', raises=jamsx.ParameterError)])
+def test_catalog_errors(corpus_dir, errors):
+    root, paths = corpus_dir
+
+    with open(os.path.join(root, 'track99.jams'), 'w') as fdesc:
+        fdesc.write('{"annotations": [')
+
+    catalog = jamsx.catalog.Catalog()
+    assert catalog.update(root, errors=errors) == paths
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+'''Tests for JSON codec selection'''
+
+import json
+
+import pytest
+import numpy as np
+
+import jamsx
+
+
+BACKENDS = jamsx.codec.list_backends()
+
+
+@pytest.fixture
+def reset_backend():
+    yield
+    jamsx.codec.set_backend('auto')
+
+
+def test_list_backends():
+    assert 'json' in BACKENDS
+    assert BACKENDS[-1] == 'json'
+
+
+@pytest.mark.xfail(raises=jamsx.ParameterError)
+def test_get_backend_unknown():
+    jamsx.codec.get_backend('bson')
+
+
+@pytest.mark.xfail(raises=jamsx.ParameterError)
+def test_set_backend_unknown(reset_backend):
+    jamsx.codec.set_backend('bson')
+
+
+def test_set_backend(reset_backend):
+    jamsx.codec.set_backend('json')
+    assert jamsx.codec.get_backend().name == 'json'
+
+    jamsx.codec.set_backend('auto')
+    assert jamsx.codec.get_backend().name == BACKENDS[0]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('columnar', [False, True])
+def test_load_backend(backend, columnar):
+    fn = 'tests/fixtures/valid.jams'
+    jam_ref = jamsx.load(fn, backend='json')
+    jam = jamsx.load(fn, backend=backend, columnar=columnar)
+
+    assert jam == jam_ref
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('kwargs', [dict(), dict(indent=2),
+                                    dict(indent=4, sort_keys=True)])
+def test_dumps_backend(backend, kwargs):
+    ann = jamsx.Annotation('pitch_contour', columnar=True, duration=1.0)
+    for t in np.arange(5) * 0.1:
+        ann.append(time=t, duration=0.0, confidence=0.5,
+                   value=dict(index=0, frequency=440.0, voiced=True))
+
+    jam = jamsx.JAMS(annotations=[ann], sandbox=dict(x=np.arange(3)))
+    jam.file_metadata.duration = 1.0
+
+    out = jam.dumps(backend=backend, **kwargs)
+    assert json.loads(out) == jam.__json__
+    assert jamsx.JAMS.loads(out, backend=backend).__json__ == jam.__json__
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps_nonfinite(backend):
+    ann = jamsx.Annotation('beat', duration=1.0)
+    ann.append(time=0, duration=0, value=1, confidence=float('nan'))
+
+    out = ann.dumps(backend=backend)
+    ann2 = jamsx.Annotation.loads(out, backend=backend)
+    assert np.isnan(ann2.data[0].confidence)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_save_backend(backend, tmpdir):
+    jam = jamsx.load('tests/fixtures/valid.jams', columnar=True)
+    fn = str(tmpdir.join('out.jamz'))
+
+    jam.save(fn, backend=backend)
+    assert jamsx.load(fn) == jam
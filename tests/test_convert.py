@@ -284,6 +284,56 @@ def test_scaper_tag_open():
         assert obs1.value['label'] == obs2.value
 
 
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('source, target',
+                         [('pitch_hz', 'pitch_midi'),
+                          ('pitch_midi', 'pitch_contour'),
+                          ('note_hz', 'note_midi'),
+                          ('chord_harte', 'chord'),
+                          ('tag_gtzan', 'tag_open')])
+def test_convert_copy(columnar, source, target):
+
+    ann = jamsx.Annotation(namespace=source, columnar=columnar,
+                           time=0, duration=3)
+    values = [440.0, 220.0, 110.0]
+    if source.startswith('chord'):
+        values = ['C', 'E:min', 'G:7']
+    elif source.startswith('tag'):
+        values = ['blues', 'jazz', 'rock']
+
+    for t, v in enumerate(values):
+        ann.append(time=t, duration=1, value=v, confidence=0.5)
+    ann.annotation_metadata.corpus = 'test'
+
+    before = ann.dumps()
+    ann2 = jamsx.convert(ann, target)
+    ann2.validate()
+
+    # The source annotation is not modified
+    assert ann.dumps() == before
+
+    assert ann2.namespace == target
+    assert ann2.time == ann.time
+    assert ann2.duration == ann.duration
+    assert ann2.annotation_metadata.corpus == 'test'
+    assert ann2._columnar == columnar
+
+    # Converted annotations can be modified independently
+    ann2.annotation_metadata.corpus = 'other'
+    assert ann.annotation_metadata.corpus == 'test'
+
+    ann2.append(time=4, duration=1, value=ann2.data[0].value)
+    assert len(ann.data) == len(values)
+
+
+def test_hz_midi_vectorized():
+
+    hz = np.array([27.5, 440.0, 4186.009])
+    midi = jamsx.nsconvert._hz_to_midi(hz)
+    assert np.allclose(midi, [21, 69, 108])
+    assert np.allclose(jamsx.nsconvert._midi_to_hz(midi), hz)
+
+
 def test_can_convert_equal():
 
     ann = jamsx.Annotation(namespace='chord')
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+'''Tests for parallel corpus loading'''
+
+import os
+import shutil
+
+import pytest
+import six
+
+import jamsx
+
+xfail = pytest.mark.xfail
+parametrize = pytest.mark.parametrize
+
+
+@pytest.fixture
+def corpus_dir(tmpdir):
+    jam = jamsx.load('tests/fixtures/valid.jams')
+
+    root = str(tmpdir)
+    os.makedirs(os.path.join(root, 'sub'))
+
+    paths = []
+    for i, ext in enumerate(['jams', 'jamz', 'jamb', 'jams']):
+        path = os.path.join(root, 'sub' if i % 2 else '',
+                            'track{:02d}.{:s}'.format(i, ext))
+        jam.file_metadata.title = 'track{:02d}'.format(i)
+        jam.save(path)
+        paths.append(path)
+
+    # A file which cannot be loaded
+    bad_path = os.path.join(root, 'track99.jams')
+    with open(bad_path, 'w') as fdesc:
+        fdesc.write('{"annotations": [')
+
+    # A file which should not be found
+    with open(os.path.join(root, 'notes.txt'), 'w') as fdesc:
+        fdesc.write('not a jams file')
+
+    return root, sorted(paths), bad_path
+
+
+def test_find_corpus(corpus_dir):
+    root, paths, bad_path = corpus_dir
+
+    assert jamsx.corpus.find_corpus(root) == sorted(paths + [bad_path])
+    assert (jamsx.corpus.find_corpus(os.path.join(root, '*.jams')) ==
+            sorted([_ for _ in paths + [bad_path]
+                    if os.path.dirname(_) == root and _.endswith('.jams')]))
+    assert jamsx.corpus.find_corpus(paths[::-1]) == paths
+
+
+@parametrize('n_jobs, pool', [(1, 'thread'), (2, 'thread'), (2, 'process')])
+@parametrize('ordered', [False, True])
+def test_load_corpus(corpus_dir, n_jobs, pool, ordered):
+    root, paths, _ = corpus_dir
+
+    results = list(jamsx.corpus.load_corpus(paths, n_jobs=n_jobs, pool=pool,
+                                            ordered=ordered))
+
+    if ordered:
+        assert [path for path, _ in results] == paths
+    else:
+        assert sorted(path for path, _ in results) == paths
+
+    # Compare serializations, since NaN confidences do not survive
+    # pickling as identical objects
+    for path, jam in results:
+        assert jam.dumps() == jamsx.load(path).dumps()
+
+
+@parametrize('errors', ['skip', 'collect',
+                        xfail('raise', raises=ValueError)])
+@parametrize('n_jobs', [1, 2])
+def test_load_corpus_errors(corpus_dir, errors, n_jobs):
+    root, paths, bad_path = corpus_dir
+
+    results = dict(jamsx.corpus.load_corpus(root, n_jobs=n_jobs,
+                                            pool='thread', errors=errors))
+
+    for path in paths:
+        assert isinstance(results[path], jamsx.JAMS)
+
+    if errors == 'skip':
+        assert bad_path not in results
+    else:
+        assert isinstance(results[bad_path], ValueError)
+
+
+@parametrize('namespace, n_ann',
+             [('beat', 1), (['beat', 'tag_open'], 2), ('chord', 0),
+              (lambda ns: ns.startswith('tag'), 1)])
+def test_load_corpus_namespace(corpus_dir, namespace, n_ann):
+    root, paths, _ = corpus_dir
+
+    for path, jam in jamsx.corpus.load_corpus(paths, n_jobs=1,
+                                              namespace=namespace):
+        assert len(jam.annotations) == n_ann
+        assert not any(ann._lazy for ann in jam.annotations)
+
+
+@parametrize('lazy', [False, True])
+def test_load_corpus_query(corpus_dir, lazy):
+    root, paths, _ = corpus_dir
+
+    for path, anns in jamsx.corpus.load_corpus(paths, n_jobs=2,
+                                               pool='thread', lazy=lazy,
+                                               query=dict(namespace='beat')):
+        assert isinstance(anns, jamsx.AnnotationArray)
+        assert len(anns) == 1
+        assert anns[0]._lazy == lazy
+        assert anns[0] == jamsx.load(path).annotations['beat', 0]
+
+
+def test_load_corpus_kwargs(corpus_dir):
+    root, paths, _ = corpus_dir
+
+    for path, jam in jamsx.corpus.load_corpus(paths, n_jobs=1,
+                                              columnar=True):
+        for ann in jam.annotations:
+            assert isinstance(ann.data, jamsx.ObservationArray)
+
+
+@xfail(raises=jamsx.ParameterError)
+def test_load_corpus_badpool():
+    list(jamsx.corpus.load_corpus([], pool='cluster'))
+
+
+@xfail(raises=jamsx.ParameterError)
+def test_load_corpus_baderrors():
+    list(jamsx.corpus.load_corpus([], errors='ignore'))
+
+
+@xfail(raises=jamsx.ParameterError)
+def test_load_corpus_unpicklable():
+    list(jamsx.corpus.load_corpus([], n_jobs=2, pool='process',
+                                  namespace=lambda ns: ns == 'beat'))
@@ -74,3 +74,121 @@ def test_display_multi_fail():
 
     anns = jamsx.AnnotationArray()
     jamsx.display.display_multi(anns)
+
+
+@pytest.mark.parametrize('n', [10, 10000])
+def test_decimate_series(n):
+
+    n_bins = 100
+    x = np.linspace(0, 10, num=n)
+    y = np.random.randn(n)
+    y[n // 3:n // 2] = np.nan
+
+    idx = jamsx.display._decimate_series(x, y, 2, 8, n_bins)
+
+    assert np.all(np.diff(idx) > 0)
+    assert x[idx[0]] <= 2 and x[idx[-1]] >= 8
+
+    if n <= 4 * n_bins:
+        visible = np.flatnonzero((x >= 2) & (x <= 8))
+        assert np.array_equal(idx, np.arange(visible[0] - 1,
+                                             visible[-1] + 2))
+        return
+
+    assert len(idx) <= 4 * (n_bins + 2) + 4
+
+    # The extrema of each pixel column are kept, as are the gap edges
+    visible = (x >= 2) & (x <= 8)
+    bins = jamsx.display._bins(x, 2, 8, n_bins)
+    for b in np.unique(bins[visible]):
+        column = np.flatnonzero((bins == b) & np.isfinite(y))
+        if len(column):
+            assert column[np.argmin(y[column])] in idx
+            assert column[np.argmax(y[column])] in idx
+
+    assert n // 3 - 1 in idx and n // 3 in idx
+
+
+def test_display_pitch_contour_lod():
+
+    n = 20000
+    times = np.arange(n) * 0.01
+    ann = jamsx.Annotation(namespace='pitch_contour', duration=n * 0.01)
+    for i, t in enumerate(times):
+        ann.append(time=t, duration=0,
+                   value=dict(index=i % 2, frequency=100 + i % 50,
+                              voiced=bool(i % 7)))
+
+    _, ax = plt.subplots()
+    jamsx.display.display(ann, meta=False, ax=ax)
+
+    # A voiced and an unvoiced line per contour
+    assert len(ax.lines) == 4
+    for line in ax.lines:
+        assert len(line.get_xdata()) < n // 2
+
+    # Each contour keeps its own observations
+    assert np.all(np.isin(ax.lines[0].get_xdata(), times[::2]))
+    assert np.all(np.isin(ax.lines[2].get_xdata(), times[1::2]))
+
+    ax.set_xlim(10, 11)
+    xdata = ax.lines[0].get_xdata()
+    assert np.all((xdata >= 9.9) & (xdata <= 11.1))
+    assert np.array_equal(xdata[(xdata >= 10) & (xdata <= 11)],
+                          times[1000:1101:2])
+
+
+def test_display_events_lod():
+
+    n = 20000
+    ann = jamsx.Annotation(namespace='onset', duration=n * 0.01)
+    for t in np.arange(n) * 0.01:
+        ann.append(time=t, duration=0)
+
+    _, ax = plt.subplots()
+    jamsx.display.display(ann, meta=False, ax=ax)
+    lines = ax.collections[-1]
+
+    width = jamsx.display._width(ax)
+    assert len(lines.get_segments()) <= width + 1
+
+    ax.set_xlim(10, 11)
+    positions = [seg[0][0] for seg in lines.get_segments()]
+    assert np.allclose(positions, np.arange(1000, 1101) * 0.01)
+
+
+def test_display_intervals_lod():
+
+    n = 20000
+    ann = jamsx.Annotation(namespace='segment_open', duration=n * 0.01)
+    for i, t in enumerate(np.arange(n) * 0.01):
+        ann.append(time=t, duration=0.005, value='ab'[i % 2])
+
+    _, ax = plt.subplots()
+    jamsx.display.display(ann, meta=False, ax=ax)
+    bars = [c for c in ax.collections if c.get_paths()]
+    assert len(bars) == 2
+
+    for bar in bars:
+        assert len(bar.get_paths()) < n // 2
+
+    ax.set_xlim(10, 11)
+    for bar in bars:
+        assert len(bar.get_paths()) in (50, 51)
+
+
+def test_display_multi_lod():
+
+    jam = jamsx.JAMS()
+    for namespace in ['beat', 'onset']:
+        ann = jamsx.Annotation(namespace=namespace, duration=100)
+        for t in np.arange(0, 100, 0.01):
+            ann.append(time=t, duration=0)
+        jam.annotations.append(ann)
+
+    fig, axs = jamsx.display.display_multi(jam.annotations, meta=False)
+
+    # Zooming one axes re-decimates those which share its x-limits
+    axs[1].set_xlim(10, 11)
+    for ax in axs:
+        assert len(ax.collections[-1].get_segments()) == 101
@@ -373,3 +373,57 @@ def test_transcription_invalid(ref_transcript, est_badtranscript):
         jamsx.eval.transcription(ref_transcript, est_badtranscript)
     with pytest.raises(jamsx.SchemaError):
         jamsx.eval.transcription(est_badtranscript, ref_transcript)
+
+
+# Batch evaluation
+@pytest.mark.parametrize('pool', ['process', 'thread'])
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_batch(ref_beat, est_beat, tmpdir, n_jobs, pool):
+
+    ref_dir = tmpdir.mkdir('ref')
+    est_dir = tmpdir.mkdir('est')
+
+    for name in ['a', 'b']:
+        for path, ann in [(ref_dir, ref_beat), (est_dir, est_beat)]:
+            jam = jamsx.JAMS(annotations=[ann])
+            jam.file_metadata.duration = 20.0
+            jam.save(str(path.join('{}.jams'.format(name))))
+
+    # Unmatched estimates are ignored
+    jam = jamsx.JAMS()
+    jam.file_metadata.duration = 20.0
+    jam.save(str(est_dir.join('c.jams')))
+
+    scores = jamsx.eval.batch('beat', [(str(ref_dir), str(est_dir)),
+                                       (ref_beat, est_beat)],
+                              n_jobs=n_jobs, pool=pool)
+
+    assert len(scores) == 3
+    assert list(scores.track[:2]) == ['a', 'b']
+    assert scores.reference.iloc[2] is None
+
+    expected = jamsx.eval.beat(ref_beat, est_beat)
+    for key in expected:
+        assert np.allclose(scores[key], expected[key])
+
+
+def test_batch_errors(ref_beat, est_beat, est_tag):
+
+    pairs = [(ref_beat, est_tag), (ref_beat, est_beat)]
+
+    with pytest.raises(jamsx.NamespaceError):
+        jamsx.eval.batch('beat', pairs)
+
+    scores = jamsx.eval.batch('beat', pairs, errors='skip')
+    assert list(scores.index) == [1]
+
+
+@pytest.mark.parametrize('metric, errors, pool, query',
+                         [('beet', 'raise', 'process', None),
+                          ('beat', 'ignore', 'process', None),
+                          ('beat', 'raise', 'cluster', None),
+                          ('beat', 'raise', 'process', lambda ns: True)])
+def test_batch_badparams(ref_beat, est_beat, metric, errors, pool, query):
+    with pytest.raises(jamsx.ParameterError):
+        jamsx.eval.batch(metric, [(ref_beat, est_beat)], query=query,
+                         errors=errors, pool=pool, n_jobs=2)
@@ -3,7 +3,9 @@
 # CREATED:2015-03-06 14:24:58 by Brian McFee <brian.mcfee@nyu.edu>
 '''Unit tests for JAMS core objects'''
 
+import copy
 import os
+import pickle
 import tempfile
 import json
 import six
@@ -429,7 +431,7 @@ def test_jams(tag_data, file_metadata, ann_sandbox):
     assert annotations == jam.annotations
 
 
-@pytest.fixture(params=['jams', 'jamz'])
+@pytest.fixture(params=['jams', 'jamz', 'jamb'])
 def output_path(request):
 
     _, jam_out = tempfile.mkstemp(suffix='.{:s}'.format(request.param))
@@ -517,6 +519,145 @@ def test_jams_search(jam_search, query, expected):
     assert result == expected
 
 
+@parametrize('query, match',
+             [(dict(namespace='tag_.*'), True),
+              (dict(namespace=['tag_open']), False),
+              (dict(namespace=lambda ns: ns.startswith('tag')), True),
+              (dict(**{'Annotation.namespace': 'tag_open'}), True),
+              (dict(**{'AnnotationMetadata.curator.name': 'x'}), False),
+              (dict(**{'Curator.name': 'nobody'}), True),
+              (dict(email='^none'), True),
+              (dict(trim=lambda x: True), False),
+              (dict(__json__=lambda x: True), False)])
+def test_jobject_search_query(query, match):
+    ann = jamsx.Annotation('tag_open', annotation_metadata=dict(
+        curator=dict(name='nobody', email='none@none.com')))
+
+    # Repeat to exercise cached queries
+    assert ann.search(**query) == match
+    assert ann.search(**query) == match
+
+
+def test_annotation_array_getitem_query():
+    arr = jamsx.AnnotationArray(annotations=[jamsx.Annotation(ns)
+                                             for ns in ['beat', 'segment_open',
+                                                        'segment_tut', 'chord']])
+
+    assert ([ann.namespace for ann in arr['segment_.*']] ==
+            ['segment_open', 'segment_tut'])
+    assert arr['segment_.*', -1].namespace == 'segment_tut'
+    assert len(arr['segment_.*']) == 2
+
+
+def test_annotation_array_search_index():
+
+    def __scan(arr, **kwargs):
+        return [ann for ann in arr if ann.search(**kwargs)]
+
+    def __check(arr):
+        for query in [dict(namespace='beat'), dict(namespace='segment_.*'),
+                      dict(name='est1'), dict(corpus='test'),
+                      dict(version=lambda v: v == '2'),
+                      dict(namespace='chord', data_source='.*manual'),
+                      dict(**{'Annotation.namespace': 'beat'}),
+                      dict(**{'Curator.name': 'nobody'})]:
+            assert list(arr.search(**query)) == __scan(arr, **query)
+
+    arr = jamsx.AnnotationArray()
+    for i, ns in enumerate(['beat', 'segment_open', 'chord'] * 4):
+        arr.append(jamsx.Annotation(ns, annotation_metadata=dict(
+            annotator=dict(name='est{}'.format(i % 3)),
+            curator=dict(name='nobody'),
+            corpus='test' if i % 2 else ['unhashable'],
+            version=str(i))))
+    __check(arr)
+
+    # List mutations
+    arr.insert(0, jamsx.Annotation('beat'))
+    __check(arr)
+    del arr[3]
+    __check(arr)
+    arr[2] = jamsx.Annotation('segment_tut')
+    __check(arr)
+    arr.extend([jamsx.Annotation('chord'), jamsx.Annotation('beat')])
+    __check(arr)
+    arr.pop(1)
+    arr.sort(key=lambda ann: ann.namespace)
+    __check(arr)
+
+    # Modification of the annotations in place
+    arr[0].namespace = 'chord'
+    __check(arr)
+    arr[1].annotation_metadata.annotator.name = 'est1'
+    __check(arr)
+    arr[2].annotation_metadata = jamsx.AnnotationMetadata(
+        data_source='manual')
+    __check(arr)
+    arr[3].sandbox.name = 'est1'
+    __check(arr)
+
+
+def test_annotation_array_search_index_updates():
+
+    def __check(arr):
+        for query in [dict(namespace='beat'), dict(namespace='segment_.*'),
+                      dict(name='est1'), dict(corpus='test')]:
+            assert list(arr.search(**query)) == [
+                ann for ann in arr if ann.search(**query)]
+
+    def __ann(ns, i):
+        return jamsx.Annotation(ns, annotation_metadata=dict(
+            annotator=dict(name='est{}'.format(i % 3)),
+            corpus='test' if i % 2 else ['unhashable']))
+
+    arr = jamsx.AnnotationArray()
+    arr.extend([__ann(ns, i) for i, ns in
+                enumerate(['beat', 'segment_open', 'chord'] * 4)])
+    __check(arr)
+    index = arr._index
+
+    # Unrelated objects do not invalidate the index
+    other = jamsx.AnnotationArray([dict(namespace='beat')])
+    other[0].namespace = 'chord'
+    other[0].annotation_metadata.annotator.name = 'est1'
+    __ann('beat', 0)
+    __check(arr)
+    assert arr._index is index
+
+    # List mutations update the index in place
+    for mutate in [lambda: arr.insert(0, __ann('chord', 5)),
+                   lambda: arr.insert(-2, __ann('beat', 1)),
+                   lambda: arr.insert(100, __ann('segment_tut', 2)),
+                   lambda: arr.__delitem__(3),
+                   lambda: arr.__delitem__(-1),
+                   lambda: arr.__delitem__(slice(2, 8, 3)),
+                   lambda: arr.__setitem__(2, __ann('segment_tut', 1)),
+                   lambda: arr.__setitem__(slice(1, 3), [__ann('beat', 0)]),
+                   lambda: arr.__setitem__(slice(0, 4, 2),
+                                           [__ann('chord', 1),
+                                            __ann('beat', 2)]),
+                   lambda: arr.pop(),
+                   lambda: arr.pop(1),
+                   lambda: arr.remove(arr[2])]:
+        mutate()
+        __check(arr)
+        assert arr._index is index
+
+    # Modifying an annotation in place discards the index of its containers
+    arr[1].annotation_metadata.annotator.name = 'est1'
+    assert arr._index is None
+    __check(arr)
+
+    # ... including after copying or pickling
+    for copied in [copy.deepcopy(arr), pickle.loads(pickle.dumps(arr))]:
+        assert copied == arr
+        __check(copied)
+        assert copied._index is not None
+        copied[0].annotation_metadata.annotator.name = 'nobody'
+        assert copied._index is None
+        __check(copied)
+
+
 def test_jams_validate_good():
 
     fn = 'tests/fixtures/valid.jams'
@@ -527,6 +668,38 @@ def test_jams_validate_good():
     j1.file_metadata.validate()
 
 
+@parametrize('columnar', [False, True])
+def test_annotation_validate_trusted(columnar):
+    ann = jamsx.Annotation(namespace='beat_position', columnar=columnar)
+    ann.append(time=0, duration=0,
+               value=dict(position=1, measure=0, num_beats=4, beat_units=4))
+
+    # Outside of a trusted context, data is always validated
+    assert ann.validate()
+    ann.data[0].value['position'] = -1
+    assert not ann.validate(strict=False)
+
+    ann.data[0].value['position'] = 1
+    assert ann.validate()
+
+    with jamsx.trusted():
+        # In-place modifications are not detected
+        ann.data[0].value['position'] = -1
+        assert ann.validate()
+
+        # ... but modifications of the container are
+        ann.append(time=1, duration=0,
+                   value=dict(position=2, measure=0, num_beats=4,
+                              beat_units=4))
+        assert not ann.validate(strict=False)
+
+        # ... as are changes of namespace
+        ann.data[0].value['position'] = 1
+        assert ann.validate()
+        ann.namespace = 'beat'
+        assert not ann.validate(strict=False)
+
+
 @pytest.fixture(scope='module')
 def jam_validate():
     j1 = jamsx.load('tests/fixtures/invalid.jams', validate=False)
@@ -1139,6 +1312,104 @@ def test_jams_slice():
     assert jam_slice.file_metadata.duration == 2
 
 
+@parametrize('strict', [False, True])
+@parametrize('columnar', [False, True])
+def test_annotation_slice_many(strict, columnar):
+    rng = np.random.RandomState(12)
+    ann = jamsx.Annotation('tag_open', time=1.0, duration=20.0,
+                           columnar=columnar)
+    ann.append_columns(dict(time=np.round(rng.uniform(1, 21, size=40), 1),
+                            duration=rng.choice([0, 0.5, 3], size=40),
+                            value=['v{}'.format(i) for i in range(40)],
+                            confidence=rng.uniform(size=40)))
+
+    windows = [(0, 5), (2.5, 7.5), (4, 4.5), (20, 30), (6, 8)]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        trims = ann.trim_many(windows, strict=strict)
+        slices = ann.slice_many(windows, strict=strict)
+
+        for excerpt, (start, end) in zip(trims, windows):
+            assert excerpt == ann.trim(start, end, strict=strict)
+
+        for excerpt, (start, end) in zip(slices, windows):
+            assert excerpt == ann.slice(start, end, strict=strict)
+
+    assert ann.slice_many([]) == []
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_trim_gathers_selection(monkeypatch, columnar):
+    n = 10000
+    ann = jamsx.Annotation('tag_open', time=0, duration=float(n),
+                           columnar=columnar)
+    ann.append_columns(dict(time=np.arange(n, dtype=float),
+                            duration=np.ones(n),
+                            value=['v'] * n,
+                            confidence=np.ones(n)))
+
+    gathered = []
+    take = jamsx.Annotation._take
+
+    def _take(self, indices):
+        gathered.append(len(indices))
+        return take(self, indices)
+
+    monkeypatch.setattr(jamsx.Annotation, '_take', _take)
+
+    excerpt = ann.trim(500, 510)
+    assert len(excerpt.data) == 10
+    assert len(gathered) == 1 and gathered[0] <= 12
+
+    # Overlapping windows gather shared observations only once
+    del gathered[:]
+    excerpts = ann.trim_many([(500, 510), (505, 515)])
+    assert [len(ex.data) for ex in excerpts] == [10, 10]
+    assert len(gathered) == 1 and gathered[0] <= 17
+
+
+@parametrize('windows', [[0, 1], [(0, 1, 2)], [(2, 1)], [(1, 1)]])
+@xfail(raises=jamsx.ParameterError)
+def test_annotation_slice_many_fail(windows):
+    ann = jamsx.Annotation('tag_open', duration=5)
+    ann.slice_many(windows)
+
+
+def test_jams_slice_many():
+    jam = jamsx.JAMS()
+    jam.file_metadata.duration = 15
+    jam.sandbox.slice = [{'start_time': 0, 'end_time': 15}]
+
+    data = dict(time=[5.0, 5.0, 10.0],
+                duration=[2.0, 4.0, 4.0],
+                value=['one', 'two', 'three'],
+                confidence=[0.9, 0.9, 0.9])
+    jam.annotations.append(jamsx.Annotation('tag_open', data=data,
+                                            time=5.0, duration=10.0))
+    jam.annotations.append(jamsx.Annotation('beat', data=data,
+                                            time=0.0, duration=15.0))
+
+    windows = np.array([[0, 10], [6, 12], [10, 15]])
+
+    for excerpt, (start, end) in zip(jam.slice_many(windows), windows):
+        assert excerpt == jam.slice(start, end)
+
+    for excerpt, (start, end) in zip(jam.trim_many(windows), windows):
+        assert excerpt == jam.trim(start, end)
+
+    # The original operation log is not modified
+    assert jam.sandbox.slice == [{'start_time': 0, 'end_time': 15}]
+
+
+@parametrize('windows', [[(-1, 5)], [(5, 20)], [(5, 2)]])
+@xfail(raises=jamsx.ParameterError)
+def test_jams_slice_many_fail(windows):
+    jam = jamsx.JAMS()
+    jam.file_metadata.duration = 15
+    jam.slice_many(windows)
+
+
 def test_annotation_data_frame():
     namespace = 'tag_open'
     data = dict(time=[5.0, 5.0, 10.0],
@@ -1236,3 +1507,509 @@ def test_annotation_to_samples_fail_shape():
 
     values = ann.to_samples([[0.2, 0.4, 0.75, 1.25, 1.75, 1.4]])
 
+
+@parametrize('columnar', [False, True])
+def test_annotation_to_samples_dense_enum(columnar):
+    ann = jamsx.Annotation('tag_gtzan', columnar=columnar)
+    ann.append(time=0, duration=2, value='blues', confidence=0.5)
+    ann.append(time=1, duration=2, value='jazz', confidence=None)
+
+    times = [2.5, 0.5, 1.5, 4.0]
+    labels = jamsx.schema.values('tag_gtzan')
+
+    values, conf = ann.to_samples(times, confidence=True, dense=True)
+    assert values.shape == conf.shape == (len(times), len(labels))
+    assert values.dtype == bool
+
+    for row, crow, sample in zip(values, conf, ann.to_samples(times)):
+        assert sorted(np.asarray(labels)[row]) == sorted(sample)
+
+    assert conf[1, labels.index('blues')] == 0.5
+    assert np.isnan(conf[0, labels.index('jazz')])
+    assert np.isnan(conf[3]).all()
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_to_samples_dense_numeric(columnar):
+    ann = jamsx.Annotation('pitch_hz', columnar=columnar)
+    ann.append(time=0, duration=1, value=440.0, confidence=0.9)
+    ann.append(time=0.5, duration=1, value=220.0, confidence=0.8)
+
+    values, conf = ann.to_samples([1.25, 0.25, 0.75, 3.0],
+                                  confidence=True, dense=True)
+    assert np.allclose(values, [[220, np.nan], [440, np.nan],
+                                [440, 220], [np.nan, np.nan]],
+                       equal_nan=True)
+    assert np.allclose(conf, [[0.8, np.nan], [0.9, np.nan],
+                              [0.9, 0.8], [np.nan, np.nan]],
+                       equal_nan=True)
+
+    assert ann.to_samples([5.0], dense=True).shape == (1, 0)
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_to_samples_dense_contour(columnar):
+    ann = jamsx.Annotation('pitch_contour', columnar=columnar)
+    for t, index, freq, voiced, conf in [(0.0, 3, 110.0, True, 0.5),
+                                         (0.5, 3, 120.0, False, 0.6),
+                                         (0.0, 1, 440.0, True, 0.7),
+                                         (1.0, 1, 220.0, True, None)]:
+        ann.append(time=t, duration=0.5, confidence=conf,
+                   value=dict(index=index, frequency=freq, voiced=voiced))
+
+    values, conf = ann.to_samples([0.75, 0.25, 1.25, 3.0],
+                                  confidence=True, dense=True)
+
+    # Columns are contours 1 and 3; unvoiced and absent frames are NaN
+    assert np.allclose(values, [[np.nan, np.nan], [440, 110],
+                                [220, np.nan], [np.nan, np.nan]],
+                       equal_nan=True)
+    assert np.allclose(conf, [[np.nan, 0.6], [0.7, 0.5],
+                              [np.nan, np.nan], [np.nan, np.nan]],
+                       equal_nan=True)
+
+    assert ann.to_samples([5.0], dense=True).shape == (1, 2)
+
+
+@xfail(raises=jamsx.ParameterError)
+def test_annotation_to_samples_dense_fail():
+    ann = jamsx.Annotation('tag_open')
+    ann.append(time=0, duration=1, value='one')
+    ann.to_samples([0.5], dense=True)
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_query(columnar):
+    rng = np.random.RandomState(20)
+
+    ann = jamsx.Annotation('tag_open', columnar=columnar)
+    ann.append_columns(dict(time=rng.randint(0, 20, size=50) / 2.0,
+                            duration=rng.choice([0, 0.5, 1, 8], size=50),
+                            value=['v{}'.format(i) for i in range(50)],
+                            confidence=[None] * 50))
+
+    for t0, t1 in [(0, 1), (2.5, 3), (3, 7.25), (9.5, 30), (40, 50), (0, 30)]:
+        expected = [obs for obs in ann
+                    if obs.time < t1 and
+                    (obs.time + obs.duration > t0 or
+                     obs.duration == 0 and obs.time >= t0)]
+        assert ann.query(t0, t1) == expected
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_query_update(columnar):
+    ann = jamsx.Annotation('tag_open', columnar=columnar)
+    ann.append(time=0, duration=1, value='a')
+    assert [obs.value for obs in ann.query(1, 2)] == []
+
+    ann.append(time=1, duration=1, value='b')
+    assert [obs.value for obs in ann.query(1, 2)] == ['b']
+
+    ann.append_columns(dict(time=[0.5, 1.5], duration=[1, 0],
+                            value=['c', 'd'], confidence=[None, None]))
+    assert [obs.value for obs in ann.query(1, 2)] == ['c', 'b', 'd']
+
+    ann.pop_data()
+    assert ann.query(0, 2) == []
+
+
+
+# Columnar observation storage
+@pytest.fixture
+def columnar_pair():
+    data = [dict(time=0.0, duration=0.5, value=440.0, confidence=None),
+            dict(time=1.0, duration=0.5, value=220.0, confidence=None),
+            dict(time=0.5, duration=1.0, value=330.0, confidence=None)]
+
+    ann = jamsx.Annotation('pitch_hz', data=data, duration=5.0)
+    ann_col = jamsx.Annotation('pitch_hz', data=data, duration=5.0,
+                               columnar=True)
+    return ann, ann_col
+
+
+def test_observation_array_dtypes(columnar_pair):
+    _, ann = columnar_pair
+
+    assert isinstance(ann.data, jamsx.ObservationArray)
+    assert ann.data.time.dtype == np.float64
+    assert ann.data.duration.dtype == np.float64
+    assert ann.data.value.dtype == np.float64
+    assert np.allclose(ann.data.time, [0.0, 0.5, 1.0])
+
+
+def test_observation_array_promote():
+    ann = jamsx.Annotation('beat', columnar=True)
+    ann.append(time=0, duration=0, value=1, confidence=None)
+    assert ann.data.value.dtype == np.float64
+
+    ann.append(time=1, duration=0, value=None, confidence=None)
+    assert ann.data.value.dtype == np.object_
+    assert [obs.value for obs in ann] == [1, None]
+
+    # Booleans are not numbers, so they are stored as objects
+    for values in [[True], [1.0, False], np.array([True, False])]:
+        ann = jamsx.Annotation('beat', columnar=True)
+        if len(values) > 1:
+            ann.append_columns(dict(time=[0, 1], duration=[0, 0],
+                                    value=values, confidence=[None, None]))
+        else:
+            ann.append(time=0, duration=0, value=values[0], confidence=None)
+
+        assert ann.data.value.dtype == np.object_
+        assert [obs.value for obs in ann] == list(values)
+        assert ([isinstance(obs.value, (bool, np.bool_)) for obs in ann] ==
+                [isinstance(v, (bool, np.bool_)) for v in values])
+
+        with pytest.raises(jamsx.SchemaError):
+            ann.validate()
+
+
+def test_observation_array_order():
+    data = jamsx.ObservationArray()
+    for t, v in [(2, 'a'), (1, 'b'), (2, 'c'), (0, 'd'), (1, 'e')]:
+        data.add(jamsx.Observation(time=t, duration=0, value=v,
+                                   confidence=None))
+
+    assert [obs.value for obs in data] == ['d', 'b', 'e', 'a', 'c']
+    assert data[-1].value == 'c'
+    assert [obs.value for obs in data[1:3]] == ['b', 'e']
+
+
+@xfail(raises=jamsx.JamsError)
+def test_observation_array_badtype():
+    ann = jamsx.Annotation(namespace='tag_open', columnar=True)
+    ann.data.add(None)
+
+
+def test_annotation_columnar_eq(columnar_pair):
+    ann, ann_col = columnar_pair
+
+    assert ann == ann_col
+    assert ann_col.data == ann.data
+    assert list(ann) == list(ann_col)
+    assert ann.__json__ == ann_col.__json__
+    assert jamsx.Annotation(**ann_col)._columnar
+
+
+def test_annotation_columnar_export(columnar_pair):
+    ann, ann_col = columnar_pair
+
+    ints, vals = ann.to_interval_values()
+    ints_col, vals_col = ann_col.to_interval_values()
+    assert np.allclose(ints, ints_col)
+    assert vals == list(vals_col)
+
+    times, vals = ann.to_event_values()
+    times_col, vals_col = ann_col.to_event_values()
+    assert np.allclose(times, times_col)
+    assert vals == list(vals_col)
+
+    assert ann.to_dataframe().equals(ann_col.to_dataframe())
+    assert (ann.to_samples([0.25, 1.2, 3.0]) ==
+            ann_col.to_samples([0.25, 1.2, 3.0]))
+
+
+@parametrize('strict', [False, True])
+def test_annotation_columnar_trim_slice(columnar_pair, strict):
+    ann, ann_col = columnar_pair
+
+    trim, trim_col = ann.trim(0.25, 1.2, strict=strict), \
+        ann_col.trim(0.25, 1.2, strict=strict)
+    assert trim_col._columnar
+    assert trim == trim_col
+
+    sl, sl_col = ann.slice(0.25, 1.2, strict=strict), \
+        ann_col.slice(0.25, 1.2, strict=strict)
+    assert sl_col._columnar
+    assert sl == sl_col
+
+
+def test_load_columnar():
+    fn = 'tests/fixtures/valid.jams'
+    jam = jamsx.load(fn)
+    jam_col = jamsx.load(fn, columnar=True)
+
+    for ann in jam_col.annotations:
+        assert isinstance(ann.data, jamsx.ObservationArray)
+
+    assert jam == jam_col
+    assert jam.__json__ == jam_col.__json__
+
+
+
+@parametrize('columnar', [False, True])
+def test_load_lazy(columnar):
+    fn = 'tests/fixtures/valid.jams'
+    jam = jamsx.load(fn)
+    jam_lazy = jamsx.load(fn, lazy=True, columnar=columnar)
+
+    assert all(ann._lazy for ann in jam_lazy.annotations)
+
+    # Searching by metadata does not build the observations
+    tags = jam_lazy.search(namespace='tag_open')
+    assert len(tags) > 0
+    assert all(ann._lazy for ann in jam_lazy.annotations)
+
+    # Access builds only the requested annotation
+    ann = jam_lazy.annotations['tag_open', 0]
+    assert len(ann.data) == len(jam.annotations['tag_open', 0].data)
+    assert not ann._lazy
+    assert sum(not _._lazy for _ in jam_lazy.annotations) == 1
+
+    assert jam == jam_lazy
+    assert jam.__json__ == jam_lazy.__json__
+
+
+@parametrize('strict', [False, xfail(True, raises=jamsx.SchemaError)])
+def test_load_lazy_invalid(strict):
+    jam = jamsx.JAMS()
+    jam.file_metadata.duration = 10
+    jam.annotations.append(jamsx.Annotation('tag_gtzan'))
+    jam.annotations.append(jamsx.Annotation('beat'))
+    jam.annotations[0].append(time=0, duration=1, value='not a genre',
+                              confidence=None)
+
+    jam_str = jam.dumps()
+
+    # Data validation is deferred until the data is built
+    with warnings.catch_warnings(record=True) as out:
+        jam_lazy = jamsx.load(six.StringIO(jam_str), strict=strict, lazy=True)
+        assert not out
+
+    assert len(jam_lazy.annotations['beat', 0].data) == 0
+
+    with warnings.catch_warnings(record=True) as out:
+        warnings.simplefilter('always')
+        assert len(jam_lazy.annotations[0].data) == 1
+        assert len(out) > 0
+
+
+@parametrize('ext', ['jams', 'jamz'])
+@parametrize('chunk_size', [1, 100, 2**16])
+def test_iter_annotations(ext, chunk_size):
+    fn = 'tests/fixtures/valid.{:s}'.format(ext)
+    jam = jamsx.load(fn)
+
+    results = list(jamsx.iter_annotations(fn, chunk_size=chunk_size))
+
+    assert [idx for idx, _ in results] == list(range(len(jam.annotations)))
+    assert [ann for _, ann in results] == list(jam.annotations)
+
+
+@parametrize('jam_str, n_ann',
+             [('{}', 0),
+              ('{"annotations": null}', 0),
+              ('{"annotations": [], "file_metadata": {"title": "x"}}', 0),
+              ('{"sandbox": {"annotations": [1]}, "annotations": '
+               '[{"namespace": "beat"}, {"namespace": "onset"}]}', 2),
+              xfail(('[]', 0), raises=jamsx.JamsError),
+              xfail(('{"annotations": 5}', 0), raises=jamsx.JamsError),
+              xfail(('{"annotations": [] "sandbox": {}}', 0),
+                    raises=jamsx.JamsError),
+              xfail(('{"annotations": [', 0), raises=ValueError)])
+def test_iter_annotations_structure(jam_str, n_ann):
+    results = list(jamsx.iter_annotations(six.StringIO(jam_str)))
+    assert len(results) == n_ann
+
+
+def test_iter_annotations_invalid():
+    with warnings.catch_warnings(record=True) as out:
+        warnings.simplefilter('always')
+        results = list(jamsx.iter_annotations('tests/fixtures/invalid.jams',
+                                              strict=False))
+
+    assert len(results) > 0
+    assert len(out) > 0
+
+
+@parametrize('namespace, value, confidence',
+             [('pitch_hz', [100.0, -200.5, 0.0], [0.5, 1.0, np.nan]),
+              ('tag_open', ['a', 'b', 'c'], [None, None, 1]),
+              ('segment_open', ['a', 'b', 'c'], [1, 2, 3]),
+              ('vector', [[1, 2], [3], []], [True, False, True]),
+              ('beat', [1, None, 3.5], [np.inf, 0.0, -np.inf]),
+              ('onset', [2**70, 1, 0], [1.0, 2, 3.0])])
+@parametrize('columnar', [False, True])
+def test_jamb_roundtrip(namespace, value, confidence, columnar):
+
+    jam = jamsx.JAMS()
+    jam.file_metadata.duration = 10.0
+    jam.sandbox.nan = np.nan
+    ann = jamsx.Annotation(namespace, columnar=columnar,
+                           sandbox=dict(key='value'))
+    for t, (v, c) in enumerate(zip(value, confidence)):
+        ann.append(time=t, duration=0.5, value=v, confidence=c)
+    jam.annotations.append(ann)
+    jam.annotations.append(jamsx.Annotation('beat'))
+
+    buf = six.BytesIO()
+    jam.save(buf, fmt='jamb', strict=False)
+    buf.seek(0)
+    jam_b = jamsx.load(buf, fmt='jamb', validate=False)
+
+    buf = six.StringIO()
+    jam.save(buf, strict=False)
+    buf.seek(0)
+    jam_j = jamsx.load(buf, validate=False)
+
+    assert jam_b.__json__ == jam_j.__json__
+    assert jam_b == jam_j
+    for obs_b, obs_j in zip(jam_b.annotations[0], jam_j.annotations[0]):
+        for field in obs_b._fields:
+            assert type(getattr(obs_b, field)) == type(getattr(obs_j, field))
+
+
+@xfail(raises=jamsx.JamsError)
+def test_jamb_bad_magic():
+    jamsx.load(six.BytesIO(b'{"annotations": []}'), fmt='jamb')
+
+
+def test_jamb_container():
+    arrays = [np.arange(5, dtype='>i4'), np.linspace(0, 1, 7),
+              np.zeros(0, dtype=bool), np.eye(3)]
+    buf = six.BytesIO()
+    jamsx.binary.dump({'x': [1, 'two']}, arrays, buf)
+
+    buf.seek(0)
+    document, loaded = jamsx.binary.load(buf)
+
+    assert document == {'x': [1, 'two']}
+    assert len(loaded) == len(arrays)
+    for arr, arr_l in zip(arrays, loaded):
+        assert arr_l.dtype.isnative
+        assert arr_l.shape == arr.shape
+        assert np.array_equal(arr, arr_l)
+
+
+@pytest.fixture
+def jamb_path():
+    _, path = tempfile.mkstemp(suffix='.jamb')
+    jam = jamsx.load('tests/fixtures/valid.jams')
+
+    ann = jamsx.Annotation('pitch_hz', duration=10.0)
+    ann.append_columns(dict(time=np.linspace(0, 9, 50),
+                            duration=np.full(50, 0.5),
+                            value=np.linspace(100, 500, 50),
+                            confidence=np.ones(50)))
+    jam.annotations.append(ann)
+    jam.save(path)
+
+    yield path
+
+    os.unlink(path)
+
+
+def test_load_mmap(jamb_path):
+    jam = jamsx.load(jamb_path)
+    jam_mm = jamsx.load(jamb_path, mmap=True)
+
+    assert jam == jam_mm
+
+    ann_mm = jam_mm.annotations['pitch_hz', 0]
+    assert isinstance(ann_mm.data.time, np.memmap)
+    assert isinstance(ann_mm.data.value, np.memmap)
+
+    # Exporters give views of the mapped columns
+    times, values = ann_mm.to_event_values()
+    assert isinstance(times, np.memmap)
+    assert isinstance(values, np.memmap)
+    assert not times.flags.writeable
+
+    # Modification copies into memory
+    ann_mm.append(time=9.5, duration=0.5, value=200.0, confidence=1.0)
+    assert not isinstance(ann_mm.data.time, np.memmap)
+    assert len(ann_mm.data) == 51
+
+
+@xfail(raises=jamsx.ParameterError)
+def test_load_mmap_json():
+    jamsx.load('tests/fixtures/valid.jams', mmap=True)
+
+
+@xfail(raises=jamsx.ParameterError)
+def test_load_mmap_buffer(jamb_path):
+    with open(jamb_path, 'rb') as fdesc:
+        buf = six.BytesIO(fdesc.read())
+    jamsx.load(buf, fmt='jamb', mmap=True)
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_export(columnar):
+    ann = jamsx.Annotation('tag_open', columnar=columnar)
+    ann.append_columns(dict(time=[0.0, 1.0, 0.5, 2.0],
+                            duration=[1.0, 1.0, 0.0, 0.0],
+                            value=['a', 'b', 'c', 'd'],
+                            confidence=[0.1, 0.2, None, 0.4]))
+
+    intervals, labels = ann.to_interval_values()
+    assert np.allclose(intervals, [[0.0, 1.0], [0.5, 0.5],
+                                   [1.0, 2.0], [2.0, 2.0]])
+    assert labels == ['a', 'c', 'b', 'd']
+
+    times, labels = ann.to_event_values()
+    assert np.allclose(times, [0.0, 0.5, 1.0, 2.0])
+    assert labels == ['a', 'c', 'b', 'd']
+
+    values, confidence = ann.to_samples([3.0, 1.0, 0.5, 0.25],
+                                        confidence=True)
+    assert values == [[], ['a', 'b'], ['a', 'c'], ['a']]
+    assert confidence == [[], [0.1, 0.2], [0.1, None], [0.1]]
+
+    df = ann.to_dataframe()
+    assert list(df.columns) == ['time', 'duration', 'value', 'confidence']
+    assert df.time.dtype == df.duration.dtype == np.float64
+    assert list(df.value) == ['a', 'c', 'b', 'd']
+    assert list(df.confidence.isnull()) == [False, True, False, False]
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_to_arrow(columnar):
+    pyarrow = pytest.importorskip('pyarrow')
+
+    ann = jamsx.Annotation('pitch_hz', columnar=columnar)
+    ann.append_columns(dict(time=[1.0, 0.0], duration=[0.5, 0.5],
+                            value=[220.0, 440.0], confidence=[None, 0.5]))
+
+    table = ann.to_arrow()
+    assert table.column_names == ['time', 'duration', 'value', 'confidence']
+    assert table.column('value').type == pyarrow.float64()
+    assert table.to_pydict() == dict(time=[0.0, 1.0], duration=[0.5, 0.5],
+                                     value=[440.0, 220.0],
+                                     confidence=[0.5, None])
+
+
+def test_annotation_export_empty():
+    ann = jamsx.Annotation('tag_open')
+
+    intervals, labels = ann.to_interval_values()
+    assert intervals.shape == (0, 2)
+    assert labels == []
+
+    times, labels = ann.to_event_values()
+    assert times.shape == (0,)
+    assert labels == []
+
+    assert ann.to_dataframe().empty
+
+
+@parametrize('columnar', [False, True])
+def test_annotation_append_columns(columnar):
+    ann = jamsx.Annotation('tag_open', columnar=columnar)
+    ann.append(time=1.0, duration=0.0, value='x', confidence=None)
+
+    ann.append_columns(dict(time=np.array([1.0, 0.0, 1.0]),
+                            duration=np.zeros(3),
+                            value=['a', 'b', 'c'],
+                            confidence=np.array([0.5, 0.5, 0.5])))
+
+    assert [obs.value for obs in ann] == ['b', 'x', 'a', 'c']
+    assert [obs.time for obs in ann] == [0.0, 1.0, 1.0, 1.0]
+    assert all(isinstance(obs.time, float) for obs in ann)
+
+
+@parametrize('columnar', [False, True])
+@xfail(raises=jamsx.ParameterError)
+def test_annotation_append_columns_fail(columnar):
+    ann = jamsx.Annotation('tag_open', columnar=columnar)
+    ann.append_columns(dict(time=[0, 1], duration=[1, 1],
+                            value=['a'], confidence=[None, None]))
@@ -6,6 +6,8 @@ from six.moves import reload_module
 
 import pytest
 import os
+import json
+import numpy as np
 
 from jamsx import NamespaceError
 import jamsx
@@ -103,3 +105,112 @@ def test_schema_dtypes_badns():
 
 def test_list_namespaces():
     jamsx.schema.list_namespaces()
+
+
+def test_schema_namespace_validator():
+    validator = jamsx.schema.namespace_validator('beat')
+
+    assert validator is jamsx.schema.namespace_validator('beat')
+    assert validator.schema == jamsx.schema.namespace_array('beat')
+    assert validator.is_valid([dict(time=0, duration=0, value=1,
+                                    confidence=None)])
+    assert not validator.is_valid([dict(time=0, duration=0, value='one',
+                                        confidence=None)])
+
+
+@pytest.mark.xfail(raises=NamespaceError)
+def test_schema_namespace_validator_badns():
+    jamsx.schema.namespace_validator('unknown namespace')
+
+
+def test_schema_namespace_validator_invalidate(tmpdir):
+    ns_file = str(tmpdir.join('redefined.json'))
+
+    def _define(value_type):
+        with open(ns_file, 'w') as fdesc:
+            json.dump({'testing_redefined': {'value': {'type': value_type},
+                                             'dense': False,
+                                             'description': 'testing'}},
+                      fdesc)
+        jamsx.schema.add_namespace(ns_file)
+
+    obs = [dict(time=0, duration=0, value='one', confidence=None)]
+
+    _define('string')
+    assert jamsx.schema.namespace_validator('testing_redefined').is_valid(obs)
+
+    _define('number')
+    assert not jamsx.schema.namespace_validator('testing_redefined').is_valid(obs)
+
+
+@pytest.mark.parametrize('ns_key, supported',
+                         [('beat', True), ('tempo', True), ('tag_gtzan', True),
+                          ('tag_msd_tagtraum_cd1', True), ('onset', True),
+                          ('chord', False), ('vector', False),
+                          ('pitch_contour', False)])
+def test_column_validator_supported(ns_key, supported):
+    validator = jamsx.schema.column_validator(ns_key)
+
+    assert (validator is not None) == supported
+    assert jamsx.schema.column_validator(ns_key) is validator
+
+
+@pytest.mark.xfail(raises=jamsx.NamespaceError)
+def test_column_validator_badns():
+    jamsx.schema.column_validator('not a namespace')
+
+
+@pytest.mark.parametrize('ns_key, value, confidence',
+                         [('tempo', [120.0, 60], [0.5, 1]),
+                          ('tempo', [120.0, -1.0], [0.5, 1.0]),
+                          ('tempo', [120.0, None], [0.5, 1.0]),
+                          ('tempo', [120.0, True], [0.5, 1.0]),
+                          ('tempo', [120.0, 60.0], [0.5, 1.5]),
+                          ('tempo', [120.0, float('nan')], [0.5, 1.0]),
+                          ('tempo', np.array([120.0, 60.0]),
+                           np.array([0.5, 1.0])),
+                          ('tempo', np.array([120, -60]),
+                           np.array([0.5, 1.0])),
+                          ('beat', [1, None], [None, None]),
+                          ('beat', [1, 'one'], [None, None]),
+                          ('tag_gtzan', ['blues', 'jazz'], [None, 0.5]),
+                          ('tag_gtzan', ['blues', 'polka'], [None, None]),
+                          ('tag_gtzan', ['blues', 3], [None, None]),
+                          ('tag_msd_tagtraum_cd1', ['jazz', 'rnb'],
+                           [None, 0.5]),
+                          ('tag_msd_tagtraum_cd1', ['jazz', 'rnb'],
+                           [None, 'high']),
+                          ('tag_msd_tagtraum_cd1', ['jazz', 'rnb'],
+                           [-0.5, None])])
+@pytest.mark.parametrize('time, duration',
+                         [([0.0, 1.0], [1.0, 0.0]),
+                          ([0.0, -1.0], [1.0, 0.0]),
+                          ([0.0, 1.0], [1.0, -1.0])])
+def test_column_validator(ns_key, time, duration, value, confidence):
+
+    col_validator = jamsx.schema.column_validator(ns_key)
+    ann_validator = jamsx.schema.namespace_validator(ns_key)
+
+    records = [dict(time=t, duration=d, value=v, confidence=c)
+               for t, d, v, c in zip(time, duration, value, confidence)]
+    records = jamsx.core.serialize_obj(records)
+
+    assert (col_validator.is_valid(time, duration, value, confidence) ==
+            ann_validator.is_valid(records))
+
+
+def test_column_validator_invalidate(tmpdir):
+    ns_file = str(tmpdir.join('ns.json'))
+
+    for maximum, valid in [(10, True), (1, False)]:
+        with open(ns_file, 'w') as fdesc:
+            json.dump({'testing_column_ns': {'value': {'type': 'number',
+                                                       'maximum': maximum},
+                                             'dense': False,
+                                             'description': 'testing'}},
+                      fdesc)
+
+        jamsx.schema.add_namespace(ns_file)
+
+        validator = jamsx.schema.column_validator('testing_column_ns')
+        assert validator.is_valid([0.0], [1.0], [5.0], [None]) == valid
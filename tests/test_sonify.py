@@ -2,6 +2,8 @@
 # CREATED:2016-02-11 12:07:58 by Brian McFee <brian.mcfee@nyu.edu>
 """Sonification tests"""
 
+import os
+
 import numpy as np
 import pytest
 from test_eval import create_hierarchy
@@ -150,3 +152,274 @@ def test_multi_segment(ann_hier, sr, duration):
     y = jamsx.sonify.sonify(ann_hier, sr=sr, duration=duration)
     if duration:
         assert len(y) == duration * sr
+
+
+@pytest.mark.parametrize('namespace, value',
+                         [('beat', 1),
+                          ('note_hz', 440.0),
+                          ('segment_open', 'C')])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_dtype(namespace, value, dtype):
+
+    ann = jamsx.Annotation(namespace=namespace)
+    ann.append(time=0.5, duration=1.0, value=value)
+    y = jamsx.sonify.sonify(ann, sr=8000, duration=2.0, dtype=dtype)
+
+    assert y.dtype == dtype
+    assert len(y) == 8000 * 2
+    assert np.any(y)
+
+
+def test_clicks_overlap():
+
+    sr = 8000
+    click = jamsx.sonify.mkclick(1000, sr=sr)
+
+    ann = jamsx.Annotation(namespace='onset')
+    ann.append(time=0.5, duration=0, value=1)
+    ann.append(time=0.5, duration=0, value=1)
+    ann.append(time=1.99, duration=0, value=1)
+
+    y = jamsx.sonify.sonify(ann, sr=sr, duration=2.0)
+
+    # Overlapping clicks are mixed, and clicks are cut at the end
+    start = int(0.5 * sr)
+    assert np.allclose(y[start:start + len(click)], 2 * click)
+    assert np.allclose(y[int(1.99 * sr):], click[:len(y) - int(1.99 * sr)])
+
+
+def test_contour_multi(ann_contour):
+
+    sr = 8000
+    y_one = jamsx.sonify.sonify(ann_contour, sr=sr, duration=5.0)
+
+    # A second contour, an octave up, over [1, 2]
+    ann = jamsx.Annotation(namespace='pitch_contour')
+    ann.data.update(ann_contour.data)
+    for obs in ann_contour.data:
+        if 1 <= obs.time <= 2:
+            value = dict(obs.value)
+            value.update(index=1, frequency=2 * value['frequency'])
+            ann.append(time=obs.time, duration=obs.duration, value=value)
+
+    y_two = jamsx.sonify.sonify(ann, sr=sr, duration=5.0)
+
+    # Outside of the second contour, the output is unchanged
+    assert np.allclose(y_two[:sr - 1], y_one[:sr - 1])
+    assert np.allclose(y_two[2 * sr + 1:], y_one[2 * sr + 1:])
+    assert not np.allclose(y_two[sr:2 * sr], y_one[sr:2 * sr])
+
+    # Unvoiced regions are silent
+    assert not np.any(y_one[int(3.1 * sr):int(3.9 * sr)])
+
+
+def test_piano_roll_scaled():
+
+    ann = jamsx.Annotation(namespace='note_midi')
+    ann.append(time=0, duration=1, value=60)
+    y = jamsx.sonify.sonify(ann, sr=8000)
+    assert len(y) == 8000
+    assert np.isclose(np.abs(y).max(), 1.0, atol=1e-3)
+
+    # Simultaneous notes are scaled to avoid clipping
+    for pitch in [64, 67]:
+        ann.append(time=0.5, duration=1, value=pitch)
+    y = jamsx.sonify.sonify(ann, sr=8000)
+    assert len(y) == 8000 * 1.5
+    assert np.abs(y).max() <= 1.0
+
+
+def _stream_annotations():
+    ann_beat = jamsx.Annotation(namespace='beat')
+    ann_chord = jamsx.Annotation(namespace='chord')
+    ann_notes = jamsx.Annotation(namespace='note_hz')
+    for i, label in enumerate(['C', 'C', 'A:min7', 'N', 'G:7/3']):
+        ann_beat.append(time=0.37 * i, duration=0, value=i)
+        ann_chord.append(time=0.9 * i, duration=0.9, value=label)
+        ann_notes.append(time=0.5 * i, duration=0.7, value=220.0 * (i + 1))
+
+    return [ann_beat, ann_chord, ann_notes]
+
+
+@pytest.mark.parametrize('block_size', [37, 999, 4096, 10**6])
+@pytest.mark.parametrize('duration', [None, 3.0])
+def test_stream(ann_contour, ann_hier, beat_pos_ann, block_size, duration):
+
+    sr = 8000
+    for ann in [ann_contour, ann_hier, beat_pos_ann] + _stream_annotations():
+        y = jamsx.sonify.sonify(ann, sr=sr, duration=duration)
+        blocks = list(jamsx.sonify.stream(ann, sr=sr, duration=duration,
+                                          block_size=block_size))
+
+        assert all(len(b) == block_size for b in blocks[:-1])
+        assert np.allclose(np.concatenate(blocks), y)
+
+
+@pytest.mark.xfail(raises=jamsx.ParameterError)
+def test_stream_bad_block(beat_pos_ann):
+    jamsx.sonify.stream(beat_pos_ann, block_size=0)
+
+
+def test_write_wav(beat_pos_ann, tmpdir):
+    import wave
+
+    sr = 8000
+    path = str(tmpdir.join('out.wav'))
+    n = jamsx.sonify.write_wav(path, beat_pos_ann, sr=sr, duration=5,
+                               block_size=1000)
+
+    assert n == 5 * sr
+
+    with wave.open(path, 'rb') as wav:
+        assert wav.getframerate() == sr
+        assert wav.getnchannels() == 1
+        assert wav.getnframes() == n
+        pcm = np.frombuffer(wav.readframes(n), dtype='<i2')
+
+    y = jamsx.sonify.sonify(beat_pos_ann, sr=sr, duration=5)
+    assert np.allclose(pcm / 32767.0, np.clip(y, -1, 1), atol=1e-4)
+
+
+def test_cache(beat_pos_ann):
+
+    jamsx.sonify.cache_clear()
+    assert jamsx.sonify.cache_info().currsize == 0
+
+    jamsx.sonify.sonify(beat_pos_ann, sr=8000)
+    info = jamsx.sonify.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 2, 2)
+
+    # The same kernels are reused at the same sampling rate
+    jamsx.sonify.sonify(beat_pos_ann, sr=8000)
+    info = jamsx.sonify.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+    # Chord templates are cached per label
+    ann = jamsx.Annotation(namespace='chord')
+    for i, label in enumerate(['C', 'G', 'C', 'N']):
+        ann.append(time=i, duration=1, value=label)
+    jamsx.sonify.sonify(ann, sr=8000)
+    info = jamsx.sonify.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 5, 5)
+
+    jamsx.sonify.cache_clear()
+    assert jamsx.sonify.cache_info() == (0, 0, info.maxsize, 0)
+
+
+def test_cache_lru():
+    cache = jamsx.sonify._KernelCache(maxsize=2)
+
+    for key in ['a', 'b', 'a', 'c', 'a', 'b']:
+        kernel = cache.get(key, lambda: np.zeros(3))
+        assert not kernel.flags.writeable
+
+    # 'b' was evicted by 'c', and 'c' by the second 'b'
+    assert cache.info() == (2, 4, 2, 2)
+
+
+def _read_wav(path):
+    import wave
+
+    with wave.open(path, 'rb') as wav:
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+        return (wav.getframerate(),
+                pcm.reshape((-1, wav.getnchannels())) / 32767.)
+
+
+@pytest.mark.parametrize('n_jobs, pool', [(1, 'process'),
+                                          (2, 'process'),
+                                          (2, 'thread')])
+def test_batch(beat_pos_ann, tmpdir, n_jobs, pool):
+
+    sr = 8000
+    tag = jamsx.Annotation(namespace='tag_open')
+    tag.append(time=0, duration=1, value='unsonifiable')
+
+    for name in ['a', 'b']:
+        jam = jamsx.JAMS(annotations=[beat_pos_ann, tag, beat_pos_ann])
+        jam.file_metadata.duration = 12.0
+        jam.save(str(tmpdir.join('{}.jams'.format(name))))
+
+    out_dir = str(tmpdir.join('out'))
+    results = list(jamsx.sonify.batch(str(tmpdir), out_dir, sr=sr,
+                                      block_size=1000, n_jobs=n_jobs,
+                                      pool=pool))
+
+    assert [os.path.basename(path) for path, _ in results] == ['a.jams',
+                                                               'b.jams']
+
+    y = jamsx.sonify.sonify(beat_pos_ann, sr=sr, duration=12.0)
+    for path, outputs in results:
+        base = jamsx.util.filebase(path)
+        assert outputs == [os.path.join(out_dir,
+                                        '{}__beat_position__{:02d}.wav'
+                                        .format(base, i)) for i in [0, 1]]
+
+        for output in outputs:
+            out_sr, y_out = _read_wav(output)
+            assert out_sr == sr
+            assert np.allclose(y_out[:, 0], np.clip(y, -1, 1), atol=1e-4)
+
+
+@pytest.mark.parametrize('mix', [0, 0.25, 1])
+def test_batch_audio(beat_pos_ann, tmpdir, mix):
+    import wave
+
+    sr = 8000
+    audio_dir = tmpdir.mkdir('audio')
+    x = 0.5 * np.sin(np.arange(3 * sr) * 2 * np.pi * 440. / sr)
+    x = np.stack([x, -x], axis=1)
+
+    with wave.open(str(audio_dir.join('a.wav')), 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(sr)
+        wav.writeframes((x * 32767).astype('<i2').tobytes())
+
+    jam = jamsx.JAMS(annotations=[beat_pos_ann])
+    jam.file_metadata.duration = 12.0
+    jam.save(str(tmpdir.join('a.jams')))
+
+    out_dir = str(tmpdir.join('out'))
+    (_, outputs), = jamsx.sonify.batch(str(tmpdir), out_dir, sr=22050,
+                                       audio_dir=str(audio_dir), mix=mix,
+                                       block_size=1000, n_jobs=1)
+
+    out_sr, y_out = _read_wav(outputs[0])
+    assert out_sr == sr
+    assert y_out.shape == x.shape
+
+    y = jamsx.sonify.sonify(beat_pos_ann, sr=sr, duration=3.0)
+    expected = np.clip((1 - mix) * x + mix * y[:, np.newaxis], -1, 1)
+    assert np.allclose(y_out, expected, atol=1e-3)
+
+
+def test_batch_errors(beat_pos_ann, tmpdir):
+
+    jam = jamsx.JAMS(annotations=[beat_pos_ann])
+    jam.file_metadata.duration = 12.0
+    jam.save(str(tmpdir.join('a.jams')))
+
+    # The source audio is missing
+    kwargs = dict(audio_dir=str(tmpdir.join('audio')), n_jobs=1)
+    out_dir = str(tmpdir.join('out'))
+
+    with pytest.raises(IOError):
+        list(jamsx.sonify.batch(str(tmpdir), out_dir, **kwargs))
+
+    assert list(jamsx.sonify.batch(str(tmpdir), out_dir, errors='skip',
+                                   **kwargs)) == []
+
+    (_, exc), = jamsx.sonify.batch(str(tmpdir), out_dir, errors='collect',
+                                   **kwargs)
+    assert isinstance(exc, IOError)
+
+
+@pytest.mark.parametrize('kwargs', [dict(fmt='mp3'), dict(mix=1.5),
+                                    dict(block_size=0), dict(pool='cluster'),
+                                    dict(errors='ignore'),
+                                    dict(namespace=lambda ns: True,
+                                         n_jobs=2)])
+@pytest.mark.xfail(raises=jamsx.ParameterError)
+def test_batch_badparams(tmpdir, kwargs):
+    list(jamsx.sonify.batch(str(tmpdir), str(tmpdir.join('out')), **kwargs))